@@ -0,0 +1,171 @@
+"""Async versions of the read-heavy summary endpoints, served under `async/`.
+
+These are plain Django async views rather than DRF views, so under ASGI they
+run on the event loop and the independent queries of one response are awaited
+together with `asyncio.gather`. They build their payloads with the same
+helpers as the sync views and share the summary cache and ETags with them.
+
+Django's async ORM still executes each query through `sync_to_async`, so the
+gain is in overlapping the per-request waits across many concurrent requests,
+not in parallel SQL; `manage.py loadtest` compares the two deployments.
+"""
+import asyncio
+from datetime import datetime
+from functools import wraps
+
+from asgiref.sync import sync_to_async
+from django.http import JsonResponse
+from django.views.decorators.http import require_GET
+from rest_framework import exceptions
+from rest_framework.utils.encoders import JSONEncoder
+
+from accounts.api.authentication import CachedTokenAuthentication
+from accounts.api.conditional import aconditional_get, adaily_conditional_get
+from accounts.cache import acached_summary
+from accounts.models import BillRecurrence, Calendar, month_bounds
+from accounts.summaries import (
+    annual_payload,
+    dashboard_bills,
+    dashboard_payload,
+    dashboard_request,
+    dashboard_rollups,
+    day_bills,
+    day_payload,
+    day_scopes,
+    day_totals,
+    day_transactions,
+    parse_day,
+    pie_payload,
+    pie_years,
+    requested_years,
+    rollups_for_years,
+    year_scopes,
+    year_totals,
+)
+
+
+def respond(data, status=200):
+    """JsonResponse encoded like DRF's renderer, keeping `data` for the summary cache."""
+    response = JsonResponse(data, status=status, safe=False, encoder=JSONEncoder)
+    response.data = data
+    return response
+
+
+def token_required(view):
+    """Authenticate `Authorization: Token <key>` with CachedTokenAuthentication."""
+    @wraps(view)
+    async def wrapper(request, *args, **kwargs):
+        keyword, _, key = request.headers.get('Authorization', '').partition(' ')
+        if keyword != CachedTokenAuthentication.keyword or not key or ' ' in key:
+            return respond({"detail": "Authentication credentials were not provided."}, status=401)
+        try:
+            request.user, request.auth = await sync_to_async(
+                CachedTokenAuthentication().authenticate_credentials
+            )(key)
+        except exceptions.AuthenticationFailed as exc:
+            return respond({"detail": str(exc.detail)}, status=401)
+        return await view(request, *args, **kwargs)
+    return wrapper
+
+
+def _year_scopes(request, *args, **kwargs):
+    return year_scopes(request.GET)
+
+
+def _day_scopes(request, calendar_id, date_str):
+    return day_scopes(date_str)
+
+
+# ---------- QUERIES ----------
+async def _aggregate(queryset_and_aggregates):
+    queryset, aggregates = queryset_and_aggregates
+    return await queryset.aaggregate(**aggregates)
+
+
+async def _rows(queryset):
+    return [row async for row in queryset]
+
+
+async def _none():
+    return None
+
+
+async def _day(user, target_date):
+    transactions, bills, totals = await asyncio.gather(
+        _rows(day_transactions(user, target_date)),
+        _rows(day_bills(user, target_date)),
+        _aggregate(day_totals(user, target_date)),
+    )
+    return day_payload(target_date, transactions, bills, totals)
+
+
+async def _pie_years(user, first, last):
+    return pie_years(await _rows(rollups_for_years(user, first, last)), first, last)
+
+
+# ---------- VIEWS ----------
+@require_GET
+@token_required
+@aconditional_get
+@acached_summary('day_view', _day_scopes, respond)
+async def day_view(request, calendar_id, date_str):
+    calendar = Calendar.objects.filter(id=calendar_id, user=request.user)
+    try:
+        target_date = parse_day(date_str)
+    except ValueError:
+        if not await calendar.aexists():
+            return respond({"error": "Calendar not found"}, status=404)
+        return respond({"error": "Invalid date format (use YYYY-MM-DD)"}, status=400)
+
+    await sync_to_async(BillRecurrence.ensure_occurrences)(
+        request.user.id, month_bounds(target_date.year, target_date.month)[1]
+    )
+    exists, payload = await asyncio.gather(calendar.aexists(), _day(request.user, target_date))
+    if not exists:
+        return respond({"error": "Calendar not found"}, status=404)
+    return respond(payload)
+
+
+@require_GET
+@token_required
+@adaily_conditional_get
+@acached_summary('annual_summary', _year_scopes, respond)
+async def annual_summary(request):
+    try:
+        year = int(request.GET.get('year', datetime.now().year))
+    except ValueError:
+        return respond({"error": "Invalid year (use YYYY)"}, status=400)
+    return respond(annual_payload(year, await _aggregate(year_totals(request.user, year))))
+
+
+@require_GET
+@token_required
+@adaily_conditional_get
+@acached_summary('monthly_pie_data', _year_scopes, respond)
+async def monthly_pie_data(request):
+    try:
+        first, last = requested_years(request.GET)
+    except ValueError:
+        return respond({"error": "Invalid year or years range (use YYYY or YYYY-YYYY)"}, status=400)
+    return respond(pie_payload(request.GET, await _pie_years(request.user, first, last)))
+
+
+@require_GET
+@token_required
+@adaily_conditional_get
+async def dashboard(request):
+    """Async `dashboard/`: the rollup and bill queries run concurrently."""
+    try:
+        sections, year, month = dashboard_request(request.GET)
+    except ValueError as exc:
+        return respond({"error": str(exc)}, status=400)
+
+    if 'bills' in sections:
+        await sync_to_async(BillRecurrence.ensure_occurrences)(request.user.id, month_bounds(year, month)[1])
+    rollups = dashboard_rollups(request.user, sections, year)
+    bills = dashboard_bills(request.user, sections, year, month)
+    rollups, bills = await asyncio.gather(
+        _rows(rollups) if rollups is not None else _none(),
+        _rows(bills) if bills is not None else _none(),
+    )
+    return respond(dashboard_payload(request.user, sections, year, month, rollups, bills))
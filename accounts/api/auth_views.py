@@ -6,6 +6,7 @@ from rest_framework.response import Response
 from django.contrib.auth import authenticate
 from rest_framework.renderers import JSONRenderer
 from accounts.api.serializers import RegisterSerializer, LoginSerializer
+from accounts.api.authentication import token_expired
 
 
 # -------------------- REGISTER (SIGN UP) --------------------
@@ -46,7 +47,11 @@ class SignInView(generics.GenericAPIView):
         user = authenticate(username=username, password=password)
 
         if user:
-            token, _ = Token.objects.get_or_create(user=user)
+            token, created = Token.objects.get_or_create(user=user)
+            # Expired tokens are replaced; clients may also ask to rotate explicitly.
+            if not created and (token_expired(token.created) or serializer.validated_data.get('rotate')):
+                token.delete()
+                token = Token.objects.create(user=user)
             return Response({
                 "message": "Sign in successful!",
                 "token": token.key,
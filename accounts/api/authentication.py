@@ -0,0 +1,132 @@
+"""Token authentication with cached token lookups.
+
+DRF's TokenAuthentication joins Token and User on every request. This version
+keeps recent lookups in a small per-process LRU backed by the shared Django
+cache, so most requests authenticate without touching the database.
+
+The shared cache may be on disk or another host, so it only holds
+`(user_id, created, is_active)`; a hit there loads the user by primary key
+instead of joining the token. The entry is deleted when the token is deleted or
+the user is saved or removed, and a local hit is only trusted while the shared
+entry still exists, so a revoked token stops working on every worker at once.
+With the per-process `locmem` cache nothing is shared; AUTH_SHARED_CACHE_TTL
+then bounds how long other workers accept a revoked token.
+
+Each request gets its own copy of the user, so views that edit `request.user`
+never touch the instance cached for concurrent requests.
+"""
+import copy
+import threading
+import time
+from collections import OrderedDict
+from datetime import timedelta
+
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.utils import timezone
+from rest_framework import exceptions
+from rest_framework.authentication import TokenAuthentication
+from rest_framework.authtoken.models import Token
+
+
+def token_ttl():
+    days = getattr(settings, 'TOKEN_TTL_DAYS', None)
+    return timedelta(days=days) if days else None
+
+
+def token_expired(created):
+    ttl = token_ttl()
+    return ttl is not None and created + ttl < timezone.now()
+
+
+class _LocalTokenCache:
+    def __init__(self):
+        self.entries = OrderedDict()
+        self.lock = threading.Lock()
+
+    def get(self, key):
+        with self.lock:
+            entry = self.entries.get(key)
+            if entry is None:
+                return None
+            if entry[0] < time.monotonic():
+                del self.entries[key]
+                return None
+            self.entries.move_to_end(key)
+            return entry[1]
+
+    def set(self, key, value):
+        ttl = getattr(settings, 'AUTH_LOCAL_CACHE_TTL', 60)
+        size = getattr(settings, 'AUTH_LOCAL_CACHE_SIZE', 1024)
+        with self.lock:
+            self.entries[key] = (time.monotonic() + ttl, value)
+            self.entries.move_to_end(key)
+            while len(self.entries) > size:
+                self.entries.popitem(last=False)
+
+    def delete(self, key):
+        with self.lock:
+            self.entries.pop(key, None)
+
+    def clear(self):
+        with self.lock:
+            self.entries.clear()
+
+
+local_tokens = _LocalTokenCache()
+
+
+def _shared_key(key):
+    return f'auth:token:{key}'
+
+
+def evict_token(key):
+    local_tokens.delete(key)
+    cache.delete(_shared_key(key))
+
+
+def evict_user_tokens(user_id):
+    for key in Token.objects.filter(user_id=user_id).values_list('key', flat=True):
+        evict_token(key)
+
+
+class CachedTokenAuthentication(TokenAuthentication):
+    """Drop-in replacement for TokenAuthentication that also enforces TOKEN_TTL_DAYS."""
+
+    def authenticate_credentials(self, key):
+        entry = cache.get(_shared_key(key))
+        token = local_tokens.get(key) if entry is not None else None
+        if token is None:
+            token = self.shared_token(key, entry)
+            local_tokens.set(key, token)
+
+        if token_expired(token.created):
+            evict_token(key)
+            raise exceptions.AuthenticationFailed('Token has expired.')
+        if not token.user.is_active:
+            raise exceptions.AuthenticationFailed('User inactive or deleted.')
+        user = copy.copy(token.user)
+        return (user, Token(key=token.key, user=user, created=token.created))
+
+    def shared_token(self, key, entry):
+        """Rebuild the token from the shared cache entry, or load it and fill the entry."""
+        if entry is None:
+            token = self.load_token(key)
+            entry = (token.user_id, token.created, token.user.is_active)
+            cache.set(_shared_key(key), entry, getattr(settings, 'AUTH_SHARED_CACHE_TTL', 300))
+            return token
+        user_id, created, is_active = entry
+        if not is_active:
+            raise exceptions.AuthenticationFailed('User inactive or deleted.')
+        user = User.objects.filter(pk=user_id).first()
+        if user is None:
+            evict_token(key)
+            raise exceptions.AuthenticationFailed('User inactive or deleted.')
+        return Token(key=key, user=user, created=created)
+
+    def load_token(self, key):
+        try:
+            return Token.objects.select_related('user').get(key=key)
+        except Token.DoesNotExist:
+            raise exceptions.AuthenticationFailed('Invalid token.')
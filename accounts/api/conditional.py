@@ -0,0 +1,107 @@
+"""Conditional GET support for the read API.
+
+The validator is the user's `Profile.data_version`, which every write to their
+transactions, bills, calendars or categories bumps. Checking it is a single
+indexed lookup, so an unchanged screen is answered with 304 before any
+serializer or aggregate runs. Views whose output also depends on the current
+date (a forecast, or a period defaulting to this month or year) use
+`daily_conditional_get`, which folds today's date into both validators.
+"""
+import hashlib
+from datetime import date, datetime
+from functools import wraps
+
+from asgiref.sync import sync_to_async
+from django.utils.cache import get_conditional_response, patch_cache_control, patch_vary_headers
+from django.utils.http import http_date
+
+from accounts.models import Profile
+
+
+def _validators(request, today=None):
+    version, modified_at = (
+        Profile.objects
+        .filter(user_id=request.user.id)
+        .values_list('data_version', 'data_modified_at')
+        .first()
+    ) or (0, None)
+    key = f"{request.user.id}:{version}:{request.get_full_path()}:{request.META.get('HTTP_ACCEPT', '')}"
+    if today is not None:
+        key += f":{today.isoformat()}"
+    digest = hashlib.sha1(key.encode()).hexdigest()[:20]
+    last_modified = int(modified_at.timestamp()) if modified_at else None
+    if today is not None:
+        # A copy from before midnight is stale even without writes.
+        last_modified = max(last_modified or 0, int(datetime.combine(today, datetime.min.time()).timestamp()))
+    return f'W/"{version}-{digest}"', last_modified
+
+
+def _set_validators(response, etag, last_modified):
+    if response.status_code in (200, 304):
+        response['ETag'] = etag
+        if last_modified:
+            response['Last-Modified'] = http_date(last_modified)
+        patch_cache_control(response, private=True, no_cache=True)
+        patch_vary_headers(response, ['Authorization'])
+    return response
+
+
+def conditional_response(request, produce, today=None):
+    """Return 304 when the client's copy is current, otherwise `produce()` with validators set."""
+    if request.method not in ('GET', 'HEAD') or not request.user.is_authenticated:
+        return produce()
+
+    etag, last_modified = _validators(request, today)
+    not_modified = get_conditional_response(request, etag=etag, last_modified=last_modified)
+    response = not_modified if not_modified is not None else produce()
+    return _set_validators(response, etag, last_modified)
+
+
+async def aconditional_response(request, produce, today=None):
+    """Async `conditional_response`; `produce` is a coroutine function."""
+    if request.method not in ('GET', 'HEAD') or not request.user.is_authenticated:
+        return await produce()
+
+    etag, last_modified = await sync_to_async(_validators)(request, today)
+    not_modified = get_conditional_response(request, etag=etag, last_modified=last_modified)
+    response = not_modified if not_modified is not None else await produce()
+    return _set_validators(response, etag, last_modified)
+
+
+def conditional_get(view):
+    """Decorator for function views; place it under the DRF auth decorators."""
+    @wraps(view)
+    def wrapper(request, *args, **kwargs):
+        return conditional_response(request, lambda: view(request, *args, **kwargs))
+    return wrapper
+
+
+def daily_conditional_get(view):
+    """`conditional_get` for views whose output depends on `date.today()`."""
+    @wraps(view)
+    def wrapper(request, *args, **kwargs):
+        return conditional_response(request, lambda: view(request, *args, **kwargs), today=date.today())
+    return wrapper
+
+
+def aconditional_get(view):
+    """`conditional_get` for async function views; place it under the authentication decorator."""
+    @wraps(view)
+    async def wrapper(request, *args, **kwargs):
+        return await aconditional_response(request, lambda: view(request, *args, **kwargs))
+    return wrapper
+
+
+def adaily_conditional_get(view):
+    """`daily_conditional_get` for async function views."""
+    @wraps(view)
+    async def wrapper(request, *args, **kwargs):
+        return await aconditional_response(request, lambda: view(request, *args, **kwargs), today=date.today())
+    return wrapper
+
+
+class ConditionalGetMixin:
+    """Adds ETag / Last-Modified handling to a generic view's GET."""
+
+    def get(self, request, *args, **kwargs):
+        return conditional_response(request, lambda: super(ConditionalGetMixin, self).get(request, *args, **kwargs))
@@ -0,0 +1,72 @@
+"""Read-only fast path for large list responses.
+
+`TransactionSerializer` and `BillDueSerializer` walk every field of every row
+(plus a nested `CategorySerializer` per transaction). For lists, the views
+instead fetch flat `values()` rows, joining the category columns in the same
+query, and build the output dicts directly. The output must stay identical to
+the serializers' (same keys, order and value formats); `FastSerializerTests`
+compares both paths and `manage.py benchmark_serializers` measures them.
+"""
+from decimal import Decimal
+
+from accounts.instrumentation import serializing
+
+CENT = Decimal('0.01')
+
+TRANSACTION_COLUMNS = (
+    'id', 'user_id', 'amount', 'type', 'description', 'date',
+    'category_id', 'category__name', 'category__user_id',
+)
+BILL_COLUMNS = ('id', 'name', 'amount', 'type', 'due_date', 'note', 'is_paid', 'recurrence_id')
+
+
+def decimal_string(value):
+    """DecimalField(decimal_places=2) output: '12.50'."""
+    return '{:f}'.format(value.quantize(CENT))
+
+
+def transaction_values(queryset):
+    return queryset.values(*TRANSACTION_COLUMNS)
+
+
+def transaction_data(rows):
+    """TransactionSerializer(many=True).data for `transaction_values()` rows."""
+    with serializing():
+        return [
+            {
+                'id': row['id'],
+                'user': row['user_id'],
+                'amount': decimal_string(row['amount']),
+                'type': row['type'],
+                'description': row['description'],
+                'date': row['date'].isoformat(),
+                'category': None if row['category_id'] is None else {
+                    'id': row['category_id'],
+                    'name': row['category__name'],
+                    'user': row['category__user_id'],
+                },
+            }
+            for row in rows
+        ]
+
+
+def bill_values(queryset):
+    return queryset.values(*BILL_COLUMNS)
+
+
+def bill_data(rows):
+    """BillDueSerializer(many=True).data for `bill_values()` rows."""
+    with serializing():
+        return [
+            {
+                'id': row['id'],
+                'name': row['name'],
+                'amount': decimal_string(row['amount']),
+                'type': row['type'],
+                'due_date': row['due_date'].isoformat(),
+                'note': row['note'],
+                'is_paid': row['is_paid'],
+                'recurrence': row['recurrence_id'],
+            }
+            for row in rows
+        ]
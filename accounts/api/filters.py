@@ -0,0 +1,74 @@
+from datetime import datetime
+from decimal import Decimal, InvalidOperation
+
+from rest_framework.exceptions import ValidationError
+
+
+def _parse_date(value):
+    return datetime.strptime(value, "%Y-%m-%d").date()
+
+
+def _parse_decimal(value):
+    try:
+        parsed = Decimal(value)
+    except InvalidOperation:
+        raise ValueError(value)
+    if not parsed.is_finite():
+        raise ValueError(value)
+    return parsed
+
+
+def _parse_bool(value):
+    if value.lower() in ("true", "1", "yes"):
+        return True
+    if value.lower() in ("false", "0", "no"):
+        return False
+    raise ValueError(value)
+
+
+PARSERS = {
+    "date": _parse_date,
+    "decimal": _parse_decimal,
+    "int": int,
+    "bool": _parse_bool,
+    "str": str,
+}
+
+
+def apply_filters(queryset, params, spec):
+    """Apply query-param filters described by {param: (lookup, kind)}.
+
+    Every filter is a plain comparison on an indexed column so it composes with
+    the keyset pagination range scan. Bad values raise a 400 naming the param.
+    """
+    lookups, errors = {}, {}
+    for param, (lookup, kind) in spec.items():
+        value = params.get(param)
+        if value in (None, ""):
+            continue
+        try:
+            lookups[lookup] = PARSERS[kind](value)
+        except ValueError:
+            errors[param] = [f"Invalid {kind} value."]
+    if errors:
+        raise ValidationError(errors)
+    return queryset.filter(**lookups)
+
+
+TRANSACTION_FILTERS = {
+    "date_from": ("date__gte", "date"),
+    "date_to": ("date__lte", "date"),
+    "type": ("type", "str"),
+    "category": ("category_id", "int"),
+    "amount_min": ("amount__gte", "decimal"),
+    "amount_max": ("amount__lte", "decimal"),
+}
+
+BILL_FILTERS = {
+    "due_date": ("due_date", "date"),
+    "date_from": ("due_date__gte", "date"),
+    "date_to": ("due_date__lte", "date"),
+    "is_paid": ("is_paid", "bool"),
+    "amount_min": ("amount__gte", "decimal"),
+    "amount_max": ("amount__lte", "decimal"),
+}
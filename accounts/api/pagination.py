@@ -0,0 +1,125 @@
+import base64
+import json
+
+from django.db.models import Q
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import BasePagination
+from rest_framework.response import Response
+from rest_framework.utils.urls import replace_query_param
+
+from accounts.api.filters import PARSERS
+
+
+class KeysetPagination(BasePagination):
+    """Cursor pagination over a (column, id) pair.
+
+    Each page is a plain `WHERE (column, id) > cursor ... LIMIT n` range scan on
+    a matching index, so page 1000 costs the same as page 1. `ordering` is the
+    column plus `id`, both ascending or both descending. `column_kind` is the
+    column's `filters.PARSERS` kind, used to validate cursors.
+    """
+    ordering = ('-id', '-id')
+    column_kind = 'int'
+    page_size = 50
+    max_page_size = 500
+    page_size_query_param = 'page_size'
+    cursor_query_param = 'cursor'
+    invalid_cursor_message = 'Invalid cursor'
+
+    def get_page_size(self, request):
+        try:
+            size = int(request.query_params.get(self.page_size_query_param, self.page_size))
+        except ValueError:
+            size = self.page_size
+        return max(1, min(size, self.max_page_size))
+
+    def decode_cursor(self, request):
+        encoded = request.query_params.get(self.cursor_query_param)
+        if not encoded:
+            return None
+        try:
+            position = json.loads(base64.urlsafe_b64decode(encoded.encode()).decode())
+            if not isinstance(position, list) or len(position) != 2:
+                raise ValueError
+            return self.parse_position(*position)
+        except (TypeError, ValueError):
+            raise NotFound(self.invalid_cursor_message)
+
+    def parse_position(self, value, pk):
+        """Check the decoded cursor's types, so a forged one is a 404 rather than a database error."""
+        if type(pk) is not int:
+            raise ValueError(pk)
+        if self.column_kind == 'int':
+            if type(value) is not int:
+                raise ValueError(value)
+            return [value, pk]
+        if not isinstance(value, str):
+            raise ValueError(value)
+        return [PARSERS[self.column_kind](value), pk]
+
+    def encode_cursor(self, position):
+        return base64.urlsafe_b64encode(json.dumps(position).encode()).decode()
+
+    def position_filter(self, position):
+        """Build `(a, b) > (x, y)` (or `<` for descending) as an index-friendly OR."""
+        column = self.ordering[0].lstrip('-')
+        value, pk = position
+        lookup = 'lt' if self.ordering[0].startswith('-') else 'gt'
+        return Q(**{f'{column}__{lookup}': value}) | Q(**{column: value, f'id__{lookup}': pk})
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.request = request
+        page_size = self.get_page_size(request)
+        queryset = queryset.order_by(*self.ordering)
+        position = self.decode_cursor(request)
+        if position is not None:
+            queryset = queryset.filter(self.position_filter(position))
+
+        rows = list(queryset[:page_size + 1])
+        self.has_next = len(rows) > page_size
+        rows = rows[:page_size]
+        self.next_position = None
+        if self.has_next:
+            # Rows are model instances, or dicts when the view paginates a values() queryset.
+            last = rows[-1]
+            column = self.ordering[0].lstrip('-')
+            value, pk = (last[column], last['id']) if isinstance(last, dict) else (getattr(last, column), last.id)
+            self.next_position = [value.isoformat() if hasattr(value, 'isoformat') else value, pk]
+        return rows
+
+    def get_next_link(self):
+        if self.next_position is None:
+            return None
+        url = self.request.build_absolute_uri()
+        return replace_query_param(url, self.cursor_query_param, self.encode_cursor(self.next_position))
+
+    def get_paginated_response(self, data):
+        return Response({
+            'next': self.get_next_link(),
+            'results': data,
+        })
+
+    def get_paginated_response_schema(self, schema):
+        return {
+            'type': 'object',
+            'required': ['results'],
+            'properties': {
+                'next': {'type': 'string', 'nullable': True, 'format': 'uri'},
+                'results': schema,
+            },
+        }
+
+
+class TransactionPagination(KeysetPagination):
+    ordering = ('-date', '-id')
+    column_kind = 'date'
+
+
+class BillDuePagination(KeysetPagination):
+    ordering = ('due_date', 'id')
+    column_kind = 'date'
+
+
+class CategoryPagination(KeysetPagination):
+    ordering = ('name', 'id')
+    column_kind = 'str'
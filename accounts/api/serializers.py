@@ -2,7 +2,7 @@ from rest_framework import serializers
 from django.contrib.auth.models import User
 from rest_framework.validators import UniqueValidator
 from django.contrib.auth.password_validation import validate_password
-from accounts.models import Profile, Category, Transaction, Calendar, CalendarCell, BillDue
+from accounts.models import Profile, Category, Transaction, Calendar, CalendarCell, BillDue, BillRecurrence
 
 
 # ---------- USER (used for /profile/, /profile/update/, etc.) ----------
@@ -73,6 +73,7 @@ class RegisterSerializer(serializers.ModelSerializer):
 class LoginSerializer(serializers.Serializer):
     username = serializers.CharField(required=True)
     password = serializers.CharField(required=True, write_only=True)
+    rotate = serializers.BooleanField(required=False, default=False)
 
 
 # ---------- CATEGORY ----------
@@ -112,11 +113,46 @@ class TransactionSerializer(serializers.ModelSerializer):
         return super().create(validated_data)
 
 
+# ---------- TRANSACTION (BULK) ----------
+class TransactionBulkItemSerializer(serializers.ModelSerializer):
+    """Validates one row of a bulk upload without touching the database.
+
+    `category_id` is only type-checked here; the view resolves every id of the
+    batch with a single query.
+    """
+    category_id = serializers.IntegerField()
+
+    class Meta:
+        model = Transaction
+        fields = ["amount", "type", "description", "date", "category_id"]
+
+
 # ---------- BILL DUE ----------
 class BillDueSerializer(serializers.ModelSerializer):
     class Meta:
         model = BillDue
-        fields = ["id", "name", "amount", "type", "due_date", "note", "is_paid"]
+        fields = ["id", "name", "amount", "type", "due_date", "note", "is_paid", "recurrence"]
+        read_only_fields = ["recurrence"]
+
+
+# ---------- BILL RECURRENCE ----------
+class BillRecurrenceSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = BillRecurrence
+        fields = [
+            "id", "name", "amount", "type", "note",
+            "frequency", "interval", "start_date", "end_date", "count", "materialized_through",
+        ]
+        read_only_fields = ["materialized_through"]
+
+    def validate(self, attrs):
+        start = attrs.get("start_date", getattr(self.instance, "start_date", None))
+        end = attrs.get("end_date", getattr(self.instance, "end_date", None))
+        if start and end and end < start:
+            raise serializers.ValidationError({"end_date": "Must not be before start_date."})
+        if attrs.get("interval", 1) < 1:
+            raise serializers.ValidationError({"interval": "Must be at least 1."})
+        return attrs
 
 
 # ---------- CALENDAR CELL ----------
@@ -128,9 +164,13 @@ class CalendarCellSerializer(serializers.ModelSerializer):
         fields = ["id", "date", "total_income", "total_expenses", "net_balance", "bills"]
 
     def get_bills(self, obj):
-        bills = BillDue.objects.filter(
-            user=obj.calendar.user, due_date=obj.date
-        )
+        # List views preload the whole date span once and pass it in through context.
+        if "bills_by_date" in self.context:
+            bills = self.context["bills_by_date"].get(obj.date, [])
+        else:
+            bills = BillDue.objects.filter(
+                user_id=obj.calendar.user_id, due_date=obj.date
+            )
         return BillDueSerializer(bills, many=True).data
 
 
@@ -140,4 +180,13 @@ class CalendarSerializer(serializers.ModelSerializer):
 
     class Meta:
         model = Calendar
-        fields = ["id", "month", "year", "cells"]
\ No newline at end of file
+        fields = ["id", "month", "year", "cells"]
+
+
+class VirtualCalendarSerializer(CalendarSerializer):
+    """CalendarSerializer output with unsaved cells passed in through context (CALENDAR_MODE=virtual)."""
+    cells = serializers.SerializerMethodField()
+
+    def get_cells(self, obj):
+        cells = self.context["cells_by_calendar"].get(obj.id, [])
+        return CalendarCellSerializer(cells, many=True, context=self.context).data
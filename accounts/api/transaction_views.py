@@ -1,39 +1,199 @@
 
-from rest_framework import generics, permissions
-from rest_framework.authentication import TokenAuthentication
-from .serializers import TransactionSerializer, CategorySerializer
-from accounts.models import Transaction, Category
-
-# ---- Category ----------------------------------------------------------------------------
-class CategoryListCreateView(generics.ListCreateAPIView):
-    serializer_class = CategorySerializer
+import io
+from datetime import date
+from django.core.handlers.asgi import ASGIRequest
+from django.db import transaction as db_transaction
+from django.http import StreamingHttpResponse
+from rest_framework import generics, permissions, status
+from accounts.api.authentication import CachedTokenAuthentication
+from rest_framework.response import Response
+from rest_framework.views import APIView
+from rest_framework.parsers import MultiPartParser
+from accounts.api.conditional import ConditionalGetMixin
+from accounts.api.fast_serializers import transaction_data, transaction_values
+from accounts.api.filters import TRANSACTION_FILTERS, apply_filters
+from accounts.api.pagination import TransactionPagination
+from accounts.exports import FORMATS as EXPORT_FORMATS, ExportError, aexport_stream, export_sections, export_stream
+from accounts.importers import DEFAULT_COLUMNS, StatementImporter, StatementReadError, read_statement, statement_format
+from .serializers import TransactionSerializer, TransactionBulkItemSerializer
+from accounts.models import Transaction, Category, recompute_rollups
+from accounts.search import search_transactions
+
+# ---- Transaction --------------------------------------------------------------------------
+class TransactionListCreateView(ConditionalGetMixin, generics.ListCreateAPIView):
+    serializer_class = TransactionSerializer
     permission_classes = [permissions.IsAuthenticated]
-    authentication_classes = [TokenAuthentication]
+    authentication_classes = [CachedTokenAuthentication]
+    pagination_class = TransactionPagination
 
     def get_queryset(self):
-        return Category.objects.filter(user=self.request.user)
+        queryset = Transaction.objects.filter(user=self.request.user).select_related("category")
+        if self.request.method == "GET":
+            queryset = apply_filters(queryset, self.request.query_params, TRANSACTION_FILTERS)
+        return queryset
+
+    def list(self, request, *args, **kwargs):
+        # Same output as TransactionSerializer, built from values() rows.
+        page = self.paginate_queryset(transaction_values(self.filter_queryset(self.get_queryset())))
+        return self.get_paginated_response(transaction_data(page))
 
     def perform_create(self, serializer):
         serializer.save(user=self.request.user)
 
 
-# ---- Transaction --------------------------------------------------------------------------
-class TransactionListCreateView(generics.ListCreateAPIView):
+class TransactionDetailView(generics.RetrieveUpdateDestroyAPIView):
     serializer_class = TransactionSerializer
     permission_classes = [permissions.IsAuthenticated]
-    authentication_classes = [TokenAuthentication]
+    authentication_classes = [CachedTokenAuthentication]
 
     def get_queryset(self):
         return Transaction.objects.filter(user=self.request.user)
 
-    def perform_create(self, serializer):
-        serializer.save(user=self.request.user)
 
+class TransactionSearchView(APIView):
+    """Full-text and prefix search over the user's transaction descriptions.
 
-class TransactionDetailView(generics.RetrieveUpdateDestroyAPIView):
-    serializer_class = TransactionSerializer
+    `?q=coff star` matches "Starbucks coffee"; every term is a prefix and all
+    terms must match. Results are ranked by relevance, then newest first.
+    """
     permission_classes = [permissions.IsAuthenticated]
-    authentication_classes = [TokenAuthentication]
+    authentication_classes = [CachedTokenAuthentication]
+    default_limit = 50
+    max_limit = 200
 
-    def get_queryset(self):
-        return Transaction.objects.filter(user=self.request.user)
\ No newline at end of file
+    def get(self, request):
+        query = request.query_params.get("q", "").strip()
+        if not query:
+            return Response({"error": "The q parameter is required."}, status=status.HTTP_400_BAD_REQUEST)
+        try:
+            limit = int(request.query_params.get("limit", self.default_limit))
+        except ValueError:
+            return Response({"error": "limit must be an integer."}, status=status.HTTP_400_BAD_REQUEST)
+        limit = max(1, min(limit, self.max_limit))
+
+        results = search_transactions(request.user, query, limit)
+        return Response({"results": TransactionSerializer(results, many=True).data})
+
+
+class TransactionBulkCreateView(APIView):
+    """Create many transactions in one request.
+
+    Rows are validated independently; valid rows are inserted together and
+    failed rows come back under their original index so clients can retry them.
+    """
+    permission_classes = [permissions.IsAuthenticated]
+    authentication_classes = [CachedTokenAuthentication]
+    max_items = 5000
+
+    def post(self, request):
+        items = request.data
+        if not isinstance(items, list):
+            return Response({"error": "Expected a list of transactions."}, status=status.HTTP_400_BAD_REQUEST)
+        if len(items) > self.max_items:
+            return Response(
+                {"error": f"At most {self.max_items} transactions per request."},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+
+        errors, valid = [], []
+        for index, item in enumerate(items):
+            serializer = TransactionBulkItemSerializer(data=item)
+            if serializer.is_valid():
+                valid.append((index, serializer.validated_data))
+            else:
+                errors.append({"index": index, "errors": serializer.errors})
+
+        category_ids = {data["category_id"] for _, data in valid}
+        categories = Category.objects.filter(user=request.user, id__in=category_ids).in_bulk() if category_ids else {}
+
+        rows = []
+        for index, data in valid:
+            category = categories.get(data.pop("category_id"))
+            if category is None:
+                errors.append({"index": index, "errors": {"category_id": ["Invalid category."]}})
+                continue
+            rows.append(Transaction(user=request.user, category=category, **data))
+
+        with db_transaction.atomic():
+            created = Transaction.objects.bulk_create(rows, batch_size=1000)
+            recompute_rollups(request.user.id, {row.date for row in created})
+
+        errors.sort(key=lambda error: error["index"])
+        return Response(
+            {
+                "created": TransactionSerializer(created, many=True).data,
+                "errors": errors,
+            },
+            status=status.HTTP_201_CREATED if created else status.HTTP_400_BAD_REQUEST,
+        )
+
+
+class TransactionImportView(APIView):
+    """Import an uploaded CSV, OFX or QIF statement.
+
+    The upload is read line by line from Django's upload handler (large files
+    are spooled to disk) and written in `chunk_size` batches.
+    """
+    permission_classes = [permissions.IsAuthenticated]
+    authentication_classes = [CachedTokenAuthentication]
+    parser_classes = [MultiPartParser]
+
+    def post(self, request):
+        upload = request.FILES.get("file")
+        if upload is None:
+            return Response({"error": "A statement file is required."}, status=status.HTTP_400_BAD_REQUEST)
+        try:
+            fmt = statement_format(upload.name, request.data.get("format"))
+            chunk_size = int(request.data.get("chunk_size", 1000))
+        except ValueError as exc:
+            return Response({"error": str(exc)}, status=status.HTTP_400_BAD_REQUEST)
+
+        columns = {
+            field: request.data[f"{field}_column"] for field in DEFAULT_COLUMNS if request.data.get(f"{field}_column")
+        }
+        importer = StatementImporter(
+            request.user,
+            chunk_size=max(1, min(chunk_size, 5000)),
+            date_format=request.data.get("date_format"),
+        )
+        stream = io.TextIOWrapper(upload.file, encoding="utf-8-sig", newline="")
+        try:
+            result = importer.run(read_statement(stream, fmt, columns))
+        except StatementReadError as exc:
+            # Chunks before the failure are already committed; say how far the import got.
+            return Response({
+                "error": str(exc),
+                "imported": importer.imported,
+                "skipped": importer.skipped,
+                "errors": importer.errors,
+            }, status=status.HTTP_400_BAD_REQUEST)
+        return Response(result, status=status.HTTP_201_CREATED)
+
+
+class ExportView(APIView):
+    """Stream the user's categories, transactions and bills as a download.
+
+    `?fmt=ndjson|json|csv` (not `format`, which DRF reserves for renderer
+    selection), `include=` a comma-separated subset of sections (CSV takes one)
+    and `gzip=1` for a compressed file. See accounts/exports.py.
+    """
+    permission_classes = [permissions.IsAuthenticated]
+    authentication_classes = [CachedTokenAuthentication]
+
+    def get(self, request):
+        fmt = request.query_params.get("fmt", "ndjson")
+        try:
+            sections = export_sections(fmt, request.query_params.get("include"))
+        except ExportError as exc:
+            return Response({"error": str(exc)}, status=status.HTTP_400_BAD_REQUEST)
+        compress = request.query_params.get("gzip", "").lower() in ("1", "true")
+
+        # Under ASGI a sync iterator would be read into memory in full before sending.
+        stream = aexport_stream if isinstance(request._request, ASGIRequest) else export_stream
+        response = StreamingHttpResponse(
+            stream(request.user.id, fmt, sections, compress=compress),
+            content_type="application/gzip" if compress else EXPORT_FORMATS[fmt],
+        )
+        filename = f"pennypal-{'-'.join(sections) if fmt == 'csv' else 'export'}-{date.today()}.{fmt}"
+        response["Content-Disposition"] = f'attachment; filename="{filename}{".gz" if compress else ""}"'
+        return response
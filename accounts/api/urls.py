@@ -9,14 +9,30 @@ from accounts.api.views import (
     monthly_summary,
     monthly_pie_data,
     annual_summary,
+    category_summary,
     day_view,
+    dashboard,
+    forecast,
     CalendarListCreateView,
     CategoryListCreateView,
     BillDueListCreateView,
     BillDueDetailView,
+    BillRecurrenceListCreateView,
+    BillRecurrenceDetailView,
     DeleteAccountView,
+    summary_cache_metrics,
+    rollup_queue_metrics,
+    request_metrics,
 )
-from accounts.api.transaction_views import TransactionListCreateView, TransactionDetailView
+from accounts.api.transaction_views import (
+    TransactionListCreateView,
+    TransactionDetailView,
+    TransactionBulkCreateView,
+    TransactionImportView,
+    TransactionSearchView,
+    ExportView,
+)
+from accounts.api import async_views
 
 urlpatterns = [
     # -------- AUTH --------
@@ -31,8 +47,12 @@ urlpatterns = [
     # -------- CATEGORIES & TRANSACTIONS --------
     path("categories/", CategoryListCreateView.as_view(), name="category-list-create"),
     path("transactions/", TransactionListCreateView.as_view(), name="transaction-list-create"),
+    path("transactions/bulk/", TransactionBulkCreateView.as_view(), name="transaction-bulk-create"),
+    path("transactions/import/", TransactionImportView.as_view(), name="transaction-import"),
+    path("transactions/search/", TransactionSearchView.as_view(), name="transaction-search"),
     path("transactions/<int:pk>/", TransactionDetailView.as_view(), name="transaction-detail"),
     path("transactions/total-expenses/", total_expenses, name="total-expenses"),
+    path("export/", ExportView.as_view(), name="export"),
 
     # -------- CALENDAR & DAILY VIEW --------
     path("calendar/", CalendarListCreateView.as_view(), name="calendar-list-create"),
@@ -41,9 +61,54 @@ urlpatterns = [
     # -------- BILLS --------
     path("bills/", BillDueListCreateView.as_view(), name="bills-list-create"),
     path("bills/<int:pk>/", BillDueDetailView.as_view(), name="bill-detail"),
+    path("bills/recurring/", BillRecurrenceListCreateView.as_view(), name="bill-recurrence-list-create"),
+    path("bills/recurring/<int:pk>/", BillRecurrenceDetailView.as_view(), name="bill-recurrence-detail"),
 
     # -------- SUMMARIES --------
     path("summary/monthly/", monthly_summary, name="monthly-summary"),
     path("summary/annual/", annual_summary, name="annual-summary"),
+    path("summary/categories/", category_summary, name="category-summary"),
     path("monthly-pie-data/", monthly_pie_data, name="monthly-pie-data"),
-]
\ No newline at end of file
+    path("dashboard/", dashboard, name="dashboard"),
+    path("forecast/", forecast, name="forecast"),
+
+    # -------- ASYNC (ASGI) --------
+    path("async/calendar/<int:calendar_id>/day/<str:date_str>/", async_views.day_view, name="async-day-view"),
+    path("async/summary/annual/", async_views.annual_summary, name="async-annual-summary"),
+    path("async/monthly-pie-data/", async_views.monthly_pie_data, name="async-monthly-pie-data"),
+    path("async/dashboard/", async_views.dashboard, name="async-dashboard"),
+
+    # -------- METRICS --------
+    path("metrics/cache/", summary_cache_metrics, name="metrics-cache"),
+    path("metrics/rollups/", rollup_queue_metrics, name="metrics-rollups"),
+    path("metrics/requests/", request_metrics, name="metrics-requests"),
+]
+
+# Most SQL queries one GET to each endpoint may run on a cold summary and token
+# cache, including the first request into months that recurring bills have not
+# been materialized into (about nine queries: the rules, one insert, one horizon
+# update, the rollups and the ETag version), a calendar range creating up to 12
+# missing months and a forecast saving its balance checkpoint (four more).
+# Over-budget GETs raise under QUERY_BUDGET_STRICT, which is on for the test
+# suite; in production they are logged and counted in metrics/requests/.
+QUERY_BUDGETS = {
+    "profile-detail": 1,
+    "category-list-create": 3,
+    "transaction-list-create": 3,
+    "transaction-search": 4,
+    "total-expenses": 3,
+    "calendar-list-create": 26,
+    "day-view": 16,
+    "bills-list-create": 14,
+    "bill-recurrence-list-create": 2,
+    "monthly-summary": 3,
+    "annual-summary": 3,
+    "category-summary": 3,
+    "monthly-pie-data": 3,
+    "dashboard": 14,
+    "forecast": 20,
+    "async-day-view": 16,
+    "async-annual-summary": 3,
+    "async-monthly-pie-data": 3,
+    "async-dashboard": 14,
+}
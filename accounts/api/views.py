@@ -1,23 +1,58 @@
 
 from rest_framework import generics, status, permissions
 from rest_framework.response import Response
-from rest_framework.permissions import IsAuthenticated
-from rest_framework.authentication import TokenAuthentication
+from rest_framework.permissions import IsAuthenticated, IsAdminUser
+from accounts.api.authentication import CachedTokenAuthentication
 from rest_framework.decorators import api_view, permission_classes, authentication_classes
 from django.contrib.auth.models import User 
-from django.db.models.functions import TruncMonth, Coalesce
-from django.db import models
-from django.db.models import Sum, F, Value as V, DecimalField
-from calendar import monthrange
-from datetime import date, datetime
+from django.db.models import Prefetch
+from collections import defaultdict
+from datetime import date, datetime, timedelta
 from rest_framework.decorators import api_view, permission_classes
-from accounts.models import Profile, Category, Transaction, Calendar, CalendarCell, BillDue
+from accounts.models import Profile, Category, Transaction, Calendar, CalendarCell, BillDue, RollupQueueEntry, BalanceCheckpoint, BillRecurrence, calendars_virtual, month_bounds, recurrence_horizon
 from rest_framework.views import APIView
+from accounts.api.fast_serializers import bill_data, bill_values
+from accounts.cache import cached_summary, cache_stats
+from accounts.instrumentation import registry as request_metrics_registry
+from accounts.summaries import (
+    annual_payload,
+    category_days,
+    category_request,
+    category_scopes,
+    category_summary_payload,
+    dashboard_bills,
+    dashboard_payload,
+    dashboard_request,
+    dashboard_rollups,
+    day_bills,
+    day_payload,
+    day_totals,
+    day_scopes,
+    day_transactions,
+    expense_total,
+    forecast_payload,
+    forecast_request,
+    monthly_rollups,
+    monthly_summary_payload,
+    parse_day,
+    pie_payload,
+    pie_years,
+    requested_years,
+    rollups_for_years,
+    upcoming_bills,
+    year_scopes,
+    year_totals,
+)
+from accounts.api.conditional import ConditionalGetMixin, conditional_get, daily_conditional_get
+from accounts.api.filters import BILL_FILTERS, apply_filters
+from accounts.api.pagination import BillDuePagination, CategoryPagination
 from .serializers import (
     UserSerializer,
     CategorySerializer,
     CalendarSerializer,
+    VirtualCalendarSerializer,
     BillDueSerializer,
+    BillRecurrenceSerializer,
     TransactionSerializer,
     UserSerializer,
 )
@@ -28,7 +63,7 @@ from accounts.api.serializers import CategorySerializer
 
 class UserProfileView(APIView):
     permission_classes = [IsAuthenticated]
-    authentication_classes = [TokenAuthentication]
+    authentication_classes = [CachedTokenAuthentication]
 
     def get(self, request):
         serializer = UserSerializer(request.user)
@@ -37,7 +72,7 @@ class UserProfileView(APIView):
 class ProfileUpdateView(generics.UpdateAPIView):
     serializer_class = UserSerializer
     permission_classes = [permissions.IsAuthenticated]
-    authentication_classes = [TokenAuthentication]
+    authentication_classes = [CachedTokenAuthentication]
 
     def get_object(self):
         return self.request.user
@@ -47,23 +82,27 @@ class ProfileUpdateView(generics.UpdateAPIView):
         serializer = self.get_serializer(instance, data=request.data, partial=True)  
         serializer.is_valid(raise_exception=True)
         self.perform_update(serializer)
+        # The dashboard embeds the profile, so its ETag must change too.
+        Profile.bump_version(instance.id)
         return Response(serializer.data)
 
 class DeleteAccountView(generics.DestroyAPIView):
     serializer_class = UserSerializer
     permission_classes = [IsAuthenticated]
-    authentication_classes = [TokenAuthentication]
+    authentication_classes = [CachedTokenAuthentication]
 
     def get_object(self):
         return self.request.user
 
 
 # -------------------- CATEGORIES --------------------
-class CategoryListCreateView(generics.ListCreateAPIView):
+class CategoryListCreateView(ConditionalGetMixin, generics.ListCreateAPIView):
    
     serializer_class = CategorySerializer
     permission_classes = [IsAuthenticated]
-    authentication_classes = [TokenAuthentication]
+    authentication_classes = [CachedTokenAuthentication]
+
+    pagination_class = CategoryPagination
 
     def get_queryset(self):
         return Category.objects.filter(user=self.request.user).order_by('name')
@@ -72,54 +111,52 @@ class CategoryListCreateView(generics.ListCreateAPIView):
         serializer.save(user=self.request.user)
 
 
+# -------------------- SUMMARY CACHE SCOPES --------------------
+def _all_time_scopes(request, *args, **kwargs):
+    return ['all']
+
+
+def _year_scopes(request, *args, **kwargs):
+    return year_scopes(request.query_params)
+
+
+def _day_scopes(request, calendar_id, date_str):
+    return day_scopes(date_str)
+
+
+def _category_scopes(request, *args, **kwargs):
+    return category_scopes(request.query_params)
+
+
 # -------------------- TRANSACTIONS (helpers) --------------------
 @api_view(['GET'])
 @permission_classes([IsAuthenticated])
-@authentication_classes([TokenAuthentication])
+@authentication_classes([CachedTokenAuthentication])
+@conditional_get
+@cached_summary('total_expenses', _all_time_scopes)
 def total_expenses(request):
     
-    total = (
-        Transaction.objects
-        .filter(user=request.user, type='expense')
-        .aggregate(Sum('amount'))
-    )
-    return Response({"total_expenses": total['amount__sum'] or 0})
+    queryset, aggregates = expense_total(request.user)
+    return Response(queryset.aggregate(**aggregates))
 
 
 # -------------------- MONTHLY SUMMARY --------------------
 @api_view(['GET'])
 @permission_classes([IsAuthenticated])
-@authentication_classes([TokenAuthentication])
+@authentication_classes([CachedTokenAuthentication])
+@conditional_get
+@cached_summary('monthly_summary', _all_time_scopes)
 def monthly_summary(request):
     
-    user = request.user
-    transactions = (
-        Transaction.objects
-        .filter(user_id=user.id)
-        .annotate(month=TruncMonth('date'))
-        .values('month')
-        .annotate(
-            total_income=Coalesce(
-                Sum('amount', filter=models.Q(type='income')),
-                V(0),
-                output_field=DecimalField(max_digits=12, decimal_places=2)
-            ),
-            total_expenses=Coalesce(
-                Sum('amount', filter=models.Q(type='expense')),
-                V(0),
-                output_field=DecimalField(max_digits=12, decimal_places=2)
-            )
-        )
-        .annotate(net_balance=F('total_income') - F('total_expenses'))
-        .order_by('-month')
-    )
-    return Response(transactions)
+    return Response(monthly_summary_payload(monthly_rollups(request.user)))
 
 
 # -------------------- DAY VIEW --------------------
 @api_view(['GET'])
 @permission_classes([IsAuthenticated])
-@authentication_classes([TokenAuthentication])
+@authentication_classes([CachedTokenAuthentication])
+@conditional_get
+@cached_summary('day_view', _day_scopes)
 def day_view(request, calendar_id, date_str):
     
     try:
@@ -128,106 +165,219 @@ def day_view(request, calendar_id, date_str):
         return Response({"error": "Calendar not found"}, status=404)
 
     try:
-        target_date = datetime.strptime(date_str, "%Y-%m-%d").date()
+        target_date = parse_day(date_str)
     except ValueError:
         return Response({"error": "Invalid date format (use YYYY-MM-DD)"}, status=400)
 
-    transactions = Transaction.objects.filter(user=request.user, date=target_date)
-    bills = BillDue.objects.filter(user=request.user, due_date=target_date)
-
-    total_expenses = transactions.filter(type='expense').aggregate(Sum('amount'))['amount__sum'] or 0
-    total_income   = transactions.filter(type='income').aggregate(Sum('amount'))['amount__sum'] or 0
-    net_balance    = total_income - total_expenses
-
-    return Response({
-        "date": target_date,
-        "transactions": list(
-            transactions.values('id', 'type', 'amount', 'category__name', 'description', 'date')
-        ),
-        "bills": list(
-            bills.values('id', 'name', 'amount', 'type', 'note', 'due_date', 'is_paid')
-        ),
-        "total_expenses": total_expenses,
-        "total_income": total_income,
-        "net_balance": net_balance,
-    })
+    BillRecurrence.ensure_occurrences(request.user.id, month_bounds(target_date.year, target_date.month)[1])
+    queryset, aggregates = day_totals(request.user, target_date)
+    return Response(day_payload(
+        target_date,
+        day_transactions(request.user, target_date),
+        day_bills(request.user, target_date),
+        queryset.aggregate(**aggregates),
+    ))
 
 # -------------------- ANNUAL SUMMARY --------------------
 @api_view(['GET'])
 @permission_classes([IsAuthenticated])
-@authentication_classes([TokenAuthentication])
+@authentication_classes([CachedTokenAuthentication])
+@daily_conditional_get
+@cached_summary('annual_summary', _year_scopes)
 def annual_summary(request):
-    user = request.user
     year = int(request.query_params.get("year", datetime.now().year))
+    queryset, aggregates = year_totals(request.user, year)
+    return Response(annual_payload(year, queryset.aggregate(**aggregates)))
 
-    transactions = Transaction.objects.filter(user=user, date__year=year)
-    bills = BillDue.objects.filter(user=user, due_date__year=year)
+# -------------------- CATEGORY SUMMARY --------------------
+@api_view(['GET'])
+@permission_classes([IsAuthenticated])
+@authentication_classes([CachedTokenAuthentication])
+@daily_conditional_get
+@cached_summary('category_summary', _category_scopes)
+def category_summary(request):
+    """Per-category totals, counts, share and month-over-month change for `from=`..`to=`.
+
+    One grouped (category, day) query over the covering index; `type=income` reports income instead of spend.
+    """
+    try:
+        start, end, kind = category_request(request.query_params)
+    except ValueError:
+        return Response({"error": "Invalid range or type (use from=YYYY-MM-DD&to=YYYY-MM-DD&type=expense|income)"},
+                        status=400)
+    return Response(category_summary_payload(start, end, kind, category_days(request.user, start, end, kind)))
 
-    total_income = transactions.filter(type="income").aggregate(Sum("amount"))["amount__sum"] or 0
-    total_expenses = transactions.filter(type="expense").aggregate(Sum("amount"))["amount__sum"] or 0
-    total_bills = bills.aggregate(Sum("amount"))["amount__sum"] or 0
 
-    total_balance = total_income - total_expenses - total_bills
+# -------------------- FORECAST --------------------
+@api_view(['GET'])
+@permission_classes([IsAuthenticated])
+@authentication_classes([CachedTokenAuthentication])
+@daily_conditional_get
+def forecast(request):
+    """Running balance per day for `from=`..`to=`, projected through unpaid bills after today.
+
+    The balance starts from the latest BalanceCheckpoint before the range, so only
+    the days since then are aggregated.
+    """
+    today = date.today()
+    try:
+        start, end = forecast_request(request.query_params, today)
+    except ValueError:
+        return Response({"error": "Invalid range (use from=YYYY-MM-DD&to=YYYY-MM-DD, at most 2 years)"}, status=400)
+
+    BillRecurrence.ensure_occurrences(request.user.id, end + timedelta(days=1))
+    opening, days = BalanceCheckpoint.daily_balances(request.user.id, start, end)
+    return Response(forecast_payload(today, opening, days, upcoming_bills(request.user, start, end, today)))
 
-    return Response({
-        "year": year,
-        "total_income": total_income,
-        "total_expenses": total_expenses,
-        "total_bills": total_bills,
-        "total_balance": total_balance,
-    })
 
 # -------------------- CALENDAR --------------------
-class CalendarListCreateView(generics.ListCreateAPIView):
-   
+def bills_by_date(user, calendars):
+    """Load every bill in the calendars' date span with one query, grouped by due date."""
+    if not calendars:
+        return {}
+    first = min((calendar.year, calendar.month) for calendar in calendars)
+    last = max((calendar.year, calendar.month) for calendar in calendars)
+    start, _ = month_bounds(*first)
+    _, end = month_bounds(*last)
+
+    grouped = defaultdict(list)
+    for bill in BillDue.objects.filter(user=user, due_date__gte=start, due_date__lt=end).order_by('due_date', 'id'):
+        grouped[bill.due_date].append(bill)
+    return grouped
+
+
+def _parse_month(value):
+    year, _, month = value.partition('-')
+    year, month = int(year), int(month)
+    if not 1 <= month <= 12:
+        raise ValueError(value)
+    return year, month
+
+
+def virtual_cells(user, calendars):
+    """{calendar id: [unsaved cells]} for every day of the calendars, from one grouped aggregate."""
+    if not calendars:
+        return {}
+    start, _ = month_bounds(*min((calendar.year, calendar.month) for calendar in calendars))
+    _, end = month_bounds(*max((calendar.year, calendar.month) for calendar in calendars))
+
+    grouped = defaultdict(list)
+    for cell in CalendarCell.month_cells(user.id, calendars, start, end):
+        grouped[cell.calendar_id].append(cell)
+    return grouped
+
+
+class CalendarListCreateView(ConditionalGetMixin, generics.ListCreateAPIView):
+    """List calendars, or with `from=YYYY-MM&to=YYYY-MM` a range (missing months are created).
+
+    POST creates one month with all its cells in bulk; a month that already
+    exists is returned with 200 instead of 201.
+    """
     serializer_class = CalendarSerializer
     permission_classes = [permissions.IsAuthenticated]
-    authentication_classes = [TokenAuthentication]
+    authentication_classes = [CachedTokenAuthentication]
+
+    max_range_months = 120
+
+    def get_serializer_class(self):
+        return VirtualCalendarSerializer if calendars_virtual() else CalendarSerializer
 
     def get_queryset(self):
         qs = Calendar.objects.filter(user=self.request.user).order_by('-year', '-month')
+        if not calendars_virtual():
+            qs = qs.prefetch_related(Prefetch('cells', queryset=CalendarCell.objects.order_by('date')))
         month = self.request.query_params.get('month')
         year = self.request.query_params.get('year')
         if month and year:
             qs = qs.filter(month=month, year=year)
         return qs
 
-    def perform_create(self, serializer):
-        month = self.request.data.get('month')
-        year  = self.request.data.get('year')
-        if not month or not year:
-            raise ValueError("month and year are required.")
-
-        existing = Calendar.objects.filter(user=self.request.user, month=month, year=year).first()
-        if existing:
-            return  
-
-        calendar = serializer.save(user=self.request.user, month=month, year=year)
-
-        _, num_days = monthrange(int(year), int(month))
-        for day in range(1, num_days + 1):
-            CalendarCell.objects.get_or_create(
-                calendar=calendar,
-                date=date(int(year), int(month), day)
+    def requested_range(self):
+        """The (year, month) pairs of `from=`/`to=`, or None; raises ValueError."""
+        params = self.request.query_params
+        if 'from' not in params and 'to' not in params:
+            return None
+        first = _parse_month(params.get('from') or params['to'])
+        last = _parse_month(params.get('to') or params['from'])
+        count = (last[0] - first[0]) * 12 + last[1] - first[1] + 1
+        if not 1 <= count <= self.max_range_months:
+            raise ValueError(count)
+        return [
+            (first[0] + (first[1] - 1 + offset) // 12, (first[1] - 1 + offset) % 12 + 1)
+            for offset in range(count)
+        ]
+
+    def serialize(self, calendars):
+        context = self.get_serializer_context()
+        if calendars:
+            last = max((calendar.year, calendar.month) for calendar in calendars)
+            BillRecurrence.ensure_occurrences(self.request.user.id, month_bounds(*last)[1])
+        context['bills_by_date'] = bills_by_date(self.request.user, calendars)
+        if calendars_virtual():
+            context['cells_by_calendar'] = virtual_cells(self.request.user, calendars)
+        return self.get_serializer(calendars, many=True, context=context).data
+
+    def list(self, request, *args, **kwargs):
+        try:
+            months = self.requested_range()
+        except ValueError:
+            return Response(
+                {"error": f"Invalid range (use from=YYYY-MM&to=YYYY-MM, at most {self.max_range_months} months)"},
+                status=400,
             )
+        queryset = self.filter_queryset(self.get_queryset())
+        if months is not None:
+            calendars, _ = Calendar.generate(request.user.id, months)
+            queryset = queryset.filter(id__in=[calendar.id for calendar in calendars.values()])
+        return Response(self.serialize(list(queryset)))
+
+    def create(self, request, *args, **kwargs):
+        serializer = self.get_serializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        month, year = serializer.validated_data['month'], serializer.validated_data['year']
+        if not 1 <= month <= 12:
+            return Response({"month": ["Must be between 1 and 12."]}, status=400)
+
+        calendars, created = Calendar.generate(request.user.id, [(year, month)])
+        calendar = self.get_queryset().get(id=calendars[(year, month)].id)
+        status_code = status.HTTP_201_CREATED if created else status.HTTP_200_OK
+        return Response(self.serialize([calendar])[0], status=status_code)
 
 
 # -------------------- BILLS --------------------
-class BillDueListCreateView(generics.ListCreateAPIView):
+class BillDueListCreateView(ConditionalGetMixin, generics.ListCreateAPIView):
     
     serializer_class = BillDueSerializer
     permission_classes = [permissions.IsAuthenticated]
-    authentication_classes = [TokenAuthentication]
+    authentication_classes = [CachedTokenAuthentication]
+
+    pagination_class = BillDuePagination
 
     def get_queryset(self):
-        qs = BillDue.objects.filter(user=self.request.user).order_by('due_date')
+        qs = BillDue.objects.filter(user=self.request.user).order_by('due_date', 'id')
         # Optional: filter by month/year to help the calendar page
         month = self.request.query_params.get('month')
         year = self.request.query_params.get('year')
         if month and year:
-            qs = qs.filter(due_date__year=year, due_date__month=month)
+            start, end = month_bounds(year, month)
+            qs = qs.filter(due_date__gte=start, due_date__lt=end)
+        if self.request.method == 'GET':
+            qs = apply_filters(qs, self.request.query_params, BILL_FILTERS)
         return qs
 
+    def list(self, request, *args, **kwargs):
+        # Materialize recurring bills for the requested month, or up to the usual horizon.
+        month = request.query_params.get('month')
+        year = request.query_params.get('year')
+        try:
+            end = month_bounds(year, month)[1] if month and year else recurrence_horizon()
+        except ValueError:
+            return Response({"error": "Invalid month or year"}, status=400)
+        BillRecurrence.ensure_occurrences(request.user.id, end)
+        # Same output as BillDueSerializer, built from values() rows.
+        page = self.paginate_queryset(bill_values(self.filter_queryset(self.get_queryset())))
+        return self.get_paginated_response(bill_data(page))
+
     def perform_create(self, serializer):
         serializer.save(user=self.request.user)
 
@@ -235,17 +385,49 @@ class BillDueDetailView(generics.RetrieveUpdateDestroyAPIView):
     
     serializer_class = BillDueSerializer
     permission_classes = [permissions.IsAuthenticated]
-    authentication_classes = [TokenAuthentication]
+    authentication_classes = [CachedTokenAuthentication]
 
     def get_queryset(self):
         return BillDue.objects.filter(user=self.request.user)
-    
+
+
+# -------------------- RECURRING BILLS --------------------
+class BillRecurrenceListCreateView(generics.ListCreateAPIView):
+    """Recurrence rules; saving one materializes its occurrences up to the horizon."""
+    serializer_class = BillRecurrenceSerializer
+    permission_classes = [permissions.IsAuthenticated]
+    authentication_classes = [CachedTokenAuthentication]
+
+    def get_queryset(self):
+        return BillRecurrence.objects.filter(user=self.request.user).order_by('start_date', 'id')
+
+    def perform_create(self, serializer):
+        rule = serializer.save(user=self.request.user)
+        BillRecurrence.ensure_occurrences(rule.user_id, recurrence_horizon(), rules=[rule])
+
+
+class BillRecurrenceDetailView(generics.RetrieveUpdateDestroyAPIView):
+    """Edits replace the unpaid occurrences from today on; paid and past ones are kept."""
+    serializer_class = BillRecurrenceSerializer
+    permission_classes = [permissions.IsAuthenticated]
+    authentication_classes = [CachedTokenAuthentication]
+
+    def get_queryset(self):
+        return BillRecurrence.objects.filter(user=self.request.user)
+
+    def perform_update(self, serializer):
+        serializer.save().rematerialize(date.today())
+
+    def perform_destroy(self, instance):
+        instance.occurrences.filter(due_date__gte=date.today(), is_paid=False).delete()
+        instance.delete()
+
 # -------------------- TRANSACTION DETAIL --------------------
 class TransactionDetailView(generics.RetrieveUpdateDestroyAPIView):
 
     serializer_class = TransactionSerializer
     permission_classes = [permissions.IsAuthenticated]
-    authentication_classes = [TokenAuthentication]
+    authentication_classes = [CachedTokenAuthentication]
 
     def get_queryset(self):
         return Transaction.objects.filter(user=self.request.user)
@@ -253,30 +435,74 @@ class TransactionDetailView(generics.RetrieveUpdateDestroyAPIView):
 # -------------------- MONTHLY PIE DATA FOR FRONTEND --------------------
 @api_view(['GET'])
 @permission_classes([IsAuthenticated])
-@authentication_classes([TokenAuthentication])
+@authentication_classes([CachedTokenAuthentication])
+@daily_conditional_get
+@cached_summary('monthly_pie_data', _year_scopes)
 def monthly_pie_data(request):
-    """Return monthly totals of income, expenses, and bills for the current year."""
-    user = request.user
-    year = int(request.query_params.get('year', datetime.now().year))
-
-    monthly_data = []
-    for month in range(1, 13):
-        transactions = Transaction.objects.filter(user=user, date__year=year, date__month=month)
-        bills = BillDue.objects.filter(user=user, due_date__year=year, due_date__month=month)
-
-        total_income = transactions.filter(type='income').aggregate(Sum('amount'))['amount__sum'] or 0
-        total_expenses = transactions.filter(type='expense').aggregate(Sum('amount'))['amount__sum'] or 0
-        total_bills = bills.aggregate(Sum('amount'))['amount__sum'] or 0
-
-        if total_income > 0 or total_expenses > 0 or total_bills > 0:
-            monthly_data.append({
-                "month": month,
-                "total_income": total_income,
-                "total_expenses": total_expenses,
-                "total_bills": total_bills,
-            })
-
-    return Response({
-        "year": year,
-        "months": monthly_data
-    })
\ No newline at end of file
+    """Return monthly totals of income, expenses, and bills for one year or a `years=` range.
+
+    Everything is read from the MonthlyRollup rows of the requested years in one query.
+    """
+    try:
+        first, last = requested_years(request.query_params)
+    except ValueError:
+        return Response({"error": "Invalid year or years range (use YYYY or YYYY-YYYY)"}, status=400)
+
+    years = pie_years(rollups_for_years(request.user, first, last), first, last)
+    return Response(pie_payload(request.query_params, years))
+
+
+# -------------------- DASHBOARD --------------------
+@api_view(['GET'])
+@permission_classes([IsAuthenticated])
+@authentication_classes([CachedTokenAuthentication])
+@daily_conditional_get
+def dashboard(request):
+    """Everything the home screen needs in one response.
+
+    `fields=` picks sections (profile, total_expenses, monthly_summary, annual,
+    pie, bills; default all) and `year=` / `month=` the period. All summaries
+    come from one MonthlyRollup query, bills from one query for the month.
+    """
+    try:
+        sections, year, month = dashboard_request(request.query_params)
+    except ValueError as exc:
+        return Response({"error": str(exc)}, status=400)
+    if 'bills' in sections:
+        BillRecurrence.ensure_occurrences(request.user.id, month_bounds(year, month)[1])
+
+    return Response(dashboard_payload(
+        request.user, sections, year, month,
+        dashboard_rollups(request.user, sections, year),
+        dashboard_bills(request.user, sections, year, month),
+    ))
+
+
+# -------------------- METRICS --------------------
+@api_view(['GET'])
+@permission_classes([IsAdminUser])
+@authentication_classes([CachedTokenAuthentication])
+def summary_cache_metrics(request):
+    """Hit/miss counters of the summary cache, overall and per endpoint."""
+    return Response(cache_stats(CACHED_SUMMARY_ENDPOINTS))
+
+
+CACHED_SUMMARY_ENDPOINTS = [
+    'total_expenses', 'monthly_summary', 'day_view', 'annual_summary', 'monthly_pie_data', 'category_summary',
+]
+
+
+@api_view(['GET'])
+@permission_classes([IsAdminUser])
+@authentication_classes([CachedTokenAuthentication])
+def rollup_queue_metrics(request):
+    """Depth and lag of the deferred rollup queue (ROLLUP_MODE=queue)."""
+    return Response(RollupQueueEntry.stats())
+
+
+@api_view(['GET'])
+@permission_classes([IsAdminUser])
+@authentication_classes([CachedTokenAuthentication])
+def request_metrics(request):
+    """Per-endpoint query count and latency histograms of this worker process."""
+    return Response(request_metrics_registry.snapshot())
@@ -0,0 +1,176 @@
+"""Per-user response cache for the summary endpoints.
+
+Every cached entry is keyed by the user, the endpoint, its parameters and the
+current version of each scope it depends on: a month (`m2025-01`), a year
+(`y2025`), the user's whole history (`all`) or their category names
+(`categories`). Writes bump only the scopes they touch, so a new transaction in
+March leaves every other year's cached summaries valid. Old entries are never
+deleted explicitly; they become unreachable and expire with the timeout.
+"""
+import hashlib
+import time
+from functools import wraps
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.core.cache import caches
+from django.db import transaction
+from rest_framework.response import Response
+
+STATS_KEY = "summary:stats:{}:{}"
+
+
+def get_cache():
+    return caches[getattr(settings, "SUMMARY_CACHE_ALIAS", "default")]
+
+
+def _version_key(user_id, scope):
+    return f"summary:v:{user_id}:{scope}"
+
+
+def scope_versions(user_id, scopes):
+    """Return the current version of each scope, seeding unseen ones.
+
+    A missing counter is seeded with a timestamp rather than 0 so that an
+    evicted counter can never come back to a value older entries were built with.
+    """
+    cache = get_cache()
+    keys = {scope: _version_key(user_id, scope) for scope in scopes}
+    found = cache.get_many(keys.values())
+    versions = {}
+    for scope, key in keys.items():
+        if key not in found:
+            cache.add(key, time.time_ns(), None)
+            found[key] = cache.get(key)
+        versions[scope] = found[key]
+    return versions
+
+
+def bump_scopes(user_id, scopes):
+    """Bump the scopes' versions once the surrounding transaction commits (at once outside one).
+
+    Bumping inside the transaction would let a concurrent read cache the
+    pre-commit rows under the new version.
+    """
+    scopes = list(scopes)
+    transaction.on_commit(lambda: _bump(user_id, scopes))
+
+
+def _bump(user_id, scopes):
+    cache = get_cache()
+    for scope in scopes:
+        key = _version_key(user_id, scope)
+        try:
+            cache.incr(key)
+        except ValueError:
+            cache.set(key, time.time_ns(), None)
+
+
+def invalidate_dates(user_id, dates, all_time=True):
+    """Invalidate the month and year scopes of the given dates.
+
+    Transactions also feed the all-time summaries; bills pass `all_time=False`.
+    """
+    scopes = set()
+    for day in dates:
+        scopes.add(f"m{day.year}-{day.month:02d}")
+        scopes.add(f"y{day.year}")
+    if scopes and all_time:
+        scopes.add("all")
+    bump_scopes(user_id, scopes)
+
+
+def invalidate_categories(user_id):
+    bump_scopes(user_id, ["categories"])
+
+
+def _record(endpoint, outcome):
+    cache = get_cache()
+    for key in (STATS_KEY.format(outcome, endpoint), STATS_KEY.format(outcome, "*")):
+        try:
+            cache.incr(key)
+        except ValueError:
+            cache.add(key, 0, None)
+            cache.incr(key)
+
+
+def cache_stats(endpoints):
+    """Return hit/miss counters overall and per endpoint."""
+    cache = get_cache()
+    stats = {}
+    for endpoint in ["*", *endpoints]:
+        hits = cache.get(STATS_KEY.format("hits", endpoint), 0)
+        misses = cache.get(STATS_KEY.format("misses", endpoint), 0)
+        total = hits + misses
+        stats["total" if endpoint == "*" else endpoint] = {
+            "hits": hits,
+            "misses": misses,
+            "hit_ratio": round(hits / total, 4) if total else None,
+        }
+    return stats
+
+
+def _lookup(endpoint, user_id, params, kwargs, depends_on):
+    """Return (key, cached data or None) for one request to `endpoint`."""
+    versions = scope_versions(user_id, sorted(depends_on))
+    params = repr((sorted(params.lists()), sorted(kwargs.items()), sorted(versions.items())))
+    key = f"summary:{endpoint}:{user_id}:{hashlib.sha1(params.encode()).hexdigest()}"
+    data = get_cache().get(key)
+    _record(endpoint, "misses" if data is None else "hits")
+    return key, data
+
+
+def _store(key, data):
+    get_cache().set(key, data, getattr(settings, "SUMMARY_CACHE_TIMEOUT", 3600))
+
+
+def cached_summary(endpoint, scopes):
+    """Cache a function view's successful response data per user and parameters.
+
+    `scopes(request, *args, **kwargs)` names the scopes the response depends on,
+    or returns None to bypass the cache (e.g. for invalid parameters).
+    """
+    def decorator(view):
+        @wraps(view)
+        def wrapper(request, *args, **kwargs):
+            if not getattr(settings, "SUMMARY_CACHE_ENABLED", True):
+                return view(request, *args, **kwargs)
+            depends_on = scopes(request, *args, **kwargs)
+            if depends_on is None:
+                return view(request, *args, **kwargs)
+
+            key, data = _lookup(endpoint, request.user.id, request.query_params, kwargs, depends_on)
+            if data is not None:
+                return Response(data)
+            response = view(request, *args, **kwargs)
+            if response.status_code == 200:
+                _store(key, response.data)
+            return response
+        return wrapper
+    return decorator
+
+
+def acached_summary(endpoint, scopes, respond):
+    """`cached_summary` for async views, sharing its entries and counters.
+
+    The view's response must carry `.data`; `respond(data)` rebuilds a response
+    from a cache hit. Cache round trips run in a worker thread.
+    """
+    def decorator(view):
+        @wraps(view)
+        async def wrapper(request, *args, **kwargs):
+            if not getattr(settings, "SUMMARY_CACHE_ENABLED", True):
+                return await view(request, *args, **kwargs)
+            depends_on = scopes(request, *args, **kwargs)
+            if depends_on is None:
+                return await view(request, *args, **kwargs)
+
+            key, data = await sync_to_async(_lookup)(endpoint, request.user.id, request.GET, kwargs, depends_on)
+            if data is not None:
+                return respond(data)
+            response = await view(request, *args, **kwargs)
+            if response.status_code == 200:
+                await sync_to_async(_store)(key, response.data)
+            return response
+        return wrapper
+    return decorator
@@ -0,0 +1,187 @@
+"""Streaming export of a user's categories, transactions and bills.
+
+Rows are read with `iterator(chunk_size=...)` (a server-side cursor on
+Postgres), shaped like the API's list responses and encoded as NDJSON, JSON or
+CSV in ~64 KiB pieces, optionally gzipped, so memory use does not grow with the
+size of the history.
+
+Under ASGI the view streams `aexport_stream`, which pulls each piece of the same
+generator through `sync_to_async`, so Django does not collect the whole sync
+iterator into memory before sending it.
+
+Everything is read inside one transaction: REPEATABLE READ on Postgres and a
+single read transaction on SQLite, so an export taken while the user keeps
+editing is still a consistent snapshot.
+"""
+import csv
+import io
+import json
+import zlib
+from contextlib import contextmanager
+from itertools import islice
+
+from asgiref.sync import sync_to_async
+from django.db import connection, transaction
+from rest_framework.utils.encoders import JSONEncoder
+
+from accounts.api.fast_serializers import bill_data, bill_values, transaction_data, transaction_values
+from accounts.models import BillDue, Category, Transaction
+
+SECTIONS = ("categories", "transactions", "bills")
+RECORDS = {"categories": "category", "transactions": "transaction", "bills": "bill"}
+FORMATS = {
+    "ndjson": "application/x-ndjson",
+    "json": "application/json",
+    "csv": "text/csv",
+}
+CSV_COLUMNS = {
+    "categories": ["id", "name"],
+    # A superset of the importer's default columns, so exports can be imported again.
+    "transactions": ["id", "date", "type", "amount", "category", "category_id", "description"],
+    "bills": ["id", "name", "amount", "type", "due_date", "note", "is_paid", "recurrence"],
+}
+BUFFER_SIZE = 64 * 1024
+
+
+class ExportError(ValueError):
+    pass
+
+
+def export_sections(fmt, include=None):
+    """Validate the requested format and sections; CSV holds exactly one section."""
+    if fmt not in FORMATS:
+        raise ExportError(f"fmt must be one of: {', '.join(FORMATS)}.")
+    if include:
+        sections = [section.strip() for section in include.split(",") if section.strip()]
+        unknown = set(sections) - set(SECTIONS)
+        if unknown:
+            raise ExportError(f"Unknown sections: {', '.join(sorted(unknown))}.")
+        sections = [section for section in SECTIONS if section in sections]
+    else:
+        sections = ["transactions"] if fmt == "csv" else list(SECTIONS)
+    if fmt == "csv" and len(sections) != 1:
+        raise ExportError("CSV exports one section at a time; pass include=transactions, bills or categories.")
+    return sections
+
+
+# ---------- READING ----------
+@contextmanager
+def snapshot():
+    # SET TRANSACTION must be the first statement, so it only applies to an outermost block.
+    outermost = not connection.in_atomic_block
+    with transaction.atomic():
+        if outermost and connection.vendor == "postgresql":
+            with connection.cursor() as cursor:
+                cursor.execute("SET TRANSACTION ISOLATION LEVEL REPEATABLE READ READ ONLY")
+        yield
+
+
+def _chunks(iterator, size):
+    while chunk := list(islice(iterator, size)):
+        yield chunk
+
+
+def section_rows(user_id, section, chunk_size):
+    """Yield one section's rows as API-shaped dicts, `chunk_size` rows in memory at a time."""
+    if section == "categories":
+        queryset = Category.objects.filter(user_id=user_id).order_by("id").values("id", "name", "user_id")
+        for row in queryset.iterator(chunk_size=chunk_size):
+            yield {"id": row["id"], "name": row["name"], "user": row["user_id"]}
+        return
+    if section == "transactions":
+        rows = transaction_values(Transaction.objects.filter(user_id=user_id).order_by("date", "id"))
+        shape = transaction_data
+    else:
+        rows = bill_values(BillDue.objects.filter(user_id=user_id).order_by("due_date", "id"))
+        shape = bill_data
+    for chunk in _chunks(rows.iterator(chunk_size=chunk_size), chunk_size):
+        yield from shape(chunk)
+
+
+# ---------- ENCODING ----------
+def _dumps(value):
+    return json.dumps(value, cls=JSONEncoder, ensure_ascii=False, separators=(",", ":"))
+
+
+def _ndjson(user_id, sections, chunk_size):
+    for section in sections:
+        record = RECORDS[section]
+        for row in section_rows(user_id, section, chunk_size):
+            yield _dumps({"record": record, **row}) + "\n"
+
+
+def _json(user_id, sections, chunk_size):
+    yield "{"
+    for index, section in enumerate(sections):
+        yield f'{"," if index else ""}"{section}":['
+        for position, row in enumerate(section_rows(user_id, section, chunk_size)):
+            yield ("," if position else "") + _dumps(row)
+        yield "]"
+    yield "}\n"
+
+
+def _csv_values(section, row):
+    if section == "transactions":
+        category = row["category"] or {}
+        row = {**row, "category": category.get("name"), "category_id": category.get("id")}
+    return [row[column] for column in CSV_COLUMNS[section]]
+
+
+def _csv(user_id, sections, chunk_size):
+    (section,) = sections
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(CSV_COLUMNS[section])
+    for row in section_rows(user_id, section, chunk_size):
+        writer.writerow(_csv_values(section, row))
+        if buffer.tell() >= BUFFER_SIZE:
+            yield buffer.getvalue()
+            buffer.seek(0)
+            buffer.truncate()
+    yield buffer.getvalue()
+
+
+ENCODERS = {"ndjson": _ndjson, "json": _json, "csv": _csv}
+
+
+def _buffered(parts):
+    pending, size = [], 0
+    for part in parts:
+        pending.append(part)
+        size += len(part)
+        if size >= BUFFER_SIZE:
+            yield "".join(pending).encode()
+            pending, size = [], 0
+    if pending:
+        yield "".join(pending).encode()
+
+
+def _gzipped(chunks):
+    compressor = zlib.compressobj(6, zlib.DEFLATED, 31)  # wbits=31: gzip container
+    for chunk in chunks:
+        compressed = compressor.compress(chunk)
+        if compressed:
+            yield compressed
+    yield compressor.flush()
+
+
+def export_stream(user_id, fmt, sections, chunk_size=2000, compress=False):
+    """Yield the encoded export as bytes, reading every section in one snapshot."""
+    with snapshot():
+        chunks = _buffered(ENCODERS[fmt](user_id, sections, chunk_size))
+        yield from _gzipped(chunks) if compress else chunks
+
+
+async def aexport_stream(user_id, fmt, sections, chunk_size=2000, compress=False):
+    """Async `export_stream` for ASGI responses, producing one piece at a time.
+
+    The calls are thread-sensitive, so every piece (and the snapshot's
+    transaction) stays on the request's database connection.
+    """
+    chunks = export_stream(user_id, fmt, sections, chunk_size, compress)
+    produce = sync_to_async(next, thread_sensitive=True)
+    try:
+        while (chunk := await produce(chunks, None)) is not None:
+            yield chunk
+    finally:
+        await sync_to_async(chunks.close, thread_sensitive=True)()
@@ -0,0 +1,274 @@
+"""Per-request query, DB, serializer and total timings for the API.
+
+`RequestMetricsMiddleware` measures every request routed through
+`accounts/api/urls.py`:
+
+- `queries` / `db`: SQL statements and the time spent executing them, recorded
+  by an execute wrapper installed on every database connection;
+- `serialize`: time spent building DRF serializer `.data` (outermost call only);
+- `total`: wall time of the request through the rest of the middleware stack.
+
+The numbers are returned in a `Server-Timing` header and folded into
+per-process histograms served by `metrics/requests/`. GET and HEAD requests
+that run more queries than the endpoint's budget in
+`accounts.api.urls.QUERY_BUDGETS` are logged and counted; with
+`QUERY_BUDGET_STRICT` (on under `manage.py test`) they raise `QueryBudgetExceeded`
+instead, so any test that makes one fails. `QueryBudgetMixin` asserts a single
+response stayed within budget.
+"""
+import contextvars
+import logging
+import threading
+import time
+from bisect import bisect_left
+from contextlib import contextmanager
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from django.db.backends.signals import connection_created
+from rest_framework.serializers import BaseSerializer
+
+logger = logging.getLogger(__name__)
+
+LATENCY_BUCKETS_MS = (1, 2, 5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000)
+QUERY_BUCKETS = (0, 1, 2, 3, 5, 8, 13, 21, 34, 55, 89)
+
+_current = contextvars.ContextVar("request_metrics", default=None)
+
+
+class RequestMetrics:
+    __slots__ = ("queries", "db", "serialize", "serializing", "total")
+
+    def __init__(self):
+        self.queries = 0
+        self.db = 0.0
+        self.serialize = 0.0
+        self.serializing = False
+        self.total = 0.0
+
+    def server_timing(self):
+        return (
+            f'db;dur={self.db * 1000:.2f};desc="{self.queries} queries", '
+            f'serialize;dur={self.serialize * 1000:.2f}, '
+            f'total;dur={self.total * 1000:.2f}'
+        )
+
+
+# ---------- RECORDING ----------
+def _record_query(execute, sql, params, many, context):
+    metrics = _current.get()
+    if metrics is None:
+        return execute(sql, params, many, context)
+    started = time.perf_counter()
+    try:
+        return execute(sql, params, many, context)
+    finally:
+        metrics.queries += 1
+        metrics.db += time.perf_counter() - started
+
+
+def _install_query_recorder(sender, connection, **kwargs):
+    # execute_wrappers outlives reconnects, so only add the recorder once.
+    if _record_query not in connection.execute_wrappers:
+        connection.execute_wrappers.append(_record_query)
+
+
+@contextmanager
+def serializing():
+    """Count the enclosed block as serializer time (nested blocks are counted once)."""
+    metrics = _current.get()
+    if metrics is None or metrics.serializing:
+        yield
+        return
+    metrics.serializing = True
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        metrics.serialize += time.perf_counter() - started
+        metrics.serializing = False
+
+
+def _timed_data(fget):
+    def data(serializer):
+        with serializing():
+            return fget(serializer)
+    data.timed = True
+    return data
+
+
+def install():
+    """Hook query and serializer timing; called once from AccountsConfig.ready()."""
+    connection_created.connect(_install_query_recorder, dispatch_uid="accounts.instrumentation")
+    if not getattr(BaseSerializer.data.fget, "timed", False):
+        BaseSerializer.data = property(_timed_data(BaseSerializer.data.fget))
+
+
+def current():
+    """The metrics of the request being served, or None outside a request."""
+    return _current.get()
+
+
+# ---------- HISTOGRAMS ----------
+def percentile(timings, fraction):
+    """Nearest-rank percentile of a list of samples, for the loadtest and benchmark commands."""
+    ordered = sorted(timings)
+    return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))]
+
+
+class _Histogram:
+    def __init__(self, bounds):
+        self.bounds = bounds
+        self.counts = [0] * (len(bounds) + 1)
+        self.sum = 0.0
+        self.max = 0.0
+
+    def observe(self, value):
+        self.counts[bisect_left(self.bounds, value)] += 1
+        self.sum += value
+        self.max = max(self.max, value)
+
+    def as_dict(self):
+        # Cumulative `le` buckets, Prometheus style.
+        buckets, running = {}, 0
+        for bound, count in zip([*self.bounds, "+Inf"], self.counts):
+            running += count
+            buckets[str(bound)] = running
+        return {"buckets": buckets, "sum": round(self.sum, 3), "max": round(self.max, 3)}
+
+
+class _EndpointStats:
+    def __init__(self):
+        self.count = 0
+        self.over_budget = 0
+        self.histograms = {
+            "queries": _Histogram(QUERY_BUCKETS),
+            "db_ms": _Histogram(LATENCY_BUCKETS_MS),
+            "serialize_ms": _Histogram(LATENCY_BUCKETS_MS),
+            "total_ms": _Histogram(LATENCY_BUCKETS_MS),
+        }
+
+
+class _Registry:
+    """Per-process request histograms, keyed by URL name."""
+
+    def __init__(self):
+        self.endpoints = {}
+        self.lock = threading.Lock()
+
+    def observe(self, endpoint, metrics, over_budget):
+        with self.lock:
+            stats = self.endpoints.get(endpoint)
+            if stats is None:
+                stats = self.endpoints[endpoint] = _EndpointStats()
+            stats.count += 1
+            stats.over_budget += over_budget
+            stats.histograms["queries"].observe(metrics.queries)
+            stats.histograms["db_ms"].observe(metrics.db * 1000)
+            stats.histograms["serialize_ms"].observe(metrics.serialize * 1000)
+            stats.histograms["total_ms"].observe(metrics.total * 1000)
+
+    def snapshot(self):
+        with self.lock:
+            return {
+                endpoint: {
+                    "count": stats.count,
+                    "over_budget": stats.over_budget,
+                    **{name: histogram.as_dict() for name, histogram in stats.histograms.items()},
+                }
+                for endpoint, stats in sorted(self.endpoints.items())
+            }
+
+    def clear(self):
+        with self.lock:
+            self.endpoints.clear()
+
+
+registry = _Registry()
+
+
+# ---------- MIDDLEWARE ----------
+class QueryBudgetExceeded(Exception):
+    """A GET ran more queries than its endpoint's budget while QUERY_BUDGET_STRICT is on."""
+
+
+def query_budget(endpoint):
+    from accounts.api.urls import QUERY_BUDGETS
+    return QUERY_BUDGETS.get(endpoint)
+
+
+def api_endpoint(request):
+    """URL name of the `accounts/api/urls.py` route that served the request, if any."""
+    from accounts.api.urls import urlpatterns
+    match = getattr(request, "resolver_match", None)
+    if match is None or not any(pattern.name == match.url_name for pattern in urlpatterns):
+        return None
+    return match.url_name
+
+
+class RequestMetricsMiddleware:
+    """Time API requests and report them in `Server-Timing` and the histograms."""
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        metrics = RequestMetrics()
+        token = _current.set(metrics)
+        started = time.perf_counter()
+        try:
+            response = self.get_response(request)
+        finally:
+            metrics.total = time.perf_counter() - started
+            _current.reset(token)
+        return self.finish(request, response, metrics)
+
+    async def __acall__(self, request):
+        metrics = RequestMetrics()
+        token = _current.set(metrics)
+        started = time.perf_counter()
+        try:
+            response = await self.get_response(request)
+        finally:
+            metrics.total = time.perf_counter() - started
+            _current.reset(token)
+        return self.finish(request, response, metrics)
+
+    def finish(self, request, response, metrics):
+        endpoint = api_endpoint(request)
+        if endpoint is None:
+            return response
+        # Budgets are per GET; writes to the same route are measured but not judged.
+        budget = query_budget(endpoint) if request.method in ("GET", "HEAD") else None
+        over_budget = budget is not None and metrics.queries > budget
+        registry.observe(endpoint, metrics, over_budget)
+        if over_budget:
+            message = f"{endpoint} ran {metrics.queries} queries (budget {budget}): {request.path}"
+            if settings.QUERY_BUDGET_STRICT:
+                raise QueryBudgetExceeded(message)
+            logger.warning(message)
+        response["Server-Timing"] = metrics.server_timing()
+        response.metrics = metrics
+        return response
+
+
+# ---------- TESTS ----------
+class QueryBudgetMixin:
+    """TestCase mixin: assert a test client response stayed within its endpoint's query budget."""
+
+    def assertWithinQueryBudget(self, response):
+        metrics = getattr(response, "metrics", None)
+        self.assertIsNotNone(metrics, "Response was not recorded by RequestMetricsMiddleware.")
+        endpoint = response.resolver_match.url_name
+        budget = query_budget(endpoint)
+        self.assertIsNotNone(budget, f"No query budget declared for {endpoint}.")
+        self.assertLessEqual(
+            metrics.queries, budget, f"{endpoint} ran {metrics.queries} queries, budget is {budget}."
+        )
+        return metrics
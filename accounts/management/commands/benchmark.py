@@ -0,0 +1,184 @@
+import json
+import platform
+import re
+import statistics
+import time
+from concurrent.futures import ThreadPoolExecutor
+from urllib.error import HTTPError
+from urllib.parse import urlencode
+from urllib.request import Request, urlopen
+
+import django
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.test import Client, override_settings
+from rest_framework.authtoken.models import Token
+
+from accounts.api.urls import QUERY_BUDGETS
+from accounts.instrumentation import percentile
+from accounts.models import Calendar, Transaction
+
+SERVER_TIMING_QUERIES = re.compile(r'db;dur=([\d.]+);desc="(\d+) queries"')
+
+
+def endpoints(calendar_id, year, month, day):
+    """(name, path, params) of every read endpoint in accounts/api/urls.py for one seeded month."""
+    month_param = {"month": month, "year": year}
+    start, end = f"{year}-{month:02d}-01", f"{year}-{month:02d}-28"
+    return [
+        ("profile-detail", "profile/", {}),
+        ("category-list-create", "categories/", {}),
+        ("transaction-list-create", "transactions/", {}),
+        ("transaction-list-create (month)", "transactions/", {"date_from": start, "date_to": end}),
+        ("transaction-search", "transactions/search/", {"q": "coff"}),
+        ("total-expenses", "transactions/total-expenses/", {}),
+        ("calendar-list-create", "calendar/", month_param),
+        ("calendar-list-create (12 months)", "calendar/", {"from": f"{year - 1}-{month:02d}", "to": f"{year}-{month:02d}"}),
+        ("day-view", f"calendar/{calendar_id}/day/{day}/", {}),
+        ("bills-list-create", "bills/", month_param),
+        ("bill-recurrence-list-create", "bills/recurring/", {}),
+        ("monthly-summary", "summary/monthly/", {}),
+        ("annual-summary", "summary/annual/", {}),
+        ("category-summary", "summary/categories/", {"from": f"{year}-01-01", "to": end}),
+        ("monthly-pie-data", "monthly-pie-data/", {}),
+        ("dashboard", "dashboard/", month_param),
+        ("forecast", "forecast/", {"from": start, "to": end}),
+        ("async-day-view", f"async/calendar/{calendar_id}/day/{day}/", {}),
+        ("async-annual-summary", "async/summary/annual/", {}),
+        ("async-monthly-pie-data", "async/monthly-pie-data/", {}),
+        ("async-dashboard", "async/dashboard/", month_param),
+        ("export", "export/", {}),
+    ]
+
+
+class Command(BaseCommand):
+    help = (
+        "Exercise every API read endpoint as a seeded user (see `seed_data`) and print throughput, "
+        "p50/p95/p99 latency and query counts as JSON. Runs in-process through the Django test client, "
+        "or against a running server with --base-url (query counts come from the Server-Timing header)."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--prefix', default='seed-', help="Username prefix of the seeded users.")
+        parser.add_argument('--base-url', help="Benchmark a running server, e.g. http://localhost:8000/api/.")
+        parser.add_argument('--requests', type=int, default=50, help="Timed requests per endpoint.")
+        parser.add_argument('--warmup', type=int, default=3, help="Untimed requests per endpoint.")
+        parser.add_argument('--concurrency', type=int, default=1,
+                            help="Requests in flight at once (--base-url only).")
+        parser.add_argument('--endpoint', action='append', dest='only',
+                            help="Only run endpoints whose name starts with this (repeatable).")
+        parser.add_argument('--no-cache', action='store_true', help="Bypass the summary cache.")
+        parser.add_argument('--label', default='', help="Free-form label stored in the report, e.g. a commit.")
+        parser.add_argument('--output', help="Write the JSON report to this file instead of stdout.")
+
+    def handle(self, *args, **options):
+        user = User.objects.filter(username__startswith=options['prefix']).order_by('id').first()
+        if user is None:
+            raise CommandError(f"No users starting with {options['prefix']!r}; run `seed_data` first.")
+        token, _ = Token.objects.get_or_create(user=user)
+        latest = Transaction.objects.filter(user=user).order_by('-date').values_list('date', flat=True).first()
+        if latest is None:
+            raise CommandError(f"{user.username} has no transactions.")
+        calendar = Calendar.objects.get(user=user, year=latest.year, month=latest.month)
+
+        selected = [
+            endpoint for endpoint in endpoints(calendar.id, latest.year, latest.month, latest.isoformat())
+            if not options['only'] or endpoint[0].startswith(tuple(options['only']))
+        ]
+        if options['base_url']:
+            if not options['base_url'].endswith('/'):
+                raise CommandError("--base-url must end with '/'.")
+            fetch = self.http_fetch(options['base_url'], token.key)
+        else:
+            fetch = self.client_fetch(token.key)
+
+        results = {}
+        with override_settings(SUMMARY_CACHE_ENABLED=not options['no_cache']):
+            for name, path, params in selected:
+                results[name] = self.run(fetch, path, params, options)
+                results[name]["query_budget"] = QUERY_BUDGETS.get(name.split(" ")[0])
+                self.stderr.write(f"{name:<34} p50={results[name]['p50_ms']:8.2f} ms")
+
+        report = {
+            "label": options['label'],
+            "target": options['base_url'] or "in-process",
+            "database": connection.vendor,
+            "django": django.get_version(),
+            "python": platform.python_version(),
+            "user": user.username,
+            "transactions": Transaction.objects.filter(user=user).count(),
+            "requests_per_endpoint": options['requests'],
+            "concurrency": options['concurrency'] if options['base_url'] else 1,
+            "summary_cache": not options['no_cache'],
+            "endpoints": results,
+        }
+        output = json.dumps(report, indent=2)
+        if options['output']:
+            with open(options['output'], 'w') as handle:
+                handle.write(output + "\n")
+        else:
+            self.stdout.write(output)
+
+    @staticmethod
+    def client_fetch(token):
+        client = Client(HTTP_HOST='localhost', HTTP_AUTHORIZATION=f"Token {token}")
+
+        def fetch(path, params):
+            started = time.perf_counter()
+            response = client.get(f"/api/{path}", params)
+            if response.streaming:
+                # Time the whole body; Server-Timing only covers the request up to the first byte.
+                b"".join(response.streaming_content)
+            elapsed = (time.perf_counter() - started) * 1000
+            return elapsed, response.status_code, response.get("Server-Timing", "")
+        return fetch
+
+    @staticmethod
+    def http_fetch(base_url, token):
+        headers = {'Authorization': f"Token {token}"}
+
+        def fetch(path, params):
+            url = base_url + path + (f"?{urlencode(params)}" if params else "")
+            started = time.perf_counter()
+            try:
+                with urlopen(Request(url, headers=headers)) as response:
+                    response.read()
+                    status, timing = response.status, response.headers.get("Server-Timing", "")
+            except HTTPError as exc:
+                status, timing = exc.code, exc.headers.get("Server-Timing", "")
+            return (time.perf_counter() - started) * 1000, status, timing
+        return fetch
+
+    def run(self, fetch, path, params, options):
+        def request(index):
+            query = {**params, "_n": index} if options['no_cache'] else params
+            return fetch(path, query)
+
+        for index in range(options['warmup']):
+            request(-index - 1)
+        started = time.perf_counter()
+        if options['base_url'] and options['concurrency'] > 1:
+            with ThreadPoolExecutor(max_workers=options['concurrency']) as pool:
+                samples = list(pool.map(request, range(options['requests'])))
+        else:
+            samples = [request(index) for index in range(options['requests'])]
+        elapsed = time.perf_counter() - started
+
+        timings = [timing for timing, _, _ in samples]
+        server = [SERVER_TIMING_QUERIES.search(header) for _, _, header in samples]
+        queries = [int(match.group(2)) for match in server if match]
+        db_ms = [float(match.group(1)) for match in server if match]
+        return {
+            "path": path,
+            "params": params,
+            "requests": len(samples),
+            "errors": sum(1 for _, status, _ in samples if status >= 400),
+            "throughput_rps": round(len(samples) / elapsed, 1),
+            "mean_ms": round(statistics.fmean(timings), 3),
+            "p50_ms": round(percentile(timings, 0.50), 3),
+            "p95_ms": round(percentile(timings, 0.95), 3),
+            "p99_ms": round(percentile(timings, 0.99), 3),
+            "queries": {"min": min(queries), "max": max(queries)} if queries else None,
+            "db_p50_ms": round(statistics.median(db_ms), 3) if db_ms else None,
+        }
@@ -0,0 +1,125 @@
+import random
+import statistics
+import time
+from datetime import date, timedelta
+from decimal import Decimal
+
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand
+from django.db import connection, transaction
+from django.db.models import Sum
+
+from accounts.models import BillDue, Transaction, month_bounds
+from accounts.search import postgres_querysets, search_transactions, terms
+from accounts.summaries import category_days
+
+MERCHANTS = [
+    'Starbucks coffee', 'Whole Foods groceries', 'Shell fuel', 'Netflix subscription', 'Uber ride',
+    'Amazon order', 'Electric utility', 'Pharmacy', 'Payroll deposit', 'Restaurant dinner',
+]
+
+
+class Command(BaseCommand):
+    help = (
+        "Seed a synthetic dataset and print the plan and latency of the hot query shapes. "
+        "Run it once at migration 0009 and once at 0010 to compare the index change, e.g. "
+        "`benchmark_queries --rows 10000000` against Postgres."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--rows', type=int, default=1_000_000, help="Transactions to seed in total.")
+        parser.add_argument('--users', type=int, default=100, help="Users to spread the rows across.")
+        parser.add_argument('--repeat', type=int, default=20, help="Timed runs per query.")
+        parser.add_argument('--reseed', action='store_true', help="Delete and re-create the benchmark users.")
+        parser.add_argument('--no-explain', action='store_true', help="Skip printing query plans.")
+
+    def handle(self, *args, **options):
+        users = User.objects.filter(username__startswith='bench-query-')
+        if options['reseed']:
+            users.delete()
+        if not users.exists():
+            self.seed(options['rows'], options['users'])
+
+        user = users.order_by('id').first()
+        year, month = 2024, 6
+        start, end = month_bounds(year, month)
+        shapes = {
+            "day": Transaction.objects.filter(user=user, date=date(year, month, 15)),
+            "month (range)": Transaction.objects.filter(user=user, date__gte=start, date__lt=end),
+            "month (__year/__month)": Transaction.objects.filter(user=user, date__year=year, date__month=month),
+            "year totals by type": Transaction.objects.filter(
+                user=user, date__gte=date(year, 1, 1), date__lt=date(year + 1, 1, 1)
+            ).values('type').annotate(total=Sum('amount')).order_by(),
+            "all-time expenses": Transaction.objects.filter(user=user, type='expense').values('user').annotate(
+                total=Sum('amount')
+            ).order_by(),
+            "bills for month": BillDue.objects.filter(user=user, due_date__gte=start, due_date__lt=end),
+            "category days": category_days(user, date(year, 1, 1), date(year, 12, 31), 'expense'),
+        }
+
+        for name, queryset in shapes.items():
+            if not options['no_explain']:
+                self.stdout.write(self.style.MIGRATE_HEADING(name))
+                self.stdout.write(queryset.explain())
+            timings = []
+            for _ in range(options['repeat']):
+                started = time.perf_counter()
+                list(queryset.all())
+                timings.append((time.perf_counter() - started) * 1000)
+            self.stdout.write(
+                f"{name:<26} p50={statistics.median(timings):8.2f} ms  max={max(timings):8.2f} ms"
+            )
+        self.time_search(user, options['repeat'], not options['no_explain'])
+
+    def time_search(self, user, repeat, explain):
+        for query in ('coff', 'whole groc', 'subscription'):
+            if explain and connection.vendor == 'postgresql':
+                # Both plans should use a bitmap scan on txn_search_vector_idx / txn_description_trgm_idx.
+                for label, queryset in zip(('full-text', 'trigram'), postgres_querysets(user, terms(query), query)):
+                    self.stdout.write(self.style.MIGRATE_HEADING(f"search '{query}' ({label})"))
+                    self.stdout.write(queryset[:50].explain())
+            timings = []
+            for _ in range(repeat):
+                started = time.perf_counter()
+                search_transactions(user, query, 50)
+                timings.append((time.perf_counter() - started) * 1000)
+            name = f"search '{query}'"
+            self.stdout.write(
+                f"{name:<26} p50={statistics.median(timings):8.2f} ms  max={max(timings):8.2f} ms"
+            )
+
+    def seed(self, rows, user_count):
+        self.stdout.write(f"Seeding {rows} transactions across {user_count} users...")
+        rng = random.Random(42)
+        users = User.objects.bulk_create(
+            [User(username=f'bench-query-{index}') for index in range(user_count)]
+        )
+        first_day, span = date(2020, 1, 1), 5 * 365
+        batch, created = [], 0
+        with transaction.atomic():
+            for index in range(rows):
+                batch.append(Transaction(
+                    user=users[index % user_count],
+                    amount=Decimal(rng.randint(100, 50000)) / 100,
+                    type='income' if rng.random() < 0.15 else 'expense',
+                    description=f"{rng.choice(MERCHANTS)} #{rng.randrange(1000)}",
+                    date=first_day + timedelta(days=rng.randrange(span)),
+                ))
+                if len(batch) == 10_000:
+                    Transaction.objects.bulk_create(batch)
+                    created += len(batch)
+                    batch = []
+                    self.stdout.write(f"  {created} rows", ending='\r')
+            Transaction.objects.bulk_create(batch)
+            BillDue.objects.bulk_create(
+                BillDue(
+                    user=user,
+                    name='Rent',
+                    amount=Decimal('1200.00'),
+                    type='Bill',
+                    due_date=date(2020 + offset // 12, offset % 12 + 1, 1),
+                )
+                for user in users
+                for offset in range(60)
+            )
+        self.stdout.write(f"Seeded {rows} transactions.")
@@ -0,0 +1,97 @@
+import random
+import time
+from datetime import date, timedelta
+from decimal import Decimal
+
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+from rest_framework.renderers import JSONRenderer
+
+from accounts.api.fast_serializers import bill_data, bill_values, transaction_data, transaction_values
+from accounts.api.serializers import BillDueSerializer, TransactionSerializer
+from accounts.models import BillDue, Category, Transaction
+
+
+class Command(BaseCommand):
+    help = (
+        "Compare rows per second of the DRF serializers and the values() fast path for list "
+        "responses, including fetching and JSON rendering, e.g. `benchmark_serializers --rows 10000 100000`."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--rows', type=int, nargs='+', default=[10_000, 100_000], help="Row counts to time.")
+        parser.add_argument('--repeat', type=int, default=3, help="Timed runs per path (best is reported).")
+
+    def handle(self, *args, **options):
+        largest = max(options['rows'])
+        user = self.seed(largest)
+        transactions = Transaction.objects.filter(user=user).select_related('category').order_by('-date', '-id')
+        bills = BillDue.objects.filter(user=user).order_by('due_date', 'id')
+        renderer = JSONRenderer()
+
+        self.stdout.write(f"{'shape':<14}{'rows':>8}  {'serializer rows/s':>18}  {'fast rows/s':>12}  speedup")
+        for rows in options['rows']:
+            for name, slow, fast in (
+                ("transactions",
+                 lambda: TransactionSerializer(transactions[:rows], many=True).data,
+                 lambda: transaction_data(transaction_values(transactions)[:rows])),
+                ("bills",
+                 lambda: BillDueSerializer(bills[:rows], many=True).data,
+                 lambda: bill_data(bill_values(bills)[:rows])),
+            ):
+                slow_bytes = renderer.render(slow())
+                if renderer.render(fast()) != slow_bytes:
+                    raise CommandError(f"The fast path output differs from the serializer for {name}.")
+                slow_rate = rows / self.best(lambda: renderer.render(slow()), options['repeat'])
+                fast_rate = rows / self.best(lambda: renderer.render(fast()), options['repeat'])
+                self.stdout.write(
+                    f"{name:<14}{rows:>8}  {slow_rate:>18,.0f}  {fast_rate:>12,.0f}  {fast_rate / slow_rate:6.1f}x"
+                )
+
+    @staticmethod
+    def best(run, repeat):
+        timings = []
+        for _ in range(repeat):
+            started = time.perf_counter()
+            run()
+            timings.append(time.perf_counter() - started)
+        return min(timings)
+
+    def seed(self, rows):
+        """A user with at least `rows` transactions and bills, created on first use."""
+        user, _ = User.objects.get_or_create(username='bench-serialize')
+        missing = rows - Transaction.objects.filter(user=user).count()
+        if missing <= 0:
+            return user
+        self.stdout.write(f"Seeding {missing} transactions and bills...")
+        rng = random.Random(7)
+        categories = Category.objects.filter(user=user) or Category.objects.bulk_create(
+            [Category(user=user, name=name) for name in ('Groceries', 'Dining', 'Transport', 'Bills')]
+        )
+        categories = list(categories) + [None]
+        first_day = date(2015, 1, 1)
+        with transaction.atomic():
+            Transaction.objects.bulk_create(
+                (
+                    Transaction(
+                        user=user, category=rng.choice(categories), type=rng.choice(('income', 'expense')),
+                        amount=Decimal(rng.randint(1, 100_000)) / 100, description=f"Row {index}",
+                        date=first_day + timedelta(days=rng.randrange(3650)),
+                    )
+                    for index in range(missing)
+                ),
+                batch_size=5000,
+            )
+            BillDue.objects.bulk_create(
+                (
+                    BillDue(
+                        user=user, name=f"Bill {index}", amount=Decimal(rng.randint(1, 100_000)) / 100,
+                        type='Bill', due_date=first_day + timedelta(days=rng.randrange(3650)),
+                        note=None if index % 2 else "autopay", is_paid=bool(index % 3),
+                    )
+                    for index in range(missing)
+                ),
+                batch_size=5000,
+            )
+        return user
@@ -0,0 +1,53 @@
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand, CommandError
+
+from accounts.importers import DEFAULT_COLUMNS, StatementImporter, StatementReadError, read_statement, statement_format
+
+
+class Command(BaseCommand):
+    help = "Stream a CSV, OFX or QIF bank statement into a user's transactions."
+
+    def add_arguments(self, parser):
+        parser.add_argument('path', help="Statement file to import.")
+        parser.add_argument('--user', required=True, help="User id or username to import for.")
+        parser.add_argument('--format', choices=['csv', 'ofx', 'qfx', 'qif'], help="Defaults to the file extension.")
+        parser.add_argument('--chunk-size', type=int, default=1000)
+        parser.add_argument('--date-format', help="strptime format for the date column, e.g. %%d/%%m/%%Y.")
+        parser.add_argument('--encoding', default='utf-8-sig')
+        for field in DEFAULT_COLUMNS:
+            parser.add_argument(f'--{field}-column', dest=f'{field}_column', help=f"CSV header holding the {field}.")
+
+    def handle(self, *args, **options):
+        lookup = {'id': options['user']} if options['user'].isdigit() else {'username': options['user']}
+        try:
+            user = User.objects.get(**lookup)
+        except User.DoesNotExist:
+            raise CommandError(f"User {options['user']!r} does not exist.")
+
+        try:
+            fmt = statement_format(options['path'], options['format'])
+        except ValueError as exc:
+            raise CommandError(str(exc))
+
+        columns = {
+            field: options[f'{field}_column'] for field in DEFAULT_COLUMNS if options[f'{field}_column']
+        }
+        importer = StatementImporter(
+            user,
+            chunk_size=options['chunk_size'],
+            date_format=options['date_format'],
+            progress=lambda imported, skipped: self.stdout.write(f"{imported} imported, {skipped} skipped"),
+        )
+
+        with open(options['path'], encoding=options['encoding'], newline='') as stream:
+            try:
+                result = importer.run(read_statement(stream, fmt, columns))
+            except StatementReadError as exc:
+                raise CommandError(f"{exc} ({importer.imported} imported, {importer.skipped} skipped)")
+
+        for error in result['errors']:
+            self.stderr.write(f"row {error['row']}: {error['error']}")
+        self.stdout.write(self.style.SUCCESS(
+            f"Imported {result['imported']} transactions ({result['skipped']} skipped) "
+            f"in {result['seconds']}s, {result['rows_per_second']} rows/s."
+        ))
@@ -0,0 +1,71 @@
+import statistics
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date
+from urllib.error import HTTPError
+from urllib.request import Request, urlopen
+
+from django.core.management.base import BaseCommand, CommandError
+
+from accounts.instrumentation import percentile
+
+DEFAULT_PATHS = [
+    'summary/annual/',
+    'monthly-pie-data/',
+    'calendar/{calendar}/day/{today}/',
+]
+
+
+class Command(BaseCommand):
+    help = (
+        "Fire concurrent GETs at one or more running deployments and report p50/p99 latency. "
+        "Pass the WSGI and ASGI base URLs, e.g. `loadtest --token KEY "
+        "http://localhost:8000/api/ http://localhost:8001/api/async/`."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('base_urls', nargs='+', help="Base URLs to compare, ending in '/'.")
+        parser.add_argument('--token', required=True, help="API token sent as `Authorization: Token`.")
+        parser.add_argument('--path', action='append', dest='paths', help="Path to request (repeatable).")
+        parser.add_argument('--calendar', type=int, default=1, help="Calendar id for the day view path.")
+        parser.add_argument('--requests', type=int, default=500, help="Requests per path and base URL.")
+        parser.add_argument('--concurrency', type=int, default=16, help="Requests in flight at once.")
+        parser.add_argument('--no-cache', action='store_true',
+                            help="Send a unique query string so the summary cache is bypassed.")
+
+    def handle(self, *args, **options):
+        paths = [
+            path.format(calendar=options['calendar'], today=date.today().isoformat())
+            for path in options['paths'] or DEFAULT_PATHS
+        ]
+        headers = {'Authorization': f"Token {options['token']}"}
+        for base_url in options['base_urls']:
+            if not base_url.endswith('/'):
+                raise CommandError(f"Base URL must end with '/': {base_url}")
+            self.stdout.write(self.style.MIGRATE_HEADING(base_url))
+            for path in paths:
+                self.run(base_url + path, headers, options)
+
+    def run(self, url, headers, options):
+        def fetch(index):
+            target = f"{url}{'&' if '?' in url else '?'}_n={index}" if options['no_cache'] else url
+            started = time.perf_counter()
+            try:
+                with urlopen(Request(target, headers=headers)) as response:
+                    response.read()
+                    status = response.status
+            except HTTPError as exc:
+                status = exc.code
+            return (time.perf_counter() - started) * 1000, status
+
+        started = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=options['concurrency']) as pool:
+            results = list(pool.map(fetch, range(options['requests'])))
+        elapsed = time.perf_counter() - started
+
+        timings = [timing for timing, _ in results]
+        errors = sum(1 for _, status in results if status >= 400)
+        self.stdout.write(
+            f"{url:<60} p50={statistics.median(timings):8.2f} ms  p99={percentile(timings, 0.99):8.2f} ms  "
+            f"{len(results) / elapsed:8.1f} req/s  errors={errors}"
+        )
@@ -0,0 +1,41 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from accounts.models import RollupQueueEntry
+
+
+class Command(BaseCommand):
+    help = (
+        "Drain the rollup queue written when ROLLUP_MODE=queue, recomputing each "
+        "distinct (user, date) once per batch."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=1000)
+        parser.add_argument('--interval', type=float, default=1.0, help="Seconds to sleep when the queue is empty.")
+        parser.add_argument('--once', action='store_true', help="Drain the queue and exit instead of polling.")
+        parser.add_argument('--stats', action='store_true', help="Print queue depth and lag and exit.")
+
+    def handle(self, *args, **options):
+        if options['stats']:
+            stats = RollupQueueEntry.stats()
+            self.stdout.write(f"depth={stats['depth']} lag={stats['lag_seconds']}s")
+            return
+
+        processed = 0
+        while True:
+            started = time.monotonic()
+            consumed = RollupQueueEntry.process_batch(options['batch_size'])
+            processed += consumed
+            if consumed:
+                self.stdout.write(
+                    f"processed {consumed} entries in {time.monotonic() - started:.3f}s "
+                    f"(lag {RollupQueueEntry.stats()['lag_seconds']}s)"
+                )
+                continue
+            if options['once']:
+                break
+            time.sleep(options['interval'])
+
+        self.stdout.write(self.style.SUCCESS(f"Queue drained, {processed} entries processed."))
@@ -0,0 +1,44 @@
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+
+from accounts.models import CalendarCell, calendars_virtual
+
+
+class Command(BaseCommand):
+    help = (
+        "Delete calendar cells with no income or expenses. Only useful with CALENDAR_MODE=virtual, "
+        "where calendar/ synthesizes empty days instead of reading them."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--user', type=int, help="Only prune this user id.")
+        parser.add_argument('--batch-size', type=int, default=5000, help="Cells deleted per transaction.")
+        parser.add_argument('--dry-run', action='store_true', help="Count the empty cells without deleting them.")
+        parser.add_argument('--force', action='store_true', help="Prune even though CALENDAR_MODE is not 'virtual'.")
+
+    def handle(self, *args, **options):
+        if not calendars_virtual() and not options['force']:
+            raise CommandError(
+                f"CALENDAR_MODE is {getattr(settings, 'CALENDAR_MODE', 'stored')!r}; stored calendars "
+                "read their empty days from these cells. Pass --force to prune anyway."
+            )
+
+        empty = CalendarCell.objects.filter(total_income=0, total_expenses=0)
+        if options['user']:
+            empty = empty.filter(calendar__user_id=options['user'])
+
+        if options['dry_run']:
+            self.stdout.write(self.style.SUCCESS(f"{empty.count()} empty cell(s) would be deleted."))
+            return
+
+        deleted = 0
+        while True:
+            with transaction.atomic():
+                ids = list(empty.order_by('id').values_list('id', flat=True)[:options['batch_size']])
+                if not ids:
+                    break
+                deleted += CalendarCell.objects.filter(id__in=ids).delete()[0]
+            if options['verbosity'] > 1:
+                self.stdout.write(f"  {deleted} deleted", ending='\r')
+        self.stdout.write(self.style.SUCCESS(f"{deleted} empty cell(s) deleted."))
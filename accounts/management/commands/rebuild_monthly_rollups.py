@@ -0,0 +1,55 @@
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from accounts.models import ROLLUP_FIELDS, MonthlyRollup
+
+
+class Command(BaseCommand):
+    help = "Backfill or rebuild MonthlyRollup rows from the raw transactions and bills."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--user', type=int, help="Only rebuild this user id.")
+        parser.add_argument(
+            '--check',
+            action='store_true',
+            help="Only compare the rollups with the raw tables and report mismatches.",
+        )
+
+    def handle(self, *args, **options):
+        users = User.objects.order_by('id')
+        if options['user']:
+            users = users.filter(id=options['user'])
+
+        mismatched = 0
+        for user_id in users.values_list('id', flat=True).iterator():
+            with transaction.atomic():
+                mismatched += self.rebuild_user(user_id, options['check'])
+
+        if options['check']:
+            style = self.style.SUCCESS if not mismatched else self.style.ERROR
+            self.stdout.write(style(f"{mismatched} month(s) out of sync."))
+        else:
+            self.stdout.write(self.style.SUCCESS(f"{mismatched} month(s) rebuilt."))
+
+    def rebuild_user(self, user_id, check_only):
+        expected = MonthlyRollup.expected_totals(user_id)
+        stored = {
+            (rollup.year, rollup.month): {field: getattr(rollup, field) for field in ROLLUP_FIELDS}
+            for rollup in MonthlyRollup.objects.filter(user_id=user_id)
+        }
+        empty = MonthlyRollup._empty_totals()
+
+        drifted = {
+            key for key in expected.keys() | stored.keys()
+            if expected.get(key, empty) != stored.get(key, empty)
+        }
+        for year, month in sorted(drifted):
+            self.stdout.write(
+                f"user={user_id} {year}-{month:02d}: "
+                f"stored={stored.get((year, month))} expected={expected.get((year, month), empty)}"
+            )
+
+        if not check_only and drifted:
+            MonthlyRollup.recompute_months(user_id, drifted)
+        return len(drifted)
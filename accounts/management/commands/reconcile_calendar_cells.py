@@ -0,0 +1,93 @@
+from decimal import Decimal
+
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand
+from django.db import models, transaction
+from django.db.models import Sum
+
+from accounts.models import Calendar, CalendarCell, Transaction
+
+
+ZERO = Decimal('0')
+
+
+class Command(BaseCommand):
+    help = "Rebuild CalendarCell totals from the raw transactions and report any drift."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--user', type=int, help="Only reconcile this user id.")
+        parser.add_argument(
+            '--dry-run',
+            action='store_true',
+            help="Report drift without writing the corrected totals.",
+        )
+
+    def handle(self, *args, **options):
+        self.verbosity = options['verbosity']
+        users = User.objects.order_by('id')
+        if options['user']:
+            users = users.filter(id=options['user'])
+
+        drifted = 0
+        for user_id in users.values_list('id', flat=True).iterator():
+            with transaction.atomic():
+                drifted += self.reconcile_user(user_id, options['dry_run'])
+
+        verb = "would be corrected" if options['dry_run'] else "corrected"
+        self.stdout.write(self.style.SUCCESS(f"{drifted} cell(s) {verb}."))
+
+    def reconcile_user(self, user_id, dry_run):
+        expected = {
+            row['date']: (row['income'], row['expenses'])
+            for row in (
+                Transaction.objects
+                .filter(user_id=user_id)
+                .values('date')
+                .annotate(
+                    income=Sum('amount', filter=models.Q(type='income'), default=ZERO),
+                    expenses=Sum('amount', filter=models.Q(type='expense'), default=ZERO),
+                )
+            )
+        }
+
+        stale = []
+        for cell in CalendarCell.objects.filter(calendar__user_id=user_id):
+            income, expenses = expected.pop(cell.date, (ZERO, ZERO))
+            if (cell.total_income, cell.total_expenses, cell.net_balance) != (income, expenses, income - expenses):
+                self.report(user_id, cell.date, cell.total_income, cell.total_expenses, income, expenses)
+                cell.total_income = income
+                cell.total_expenses = expenses
+                cell.net_balance = income - expenses
+                stale.append(cell)
+
+        # Whatever is left has transactions but no cell at all.
+        for day, (income, expenses) in expected.items():
+            self.report(user_id, day, None, None, income, expenses)
+
+        if not dry_run:
+            CalendarCell.objects.bulk_update(stale, ['total_income', 'total_expenses', 'net_balance'], batch_size=500)
+            calendars, missing = {}, []
+            for day, (income, expenses) in expected.items():
+                if (day.year, day.month) not in calendars:
+                    calendars[(day.year, day.month)], _ = Calendar.objects.get_or_create(
+                        user_id=user_id, month=day.month, year=day.year
+                    )
+                missing.append(CalendarCell(
+                    calendar=calendars[(day.year, day.month)],
+                    date=day,
+                    total_income=income,
+                    total_expenses=expenses,
+                    net_balance=income - expenses,
+                ))
+            CalendarCell.objects.bulk_create(missing, batch_size=500)
+
+        return len(stale) + len(expected)
+
+    def report(self, user_id, day, income, expenses, expected_income, expected_expenses):
+        if self.verbosity < 1:
+            return
+        found = "missing" if income is None else f"income={income} expenses={expenses}"
+        self.stdout.write(
+            f"user={user_id} date={day}: {found}, "
+            f"expected income={expected_income} expenses={expected_expenses}"
+        )
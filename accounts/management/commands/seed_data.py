@@ -0,0 +1,159 @@
+import random
+from datetime import date
+from decimal import Decimal
+from itertools import accumulate
+
+from django.contrib.auth.hashers import make_password
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+from rest_framework.authtoken.models import Token
+
+from accounts.cache import invalidate_dates
+from accounts.models import (
+    BillDue, Calendar, CalendarCell, Category, MonthlyRollup, Profile, Transaction,
+    add_months, calendars_virtual,
+)
+
+# (category, median expense, merchants), most frequent first; frequencies follow a Zipf curve.
+CATEGORIES = [
+    ('Groceries', 45, ['Whole Foods', 'Trader Joes', 'Safeway', 'Costco']),
+    ('Dining', 28, ['Starbucks coffee', 'Chipotle', 'Sushi bar', 'Pizza place']),
+    ('Transport', 18, ['Uber ride', 'Shell fuel', 'Metro card', 'Parking']),
+    ('Shopping', 60, ['Amazon order', 'Target', 'IKEA', 'Best Buy']),
+    ('Utilities', 90, ['Electric utility', 'Water bill', 'Gas utility']),
+    ('Entertainment', 25, ['Netflix subscription', 'Cinema', 'Concert tickets', 'Steam games']),
+    ('Health', 40, ['Pharmacy', 'Dentist', 'Gym membership']),
+    ('Travel', 250, ['Airline tickets', 'Hotel booking', 'Car rental']),
+    ('Gifts', 50, ['Florist', 'Gift shop']),
+    ('Education', 80, ['Bookstore', 'Online course']),
+    ('Pets', 35, ['Pet store', 'Veterinarian']),
+    ('Home', 120, ['Hardware store', 'Cleaning service']),
+]
+
+# (name, amount, type, day of month, every n months)
+BILLS = [
+    ('Rent', Decimal('1450.00'), 'Bill', 1, 1),
+    ('Phone', Decimal('55.00'), 'Bill', 12, 1),
+    ('Internet', Decimal('70.00'), 'Bill', 18, 1),
+    ('Credit card', Decimal('400.00'), 'Credit Card', 25, 1),
+    ('Car insurance', Decimal('310.00'), 'Bill', 5, 3),
+]
+
+
+class Command(BaseCommand):
+    help = (
+        "Seed reproducible synthetic users with transaction history, bills and calendar months, "
+        "e.g. `seed_data --users 50 --years 3`. Users are named `<prefix><n>` with password "
+        "`<prefix>pass` and an API token; use `benchmark` to exercise the API against them."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--users', type=int, default=10, help="Users to create.")
+        parser.add_argument('--years', type=int, default=2, help="Years of history per user.")
+        parser.add_argument('--per-month', type=int, default=60,
+                            help="Average expenses per user and month (individual users vary).")
+        parser.add_argument('--categories', type=int, default=len(CATEGORIES), help="Categories per user.")
+        parser.add_argument('--skew', type=float, default=1.1,
+                            help="Zipf exponent of the category distribution (0 = uniform).")
+        parser.add_argument('--end', default=None, help="Last seeded month as YYYY-MM (default: this month).")
+        parser.add_argument('--prefix', default='seed-', help="Username prefix of the seeded users.")
+        parser.add_argument('--seed', type=int, default=42, help="Random seed.")
+        parser.add_argument('--batch-size', type=int, default=5000, help="Rows per bulk insert.")
+        parser.add_argument('--reset', action='store_true', help="Delete existing users with the prefix first.")
+
+    def handle(self, *args, **options):
+        end = self.parse_end(options['end'])
+        months = [
+            (day.year, day.month)
+            for day in (add_months(end, -offset) for offset in reversed(range(options['years'] * 12)))
+        ]
+        categories = CATEGORIES[:max(1, min(options['categories'], len(CATEGORIES)))]
+        weights = list(accumulate(1 / (rank ** options['skew']) for rank in range(1, len(categories) + 1)))
+
+        existing = User.objects.filter(username__startswith=options['prefix'])
+        if options['reset']:
+            existing.delete()
+        elif existing.exists():
+            raise CommandError(f"Users starting with {options['prefix']!r} exist; pass --reset to replace them.")
+
+        rng = random.Random(options['seed'])
+        password = make_password(f"{options['prefix']}pass")
+        users = User.objects.bulk_create([
+            User(username=f"{options['prefix']}{index}", email=f"{options['prefix']}{index}@example.com",
+                 password=password)
+            for index in range(options['users'])
+        ])
+        # bulk_create skips the post_save signal that creates profiles.
+        Profile.objects.bulk_create([Profile(user=user) for user in users])
+        Token.objects.bulk_create([Token(user=user, key=Token.generate_key()) for user in users])
+
+        totals = {'transactions': 0, 'bills': 0}
+        for user in users:
+            with transaction.atomic():
+                created = self.seed_user(user, months, categories, weights, rng, options)
+            for key in totals:
+                totals[key] += created[key]
+            self.stdout.write(f"  {user.username}: {created['transactions']} transactions")
+
+        self.stdout.write(self.style.SUCCESS(
+            f"Seeded {len(users)} users, {totals['transactions']} transactions and {totals['bills']} bills "
+            f"over {months[0][0]}-{months[0][1]:02d}..{months[-1][0]}-{months[-1][1]:02d}."
+        ))
+
+    @staticmethod
+    def parse_end(value):
+        if value is None:
+            return date.today().replace(day=1)
+        try:
+            year, month = (int(part) for part in value.split('-'))
+            return date(year, month, 1)
+        except ValueError:
+            raise CommandError("--end must be YYYY-MM.")
+
+    def seed_user(self, user, months, categories, weights, rng, options):
+        user_categories = Category.objects.bulk_create(
+            [Category(user=user, name=name) for name, _, _ in categories]
+        )
+        # Heavy-tailed activity: most users are near the average, a few are much busier.
+        per_month = max(1, round(options['per_month'] * min(4.0, rng.paretovariate(3) * 2 / 3)))
+        salary = Decimal(rng.randrange(2500, 9000, 50))
+
+        rows, bills = [], []
+        for year, month in months:
+            first = date(year, month, 1)
+            days_in_month = (add_months(first, 1) - first).days
+            for payday in (1, 15):
+                rows.append(Transaction(
+                    user=user, category=None, amount=salary / 2, type='income',
+                    date=first.replace(day=payday), description='Payroll deposit',
+                ))
+            for index in rng.choices(range(len(categories)), cum_weights=weights, k=per_month):
+                _, median, merchants = categories[index]
+                amount = Decimal(str(round(median * rng.lognormvariate(0, 0.6), 2))) or Decimal('1.00')
+                rows.append(Transaction(
+                    user=user, category=user_categories[index], amount=amount, type='expense',
+                    date=first.replace(day=rng.randint(1, days_in_month)),
+                    description=f"{rng.choice(merchants)} #{rng.randrange(1000)}",
+                ))
+            for offset, (name, amount, kind, day, every) in enumerate(BILLS):
+                if (year * 12 + month + offset) % every:
+                    continue
+                due_date = first.replace(day=min(day, days_in_month))
+                bills.append(BillDue(
+                    user=user, name=name, amount=amount, type=kind, due_date=due_date,
+                    is_paid=due_date < date.today(),
+                ))
+
+        Transaction.objects.bulk_create(rows, batch_size=options['batch_size'])
+        BillDue.objects.bulk_create(bills, batch_size=options['batch_size'])
+
+        # The bulk inserts skipped the rollup signals: build calendars and cells from one
+        # aggregate per user, then the monthly rollups.
+        Calendar.generate(user.id, months)
+        if calendars_virtual():
+            CalendarCell.recompute_days(user.id, {row.date for row in rows})
+        MonthlyRollup.recompute_months(user.id, months)
+        invalidate_dates(user.id, [date(year, month, 1) for year, month in months])
+        Profile.bump_version(user.id)
+        return {'transactions': len(rows), 'bills': len(bills)}
@@ -0,0 +1,75 @@
+# Generated by Django 5.2.7 on 2026-10-18 17:55
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+from django.db.models import Count, Q, Sum
+from django.db.models.functions import ExtractMonth, ExtractYear
+
+
+def backfill_rollups(apps, schema_editor):
+    Transaction = apps.get_model('accounts', 'Transaction')
+    BillDue = apps.get_model('accounts', 'BillDue')
+    MonthlyRollup = apps.get_model('accounts', 'MonthlyRollup')
+
+    rollups = {}
+
+    def rollup(user_id, year, month):
+        if (user_id, year, month) not in rollups:
+            rollups[(user_id, year, month)] = MonthlyRollup(user_id=user_id, year=year, month=month)
+        return rollups[(user_id, year, month)]
+
+    for row in (
+        Transaction.objects
+        .annotate(year=ExtractYear('date'), month=ExtractMonth('date'))
+        .values('user_id', 'year', 'month')
+        .annotate(
+            income=Sum('amount', filter=Q(type='income'), default=0),
+            expenses=Sum('amount', filter=Q(type='expense'), default=0),
+            count=Count('id'),
+        )
+        .order_by()
+    ):
+        obj = rollup(row['user_id'], row['year'], row['month'])
+        obj.total_income, obj.total_expenses, obj.transaction_count = row['income'], row['expenses'], row['count']
+
+    for row in (
+        BillDue.objects
+        .annotate(year=ExtractYear('due_date'), month=ExtractMonth('due_date'))
+        .values('user_id', 'year', 'month')
+        .annotate(amount=Sum('amount', default=0), count=Count('id'))
+        .order_by()
+    ):
+        obj = rollup(row['user_id'], row['year'], row['month'])
+        obj.total_bills, obj.bill_count = row['amount'], row['count']
+
+    MonthlyRollup.objects.bulk_create(rollups.values(), batch_size=1000)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0008_alter_billdue_type'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='MonthlyRollup',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('year', models.IntegerField()),
+                ('month', models.IntegerField()),
+                ('total_income', models.DecimalField(decimal_places=2, default=0, max_digits=12)),
+                ('total_expenses', models.DecimalField(decimal_places=2, default=0, max_digits=12)),
+                ('total_bills', models.DecimalField(decimal_places=2, default=0, max_digits=12)),
+                ('transaction_count', models.IntegerField(default=0)),
+                ('bill_count', models.IntegerField(default=0)),
+                ('user', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='monthly_rollups', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'unique_together': {('user', 'year', 'month')},
+            },
+        ),
+        migrations.RunPython(backfill_rollups, migrations.RunPython.noop),
+    ]
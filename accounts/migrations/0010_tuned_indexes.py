@@ -0,0 +1,51 @@
+# Generated by Django 5.2.7 on 2026-10-18 17:56
+
+from django.conf import settings
+from django.db import migrations, models
+from django.db.models import Count, Min
+
+
+def remove_duplicate_cells(apps, schema_editor):
+    """Keep the oldest cell per (calendar, date); run reconcile_calendar_cells afterwards to refresh totals."""
+    CalendarCell = apps.get_model('accounts', 'CalendarCell')
+    duplicates = (
+        CalendarCell.objects
+        .values('calendar_id', 'date')
+        .annotate(keep=Min('id'), copies=Count('id'))
+        .filter(copies__gt=1)
+    )
+    for row in duplicates:
+        (
+            CalendarCell.objects
+            .filter(calendar_id=row['calendar_id'], date=row['date'])
+            .exclude(id=row['keep'])
+            .delete()
+        )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0009_monthlyrollup'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.RunPython(remove_duplicate_cells, migrations.RunPython.noop),
+        migrations.AddIndex(
+            model_name='billdue',
+            index=models.Index(fields=['user', 'due_date'], name='bill_user_due_date_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='transaction',
+            index=models.Index(fields=['user', 'date'], name='txn_user_date_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='transaction',
+            index=models.Index(fields=['user', 'type', 'date', 'amount'], name='txn_user_type_date_amt_idx'),
+        ),
+        migrations.AddConstraint(
+            model_name='calendarcell',
+            constraint=models.UniqueConstraint(fields=('calendar', 'date'), name='unique_calendar_cell_date'),
+        ),
+    ]
@@ -0,0 +1,35 @@
+# Generated by Django 5.2.7 on 2026-10-18 17:57
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0010_tuned_indexes'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='billdue',
+            name='bill_user_due_date_idx',
+        ),
+        migrations.RemoveIndex(
+            model_name='transaction',
+            name='txn_user_date_idx',
+        ),
+        migrations.AddIndex(
+            model_name='billdue',
+            index=models.Index(fields=['user', 'due_date', 'id'], name='bill_user_due_date_id_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='category',
+            index=models.Index(fields=['user', 'name', 'id'], name='category_user_name_id_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='transaction',
+            index=models.Index(fields=['user', 'date', 'id'], name='txn_user_date_id_idx'),
+        ),
+    ]
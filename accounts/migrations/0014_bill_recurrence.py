@@ -0,0 +1,46 @@
+# Generated by Django 5.2.7 on 2026-10-18 18:11
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0013_rollupqueueentry'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='BillRecurrence',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('name', models.CharField(max_length=100)),
+                ('amount', models.DecimalField(decimal_places=2, max_digits=10)),
+                ('type', models.CharField(choices=[('Bill', 'Bill'), ('Credit Card', 'Credit Card')], max_length=20)),
+                ('note', models.TextField(blank=True, null=True)),
+                ('frequency', models.CharField(choices=[('weekly', 'Weekly'), ('monthly', 'Monthly'), ('nth_weekday', 'Monthly on the nth weekday'), ('yearly', 'Yearly')], max_length=20)),
+                ('interval', models.PositiveSmallIntegerField(default=1)),
+                ('start_date', models.DateField()),
+                ('end_date', models.DateField(blank=True, null=True)),
+                ('count', models.PositiveIntegerField(blank=True, null=True)),
+                ('materialized_through', models.DateField(blank=True, null=True)),
+                ('user', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='bill_recurrences', to=settings.AUTH_USER_MODEL)),
+            ],
+        ),
+        migrations.AddField(
+            model_name='billdue',
+            name='recurrence',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='occurrences', to='accounts.billrecurrence'),
+        ),
+        migrations.AddConstraint(
+            model_name='billdue',
+            constraint=models.UniqueConstraint(fields=('recurrence', 'due_date'), name='unique_bill_occurrence'),
+        ),
+        migrations.AddIndex(
+            model_name='billrecurrence',
+            index=models.Index(fields=['user', 'materialized_through'], name='recurrence_user_horizon_idx'),
+        ),
+    ]
@@ -0,0 +1,68 @@
+from django.db import migrations
+
+# Postgres: expression GIN index for full-text search plus a trigram index for the
+# fuzzy fallback. Both are maintained by Postgres itself on every write.
+POSTGRES_FORWARD = [
+    "CREATE EXTENSION IF NOT EXISTS pg_trgm",
+    "CREATE INDEX IF NOT EXISTS txn_description_fts_idx ON accounts_transaction "
+    "USING GIN (to_tsvector('english', coalesce(description, '')))",
+    "CREATE INDEX IF NOT EXISTS txn_description_trgm_idx ON accounts_transaction "
+    "USING GIN (description gin_trgm_ops)",
+]
+POSTGRES_REVERSE = [
+    "DROP INDEX IF EXISTS txn_description_trgm_idx",
+    "DROP INDEX IF EXISTS txn_description_fts_idx",
+]
+
+# SQLite: an external-content FTS5 table over accounts_transaction, kept in sync by
+# triggers so bulk_create and raw writes are indexed too.
+SQLITE_FORWARD = [
+    "CREATE VIRTUAL TABLE accounts_transaction_fts USING fts5("
+    "description, content='accounts_transaction', content_rowid='id', tokenize='porter unicode61')",
+    "CREATE TRIGGER accounts_transaction_fts_insert AFTER INSERT ON accounts_transaction BEGIN "
+    "INSERT INTO accounts_transaction_fts(rowid, description) VALUES (new.id, new.description); END",
+    "CREATE TRIGGER accounts_transaction_fts_delete AFTER DELETE ON accounts_transaction BEGIN "
+    "INSERT INTO accounts_transaction_fts(accounts_transaction_fts, rowid, description) "
+    "VALUES ('delete', old.id, old.description); END",
+    "CREATE TRIGGER accounts_transaction_fts_update AFTER UPDATE OF description ON accounts_transaction BEGIN "
+    "INSERT INTO accounts_transaction_fts(accounts_transaction_fts, rowid, description) "
+    "VALUES ('delete', old.id, old.description); "
+    "INSERT INTO accounts_transaction_fts(rowid, description) VALUES (new.id, new.description); END",
+    "INSERT INTO accounts_transaction_fts(accounts_transaction_fts) VALUES ('rebuild')",
+]
+SQLITE_REVERSE = [
+    "DROP TRIGGER IF EXISTS accounts_transaction_fts_update",
+    "DROP TRIGGER IF EXISTS accounts_transaction_fts_delete",
+    "DROP TRIGGER IF EXISTS accounts_transaction_fts_insert",
+    "DROP TABLE IF EXISTS accounts_transaction_fts",
+]
+
+
+def sqlite_has_fts5(connection):
+    with connection.cursor() as cursor:
+        cursor.execute("PRAGMA compile_options")
+        return any(row[0] == 'ENABLE_FTS5' for row in cursor.fetchall())
+
+
+def run(statements_by_vendor):
+    def operation(apps, schema_editor):
+        connection = schema_editor.connection
+        if connection.vendor == 'sqlite' and not sqlite_has_fts5(connection):
+            return  # accounts.search falls back to icontains
+        for statement in statements_by_vendor.get(connection.vendor, []):
+            schema_editor.execute(statement)
+    return operation
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0016_balancecheckpoint'),
+    ]
+
+    operations = [
+        migrations.RunPython(
+            run({'postgresql': POSTGRES_FORWARD, 'sqlite': SQLITE_FORWARD}),
+            run({'postgresql': POSTGRES_REVERSE, 'sqlite': SQLITE_REVERSE}),
+        ),
+    ]
@@ -0,0 +1,37 @@
+from django.db import migrations
+
+# Postgres: store the english tsvector in a generated column with its own GIN index, so
+# searches filter with `search_vector @@ query` instead of having to repeat 0017's
+# indexed expression byte for byte. The trigram index from 0017 stays for the fallback.
+# Postgres-only, so the column is not part of the model state; accounts.search reads it
+# with RawSQL. SQLite keeps the FTS5 table.
+POSTGRES_FORWARD = [
+    "ALTER TABLE accounts_transaction ADD COLUMN IF NOT EXISTS search_vector tsvector "
+    "GENERATED ALWAYS AS (to_tsvector('english', coalesce(description, ''))) STORED",
+    "CREATE INDEX IF NOT EXISTS txn_search_vector_idx ON accounts_transaction USING GIN (search_vector)",
+    "DROP INDEX IF EXISTS txn_description_fts_idx",
+]
+POSTGRES_REVERSE = [
+    "CREATE INDEX IF NOT EXISTS txn_description_fts_idx ON accounts_transaction "
+    "USING GIN (to_tsvector('english', coalesce(description, '')))",
+    "ALTER TABLE accounts_transaction DROP COLUMN IF EXISTS search_vector",
+]
+
+
+def run(statements):
+    def operation(apps, schema_editor):
+        if schema_editor.connection.vendor == 'postgresql':
+            for statement in statements:
+                schema_editor.execute(statement)
+    return operation
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0017_transaction_search'),
+    ]
+
+    operations = [
+        migrations.RunPython(run(POSTGRES_FORWARD), run(POSTGRES_REVERSE)),
+    ]
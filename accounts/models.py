@@ -1,18 +1,48 @@
-from django.db import models
+from django.conf import settings
+from django.db import connection, models, transaction
 from django.contrib.auth.models import User
-from django.db.models.signals import post_save
+from django.db.models.signals import post_save, pre_save, post_delete
+from django.utils import timezone
 from django.dispatch import receiver
-from django.db.models import Sum
+from django.db.models import Sum, F, Count, Value
+from django.db.models.functions import ExtractYear, ExtractMonth
+import itertools
+from calendar import monthrange
+from datetime import date, timedelta
+from decimal import Decimal
+from rest_framework.authtoken.models import Token
+from accounts.api.authentication import evict_token, evict_user_tokens
+from accounts.cache import bump_scopes, invalidate_categories, invalidate_dates
+
+
+def month_bounds(year, month):
+    """Return (first day, first day of the next month) for half-open date range filters.
+
+    Range filters on the raw date column can use the (user, date) indexes, unlike
+    `__month` lookups which wrap the column in a function.
+    """
+    year, month = int(year), int(month)
+    return date(year, month, 1), date(year + month // 12, month % 12 + 1, 1)
 
 
 # ---------- PROFILE -------------------------------------------------------------------
 class Profile(models.Model):
     user = models.OneToOneField(User, on_delete=models.CASCADE)
     created_at = models.DateTimeField(auto_now_add=True)
+    # Bumped on every write to the user's financial data; drives ETag / Last-Modified.
+    data_version = models.PositiveBigIntegerField(default=0)
+    data_modified_at = models.DateTimeField(null=True, blank=True)
 
     def __str__(self):
         return self.user.username
 
+    @classmethod
+    def bump_version(cls, user_id):
+        cls.objects.filter(user_id=user_id).update(
+            data_version=F('data_version') + 1,
+            data_modified_at=timezone.now(),
+        )
+
 
 @receiver(post_save, sender=User)
 def create_user_profile(sender, instance, created, **kwargs):
@@ -21,11 +51,27 @@ def create_user_profile(sender, instance, created, **kwargs):
         Profile.objects.create(user=instance)
 
 
+@receiver(post_save, sender=User)
+def evict_cached_user(sender, instance, **kwargs):
+    """Drop cached authentication so profile edits and deactivation apply immediately."""
+    evict_user_tokens(instance.id)
+
+
+@receiver(post_delete, sender=Token)
+def evict_deleted_token(sender, instance, **kwargs):
+    evict_token(instance.key)
+
+
 # ---------- CATEGORY ------------------------------------------------------------------
 class Category(models.Model):
     name = models.CharField(max_length=100)
     user = models.ForeignKey(User, on_delete=models.CASCADE, related_name='categories')
 
+    class Meta:
+        indexes = [
+            models.Index(fields=['user', 'name', 'id'], name='category_user_name_id_idx'),
+        ]
+
     def __str__(self):
         return f"{self.name} ({self.user.username})"
 
@@ -50,11 +96,24 @@ class Transaction(models.Model):
     description = models.TextField(blank=True, null=True)
     date = models.DateField()
 
+    class Meta:
+        indexes = [
+            # Lists, day views, date-range filters and (date, id) keyset pages for one user.
+            models.Index(fields=['user', 'date', 'id'], name='txn_user_date_id_idx'),
+            # Covers SUM(amount) per type (and per category) over a date range without touching the table.
+            models.Index(fields=['user', 'type', 'date', 'category', 'amount'], name='txn_user_type_date_cat_idx'),
+        ]
+
     def __str__(self):
         return f"{self.type.capitalize()} - {self.amount} ({self.category or 'No Category'})"
 
 
 # ---------- CALENDAR ------------------------------------------------------------------
+def calendars_virtual():
+    """True when CALENDAR_MODE='virtual': cells are synthesized on read, only non-empty days are stored."""
+    return getattr(settings, 'CALENDAR_MODE', 'stored') == 'virtual'
+
+
 class Calendar(models.Model):
     user = models.ForeignKey(User, on_delete=models.CASCADE, related_name='calendars')
     month = models.IntegerField()  # 1–12
@@ -66,6 +125,52 @@ class Calendar(models.Model):
     def __str__(self):
         return f"{self.user.username} - {self.month}/{self.year}"
 
+    @classmethod
+    def generate(cls, user_id, months):
+        """Ensure calendars with a full set of cells exist for the given (year, month) pairs.
+
+        Missing calendars and cells are bulk created, and new cells start from one
+        grouped aggregate over the transactions already stored for the whole span.
+        In virtual calendar mode only the calendars are created.
+        Returns ({(year, month): calendar}, set of (year, month) that were created).
+        """
+        months = sorted({(int(year), int(month)) for year, month in months})
+        if not months:
+            return {}, set()
+        month_filter = models.Q()
+        for year, month in months:
+            month_filter |= models.Q(year=year, month=month)
+
+        with transaction.atomic():
+            existing = {(c.year, c.month) for c in cls.objects.filter(month_filter, user_id=user_id)}
+            created = set(months) - existing
+            cls.objects.bulk_create(
+                [cls(user_id=user_id, year=year, month=month) for year, month in sorted(created)],
+                ignore_conflicts=True,
+            )
+            calendars = {(c.year, c.month): c for c in cls.objects.filter(month_filter, user_id=user_id)}
+            if calendars_virtual():
+                cells = []
+            else:
+                cells = cls._missing_cells(user_id, calendars, months)
+            CalendarCell.objects.bulk_create(cells, batch_size=500, ignore_conflicts=True)
+
+        if created or cells:
+            # bulk_create skips the signals that normally bump the ETag version.
+            Profile.bump_version(user_id)
+        return calendars, created
+
+    @staticmethod
+    def _missing_cells(user_id, calendars, months):
+        start, end = month_bounds(*months[0])[0], month_bounds(*months[-1])[1]
+        have = set(
+            CalendarCell.objects
+            .filter(calendar__in=calendars.values(), date__gte=start, date__lt=end)
+            .values_list('date', flat=True)
+        )
+        cells = CalendarCell.month_cells(user_id, calendars.values(), start, end)
+        return [cell for cell in cells if cell.date not in have]
+
 
 # ---------- CALENDAR CELL -------------------------------------------------------------
 class CalendarCell(models.Model):
@@ -75,6 +180,11 @@ class CalendarCell(models.Model):
     total_expenses = models.DecimalField(max_digits=10, decimal_places=2, default=0)
     net_balance = models.DecimalField(max_digits=10, decimal_places=2, default=0)
 
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['calendar', 'date'], name='unique_calendar_cell_date'),
+        ]
+
     def update_totals(self):
         """Recalculate income, expenses, and balance for this day."""
         transactions = Transaction.objects.filter(
@@ -90,6 +200,133 @@ class CalendarCell(models.Model):
         self.net_balance = income - expenses
         self.save()
 
+    @classmethod
+    def apply_delta(cls, user_id, day, income=0, expenses=0, create_missing=True):
+        """Shift a day's totals by signed amounts with a single F() update.
+
+        When the cell does not exist yet it is created and fully recalculated, so a
+        fresh cell always reflects every transaction already stored for that day.
+        """
+        if not income and not expenses:
+            return
+        updated = cls.objects.filter(calendar__user_id=user_id, date=day).update(
+            total_income=F('total_income') + income,
+            total_expenses=F('total_expenses') + expenses,
+            net_balance=F('net_balance') + (income - expenses),
+        )
+        if not updated and create_missing:
+            calendar, _ = Calendar.objects.get_or_create(user_id=user_id, month=day.month, year=day.year)
+            cell, _ = cls.objects.get_or_create(calendar=calendar, date=day)
+            cell.update_totals()
+
+    @classmethod
+    def daily_totals(cls, user_id, start, end):
+        """{date: (income, expenses, stored cell id)} for the days in [start, end) with transactions or a cell.
+
+        One query: the per-day transaction aggregate UNION ALL the stored cells' ids.
+        """
+        zero = Decimal('0')
+        sums = (
+            Transaction.objects
+            .filter(user_id=user_id, date__gte=start, date__lt=end)
+            .values('date')
+            .annotate(
+                income=Sum('amount', filter=models.Q(type='income'), default=zero),
+                expenses=Sum('amount', filter=models.Q(type='expense'), default=zero),
+                cell_id=Value(None, output_field=models.IntegerField()),
+            )
+            .order_by()
+        )
+        cells = (
+            cls.objects
+            .filter(calendar__user_id=user_id, date__gte=start, date__lt=end)
+            .values('date')
+            .annotate(
+                income=Value(zero, output_field=models.DecimalField()),
+                expenses=Value(zero, output_field=models.DecimalField()),
+                cell_id=F('id'),
+            )
+            .order_by()
+        )
+        totals = {}
+        for row in sums.union(cells, all=True):
+            income, expenses, cell_id = totals.get(row['date'], (zero, zero, None))
+            totals[row['date']] = (income + row['income'], expenses + row['expenses'], cell_id or row['cell_id'])
+        return totals
+
+    @classmethod
+    def month_cells(cls, user_id, calendars, start, end):
+        """Unsaved cells for every day of the calendars from one query, with the ids of stored ones."""
+        totals = cls.daily_totals(user_id, start, end)
+        cells = []
+        for calendar in calendars:
+            for day in range(1, monthrange(calendar.year, calendar.month)[1] + 1):
+                day = date(calendar.year, calendar.month, day)
+                income, expenses, cell_id = totals.get(day, (Decimal('0'), Decimal('0'), None))
+                cells.append(cls(
+                    id=cell_id, calendar=calendar, date=day,
+                    total_income=income, total_expenses=expenses, net_balance=income - expenses,
+                ))
+        return cells
+
+    @classmethod
+    def recompute_days(cls, user_id, days):
+        """Rebuild the cells for a set of days from one grouped aggregate.
+
+        Used after bulk writes that bypass the per-row signals, so each distinct
+        day is recalculated once no matter how many rows landed on it.
+        """
+        days = set(days)
+        if not days:
+            return
+        totals = {
+            row['date']: (row['income'], row['expenses'])
+            for row in (
+                Transaction.objects
+                .filter(user_id=user_id, date__in=days)
+                .values('date')
+                .annotate(
+                    income=Sum('amount', filter=models.Q(type='income'), default=Decimal('0')),
+                    expenses=Sum('amount', filter=models.Q(type='expense'), default=Decimal('0')),
+                )
+            )
+        }
+
+        cells = {cell.date: cell for cell in cls.objects.filter(calendar__user_id=user_id, date__in=days)}
+        for day, cell in cells.items():
+            cell.total_income, cell.total_expenses = totals.get(day, (Decimal('0'), Decimal('0')))
+            cell.net_balance = cell.total_income - cell.total_expenses
+        cls.objects.bulk_update(
+            [cell for cell in cells.values()],
+            ['total_income', 'total_expenses', 'net_balance'],
+            batch_size=500,
+        )
+
+        # Like the per-row signals, only a day with transactions gets a new cell (and
+        # calendar): a dirty day that only has bills stays empty.
+        missing = sorted(set(totals) - set(cells))
+        if not missing:
+            return
+        months = {(day.year, day.month) for day in missing}
+        calendars = {
+            (calendar.year, calendar.month): calendar
+            for calendar in Calendar.objects.filter(
+                user_id=user_id,
+                year__in={year for year, _ in months},
+                month__in={month for _, month in months},
+            )
+        }
+        for year, month in months - set(calendars):
+            calendars[(year, month)], _ = Calendar.objects.get_or_create(user_id=user_id, month=month, year=year)
+        new_cells = []
+        for day in missing:
+            income, expenses = totals[day]
+            new_cells.append(cls(
+                calendar=calendars[(day.year, day.month)], date=day,
+                total_income=income, total_expenses=expenses, net_balance=income - expenses,
+            ))
+        cls.objects.bulk_create(new_cells, batch_size=500)
+
     def __str__(self):
         return f"{self.date} - Net: {self.net_balance}"
 
@@ -103,16 +340,634 @@ class BillDue(models.Model):
     due_date = models.DateField() 
     note = models.TextField(blank=True, null=True)
     is_paid = models.BooleanField(default=False)
-    
+    # Set on occurrences materialized from a BillRecurrence.
+    recurrence = models.ForeignKey(
+        'BillRecurrence', on_delete=models.SET_NULL, null=True, blank=True, related_name='occurrences'
+    )
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['user', 'due_date', 'id'], name='bill_user_due_date_id_idx'),
+        ]
+        constraints = [
+            models.UniqueConstraint(fields=['recurrence', 'due_date'], name='unique_bill_occurrence'),
+        ]
+
+
+# ---------- BILL RECURRENCE ----------------------------------------------------------
+def add_months(day, months, day_of_month=None):
+    """Shift `day` by whole months, clamping the day of month (Jan 31 + 1 month = Feb 28/29)."""
+    month_index = day.year * 12 + day.month - 1 + months
+    year, month = divmod(month_index, 12)
+    return date(year, month + 1, min(day_of_month or day.day, monthrange(year, month + 1)[1]))
+
+
+class BillRecurrence(models.Model):
+    """A repeating bill stored once; its occurrences are materialized as BillDue rows.
+
+    Occurrences exist up to `materialized_through`, so monthly views stay a single
+    range query on BillDue. `ensure_occurrences` extends that horizon lazily when a
+    later window is requested; `date.max` marks a rule that has no more occurrences.
+    """
+    FREQUENCIES = [
+        ('weekly', 'Weekly'),
+        ('monthly', 'Monthly'),
+        ('nth_weekday', 'Monthly on the nth weekday'),
+        ('yearly', 'Yearly'),
+    ]
+
+    user = models.ForeignKey(User, on_delete=models.CASCADE, related_name='bill_recurrences')
+    name = models.CharField(max_length=100)
+    amount = models.DecimalField(max_digits=10, decimal_places=2)
+    type = models.CharField(max_length=20, choices=[('Bill', 'Bill'), ('Credit Card', 'Credit Card')])
+    note = models.TextField(blank=True, null=True)
+    frequency = models.CharField(max_length=20, choices=FREQUENCIES)
+    interval = models.PositiveSmallIntegerField(default=1)  # every N weeks / months / years
+    start_date = models.DateField()  # first occurrence; anchors the day, weekday and nth week
+    end_date = models.DateField(null=True, blank=True)
+    count = models.PositiveIntegerField(null=True, blank=True)
+    materialized_through = models.DateField(null=True, blank=True)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['user', 'materialized_through'], name='recurrence_user_horizon_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.name} ({self.frequency})"
+
+    def occurrence(self, index):
+        """Date of the `index`-th occurrence (0 = start_date), ignoring end_date and count."""
+        start, step = self.start_date, index * self.interval
+        if self.frequency == 'weekly':
+            return start + timedelta(weeks=step)
+        if self.frequency == 'yearly':
+            return add_months(start, 12 * step)
+        if self.frequency == 'nth_weekday':
+            first = add_months(start, step, day_of_month=1)
+            nth = (start.day - 1) // 7
+            day = first + timedelta(days=(start.weekday() - first.weekday()) % 7 + 7 * nth)
+            # A 5th weekday means "the last one" in months that only have four.
+            return day if day.month == first.month else day - timedelta(weeks=1)
+        return add_months(start, step, day_of_month=start.day)
+
+    def dates(self):
+        """Yield every occurrence date in order, honouring end_date and count."""
+        for index in itertools.count():
+            if self.count is not None and index >= self.count:
+                return
+            day = self.occurrence(index)
+            if self.end_date is not None and day > self.end_date:
+                return
+            yield day
+
+    def materialize(self, end):
+        """Build the occurrences before `end` that are past the horizon and advance it (neither saved)."""
+        if self.materialized_through is not None and self.materialized_through >= end - timedelta(days=1):
+            return []
+        new, finished = [], True
+        for day in self.dates():
+            if day >= end:
+                finished = False
+                break
+            if self.materialized_through is None or day > self.materialized_through:
+                new.append(day)
+        self.materialized_through = date.max if finished else end - timedelta(days=1)
+        return [
+            BillDue(
+                user_id=self.user_id, recurrence=self, name=self.name, amount=self.amount,
+                type=self.type, note=self.note, due_date=day,
+            )
+            for day in new
+        ]
+
+    def rematerialize(self, from_day):
+        """Replace the unpaid occurrences from `from_day` on after the rule changed."""
+        self.occurrences.filter(due_date__gte=from_day, is_paid=False).delete()
+        self.materialized_through = from_day - timedelta(days=1)
+        BillRecurrence.ensure_occurrences(self.user_id, recurrence_horizon(), rules=[self])
+
+    @classmethod
+    def ensure_occurrences(cls, user_id, end, rules=None):
+        """Materialize the user's rules through the day before `end` with bulk writes.
+
+        The one indexed query finds only rules whose horizon is short of `end`;
+        however many rules it finds, their bills are one insert and their horizons
+        one update. Rollups, caches and the ETag version are refreshed for the new bills.
+        """
+        if rules is None:
+            rules = cls.objects.filter(user_id=user_id, start_date__lt=end).filter(
+                models.Q(materialized_through__isnull=True)
+                | models.Q(materialized_through__lt=end - timedelta(days=1))
+            )
+        rules = list(rules)
+        if not rules:
+            return
+        bills = [bill for rule in rules for bill in rule.materialize(end)]
+        with transaction.atomic():
+            BillDue.objects.bulk_create(bills, batch_size=500, ignore_conflicts=True)
+            cls.objects.bulk_update(rules, ['materialized_through'])
+        if bills:
+            refresh_bill_rollups(user_id, {bill.due_date for bill in bills})
+        else:
+            Profile.bump_version(user_id)
+
+
+def recurrence_horizon():
+    """Occurrences are materialized this far ahead when a rule is saved."""
+    return date.today() + timedelta(days=getattr(settings, 'BILL_RECURRENCE_HORIZON_DAYS', 366))
+
+
+# ---------- MONTHLY ROLLUP -----------------------------------------------------------
+class MonthlyRollup(models.Model):
+    """Per-user monthly totals kept up to date on every transaction and bill write."""
+    user = models.ForeignKey(User, on_delete=models.CASCADE, related_name='monthly_rollups')
+    year = models.IntegerField()
+    month = models.IntegerField()  # 1–12
+    total_income = models.DecimalField(max_digits=12, decimal_places=2, default=0)
+    total_expenses = models.DecimalField(max_digits=12, decimal_places=2, default=0)
+    total_bills = models.DecimalField(max_digits=12, decimal_places=2, default=0)
+    transaction_count = models.IntegerField(default=0)
+    bill_count = models.IntegerField(default=0)
+
+    class Meta:
+        unique_together = ('user', 'year', 'month')
+
+    def __str__(self):
+        return f"{self.user_id} - {self.month}/{self.year}"
+
+    @classmethod
+    def apply_delta(cls, user_id, year, month, income=0, expenses=0, bills=0,
+                    transactions=0, bill_count=0, create_missing=True):
+        """Shift a month's totals by signed amounts; missing rows are rebuilt from the raw tables."""
+        if not any((income, expenses, bills, transactions, bill_count)):
+            return
+        updated = cls.objects.filter(user_id=user_id, year=year, month=month).update(
+            total_income=F('total_income') + income,
+            total_expenses=F('total_expenses') + expenses,
+            total_bills=F('total_bills') + bills,
+            transaction_count=F('transaction_count') + transactions,
+            bill_count=F('bill_count') + bill_count,
+        )
+        if not updated and create_missing:
+            cls.recompute_months(user_id, {(year, month)})
+
+    @classmethod
+    def expected_totals(cls, user_id, months=None):
+        """Aggregate the raw tables into {(year, month): {field: value}}.
+
+        `months` limits the scan to the date span of the given (year, month) pairs.
+        """
+        transactions = Transaction.objects.filter(user_id=user_id)
+        bills = BillDue.objects.filter(user_id=user_id)
+        if months is not None:
+            start, _ = month_bounds(*min(months))
+            _, end = month_bounds(*max(months))
+            transactions = transactions.filter(date__gte=start, date__lt=end)
+            bills = bills.filter(due_date__gte=start, due_date__lt=end)
+
+        zero = Decimal('0')
+        totals = {}
+        for row in (
+            transactions
+            .annotate(year=ExtractYear('date'), month=ExtractMonth('date'))
+            .values('year', 'month')
+            .annotate(
+                income=Sum('amount', filter=models.Q(type='income'), default=zero),
+                expenses=Sum('amount', filter=models.Q(type='expense'), default=zero),
+                count=Count('id'),
+            )
+            .order_by()
+        ):
+            totals.setdefault((row['year'], row['month']), cls._empty_totals()).update(
+                total_income=row['income'],
+                total_expenses=row['expenses'],
+                transaction_count=row['count'],
+            )
+        for row in (
+            bills
+            .annotate(year=ExtractYear('due_date'), month=ExtractMonth('due_date'))
+            .values('year', 'month')
+            .annotate(amount=Sum('amount', default=zero), count=Count('id'))
+            .order_by()
+        ):
+            totals.setdefault((row['year'], row['month']), cls._empty_totals()).update(
+                total_bills=row['amount'],
+                bill_count=row['count'],
+            )
+        if months is not None:
+            totals = {key: value for key, value in totals.items() if key in months}
+        return totals
+
+    @staticmethod
+    def _empty_totals():
+        return {
+            'total_income': Decimal('0'),
+            'total_expenses': Decimal('0'),
+            'total_bills': Decimal('0'),
+            'transaction_count': 0,
+            'bill_count': 0,
+        }
+
+    @classmethod
+    def recompute_months(cls, user_id, months):
+        """Rebuild the rollup rows for a set of (year, month) pairs from the raw tables."""
+        months = set(months)
+        if not months:
+            return
+        expected = cls.expected_totals(user_id, months)
+        existing = {
+            (rollup.year, rollup.month): rollup
+            for rollup in cls.objects.filter(
+                user_id=user_id,
+                year__in={year for year, _ in months},
+                month__in={month for _, month in months},
+            )
+            if (rollup.year, rollup.month) in months
+        }
+        new_rows = []
+        for year, month in months:
+            rollup = existing.get((year, month))
+            if rollup is None:
+                rollup = cls(user_id=user_id, year=year, month=month)
+                new_rows.append(rollup)
+            for field, value in expected.get((year, month), cls._empty_totals()).items():
+                setattr(rollup, field, value)
+
+        cls.objects.bulk_update(list(existing.values()), ROLLUP_FIELDS, batch_size=500)
+        # A concurrent first write to the same month may insert the row after the read
+        # above; both computed it from the raw tables, so the later one simply wins.
+        cls.objects.bulk_create(
+            new_rows, batch_size=500,
+            update_conflicts=True, unique_fields=['user', 'year', 'month'], update_fields=ROLLUP_FIELDS,
+        )
+
+
+ROLLUP_FIELDS = ['total_income', 'total_expenses', 'total_bills', 'transaction_count', 'bill_count']
+
+
+def recompute_rollups(user_id, days):
+    """Rebuild daily cells and monthly rollups after a bulk write that skipped the signals."""
+    days = set(days)
+    BalanceCheckpoint.invalidate((user_id, day) for day in days)
+    if rollups_deferred():
+        RollupQueueEntry.enqueue({(user_id, day) for day in days})
+    else:
+        refresh_rollups(user_id, days)
+    Profile.bump_version(user_id)
+
+
+def refresh_bill_rollups(user_id, days):
+    """Bring monthly rollups, caches and the ETag version up to date after bills were bulk written."""
+    if rollups_deferred():
+        RollupQueueEntry.enqueue({(user_id, day) for day in days})
+    else:
+        MonthlyRollup.recompute_months(user_id, {(day.year, day.month) for day in days})
+        invalidate_dates(user_id, days, all_time=False)
+    Profile.bump_version(user_id)
+
+
+def refresh_rollups(user_id, days):
+    CalendarCell.recompute_days(user_id, days)
+    MonthlyRollup.recompute_months(user_id, {(day.year, day.month) for day in days})
+    invalidate_dates(user_id, days)
+
+
+# ---------- BALANCE CHECKPOINT -------------------------------------------------------
+class BalanceCheckpoint(models.Model):
+    """A user's running balance (income minus expenses) at the end of `date`.
+
+    Balance queries start from the latest checkpoint before the requested range
+    instead of the beginning of history. Any transaction write on or before a
+    checkpoint's date deletes it, and a checkpoint is only saved if no such write
+    landed since its totals were read (see `save_if_current`).
+    """
+    user = models.ForeignKey(User, on_delete=models.CASCADE, related_name='balance_checkpoints')
+    date = models.DateField()
+    balance = models.DecimalField(max_digits=14, decimal_places=2)
+
+    # Only checkpoint when a request had to scan more days than this.
+    min_gap = timedelta(days=31)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['user', 'date'], name='unique_balance_checkpoint'),
+        ]
+
+    def __str__(self):
+        return f"{self.user_id} - {self.date}: {self.balance}"
+
+    @classmethod
+    def invalidate(cls, dirty):
+        """Drop checkpoints made stale by writes to the given (user_id, date) pairs."""
+        earliest = {}
+        for user_id, day in dirty:
+            earliest[user_id] = min(day, earliest.get(user_id, day))
+        for user_id, day in earliest.items():
+            # Bump before deleting: a save checked after the bump is skipped, and one that
+            # took the profile lock first has committed before this delete runs.
+            Profile.bump_version(user_id)
+            cls.objects.filter(user_id=user_id, date__gte=day).delete()
+
+    @classmethod
+    def save_if_current(cls, user_id, day, balance, version):
+        """Save a checkpoint computed from data at `version` unless a write has bumped it since.
+
+        The profile row stays locked until the checkpoint is written, so a concurrent
+        `invalidate` either bumped the version before the check or deletes after it.
+        """
+        with transaction.atomic():
+            if not Profile.objects.select_for_update().filter(user_id=user_id, data_version=version).exists():
+                return False
+            cls.objects.bulk_create(
+                [cls(user_id=user_id, date=day, balance=balance)],
+                update_conflicts=True, unique_fields=['user', 'date'], update_fields=['balance'],
+            )
+        return True
+
+    @classmethod
+    def daily_balances(cls, user_id, start, end):
+        """Return (opening balance, [(date, income, expenses, balance)]) for every day in [start, end].
+
+        One checkpoint lookup and one per-day grouped aggregate from the checkpoint
+        on; the running sum over that compact fetch is done here. A checkpoint at
+        `start - 1` is saved when the scan was long and that day is in the past.
+        """
+        checkpoint = cls.objects.filter(user_id=user_id, date__lt=start).order_by('-date').first()
+        base_date = checkpoint.date if checkpoint else None
+        balance = checkpoint.balance if checkpoint else Decimal('0')
+        day_before = start - timedelta(days=1)
+        # The version the totals below are read at, for `save_if_current`; only needed if one may be saved.
+        version = None
+        if day_before < date.today() and (base_date is None or day_before - base_date > cls.min_gap):
+            version = Profile.objects.filter(user_id=user_id).values_list('data_version', flat=True).first()
+
+        days = Transaction.objects.filter(user_id=user_id, date__lte=end)
+        if base_date is not None:
+            days = days.filter(date__gt=base_date)
+        totals = {
+            row['date']: (row['income'], row['expenses'])
+            for row in days.values('date').annotate(
+                income=Sum('amount', filter=models.Q(type='income'), default=Decimal('0')),
+                expenses=Sum('amount', filter=models.Q(type='expense'), default=Decimal('0')),
+            ).order_by()
+        }
+
+        for day in sorted(day for day in totals if day < start):
+            income, expenses = totals[day]
+            balance += income - expenses
+        opening = balance
+
+        scanned_from = base_date or min(totals, default=day_before)
+        if version is not None and day_before - scanned_from > cls.min_gap:
+            cls.save_if_current(user_id, day_before, opening, version)
+
+        rows, day = [], start
+        while day <= end:
+            income, expenses = totals.get(day, (Decimal('0'), Decimal('0')))
+            balance += income - expenses
+            rows.append((day, income, expenses, balance))
+            day += timedelta(days=1)
+        return opening, rows
+
+
+# ---------- ROLLUP QUEUE -------------------------------------------------------------
+def rollups_deferred():
+    """True when ROLLUP_MODE='queue': writes only record dirty days for the worker."""
+    return getattr(settings, 'ROLLUP_MODE', 'sync') == 'queue'
+
+
+class RollupQueueEntry(models.Model):
+    """A (user, date) whose cell and monthly rollup need recomputing.
+
+    Duplicates are expected and coalesced by the `process_rollup_queue` worker,
+    which only deletes the entries it read, so writes that land while a batch is
+    being processed are picked up by the next batch.
+    """
+    user = models.ForeignKey(User, on_delete=models.CASCADE, related_name='+')
+    date = models.DateField()
+    created_at = models.DateTimeField(auto_now_add=True, db_index=True)
+
+    @classmethod
+    def enqueue(cls, dirty):
+        cls.objects.bulk_create([cls(user_id=user_id, date=day) for user_id, day in dirty])
+
+    @classmethod
+    def stats(cls):
+        """Queue depth and the age in seconds of the oldest pending entry."""
+        oldest = cls.objects.order_by('created_at').values_list('created_at', flat=True).first()
+        return {
+            'depth': cls.objects.count(),
+            'lag_seconds': round((timezone.now() - oldest).total_seconds(), 3) if oldest else 0,
+        }
+
+    @classmethod
+    def process_batch(cls, size=1000):
+        """Recompute the distinct days of the oldest `size` entries; return entries consumed."""
+        with transaction.atomic():
+            entries = cls.objects.order_by('id')
+            if connection.features.has_select_for_update_skip_locked:
+                entries = entries.select_for_update(skip_locked=True)
+            entries = list(entries.values_list('id', 'user_id', 'date')[:size])
+            if not entries:
+                return 0
+
+            dirty = {}
+            for _, user_id, day in entries:
+                dirty.setdefault(user_id, set()).add(day)
+            for user_id, days in dirty.items():
+                refresh_rollups(user_id, days)
+                Profile.bump_version(user_id)
+            cls.objects.filter(id__in=[entry[0] for entry in entries]).delete()
+        return len(entries)
+
 
 # ---------- SIGNALS ------------------------------------------------------------------
+def _transaction_snapshot(instance):
+    return (instance.user_id, instance.date, instance.type, Decimal(str(instance.amount)))
+
+
+def _transaction_row(instance):
+    """The delta snapshot plus the fields cached views embed but totals ignore."""
+    return _transaction_snapshot(instance) + (instance.description, instance.category_id)
+
+
+def _transaction_deltas(current=None, previous=None):
+    """Return {(user_id, date): [income, expenses, count]} for new-value-in / old-value-out."""
+    deltas = {}
+    for snapshot, sign in ((current, 1), (previous, -1)):
+        if snapshot is None:
+            continue
+        user_id, day, kind, amount = snapshot
+        totals = deltas.setdefault((user_id, day), [Decimal('0'), Decimal('0'), 0])
+        if kind == 'income':
+            totals[0] += amount * sign
+        elif kind == 'expense':
+            totals[1] += amount * sign
+        totals[2] += sign
+    return deltas
+
+
+def _apply_transaction_deltas(deltas, create_missing=True):
+    months, days = {}, {}
+    for (user_id, day), (income, expenses, count) in deltas.items():
+        days.setdefault(user_id, set()).add(day)
+        CalendarCell.apply_delta(user_id, day, income, expenses, create_missing=create_missing)
+        totals = months.setdefault((user_id, day.year, day.month), [Decimal('0'), Decimal('0'), 0])
+        totals[0] += income
+        totals[1] += expenses
+        totals[2] += count
+    for (user_id, year, month), (income, expenses, count) in months.items():
+        MonthlyRollup.apply_delta(
+            user_id, year, month,
+            income=income, expenses=expenses, transactions=count,
+            create_missing=create_missing,
+        )
+    for user_id, touched in days.items():
+        invalidate_dates(user_id, touched)
+
+
+@receiver(pre_save, sender=Transaction)
+def remember_previous_transaction(sender, instance, raw=False, **kwargs):
+    """Keep the stored values of an edited transaction so its old cell can be corrected."""
+    instance._previous_snapshot = None
+    if raw or instance._state.adding or instance.pk is None:
+        return
+    instance._previous_snapshot = (
+        Transaction.objects
+        .filter(pk=instance.pk)
+        .values_list('user_id', 'date', 'type', 'amount', 'description', 'category_id')
+        .first()
+    )
+
+
 @receiver(post_save, sender=Transaction)
-def update_calendar_cell(sender, instance, **kwargs):
-    """Update the daily cell totals whenever a transaction is added or updated."""
-    calendar, created = Calendar.objects.get_or_create(
-        user=instance.user,
-        month=instance.date.month,
-        year=instance.date.year
+def update_calendar_cell(sender, instance, raw=False, **kwargs):
+    """Apply the old-value-out / new-value-in delta to the affected cells and rollups."""
+    if raw:
+        return
+    current = _transaction_row(instance)
+    previous = getattr(instance, '_previous_snapshot', None)
+    instance._previous_snapshot = None
+    if previous == current:
+        return
+    if previous is not None and previous[5] != current[5]:
+        # The year scopes below (or the deltas) cover the totals; this covers the grouping.
+        invalidate_categories(instance.user_id)
+    if previous is not None and previous[:4] == current[:4]:
+        # Totals are unchanged, but cached day views and category summaries embed these fields.
+        invalidate_dates(instance.user_id, [instance.date], all_time=False)
+        return
+    deltas = _transaction_deltas(current[:4], previous and previous[:4])
+    BalanceCheckpoint.invalidate(deltas.keys())
+    if rollups_deferred():
+        RollupQueueEntry.enqueue(deltas.keys())
+        return
+    _apply_transaction_deltas(deltas)
+
+
+@receiver(post_delete, sender=Transaction)
+def remove_from_calendar_cell(sender, instance, **kwargs):
+    """Take a deleted transaction back out of its daily cell and monthly rollup."""
+    if isinstance(kwargs.get('origin'), User):
+        return  # the user's own cascade deletes the cells, rollups and checkpoints too
+    BalanceCheckpoint.invalidate([(instance.user_id, instance.date)])
+    if rollups_deferred():
+        RollupQueueEntry.enqueue([(instance.user_id, instance.date)])
+        return
+    _apply_transaction_deltas(_transaction_deltas(previous=_transaction_snapshot(instance)), create_missing=False)
+
+
+def _bill_snapshot(instance):
+    return (instance.user_id, instance.due_date, Decimal(str(instance.amount)))
+
+
+def _bill_row(instance):
+    """The delta snapshot plus the fields cached day views embed but totals ignore."""
+    return _bill_snapshot(instance) + (instance.name, instance.type, instance.note, instance.is_paid)
+
+
+def _apply_bill_delta(snapshot, sign, create_missing=True):
+    user_id, due_date, amount = snapshot
+    if rollups_deferred():
+        RollupQueueEntry.enqueue([(user_id, due_date)])
+        return
+    MonthlyRollup.apply_delta(
+        user_id, due_date.year, due_date.month,
+        bills=amount * sign, bill_count=sign,
+        create_missing=create_missing,
     )
-    cell, created = CalendarCell.objects.get_or_create(calendar=calendar, date=instance.date)
-    cell.update_totals()
+    invalidate_dates(user_id, [due_date], all_time=False)
+
+
+@receiver(pre_save, sender=BillDue)
+def remember_previous_bill(sender, instance, raw=False, **kwargs):
+    instance._previous_snapshot = None
+    if raw or instance._state.adding or instance.pk is None:
+        return
+    instance._previous_snapshot = (
+        BillDue.objects
+        .filter(pk=instance.pk)
+        .values_list('user_id', 'due_date', 'amount', 'name', 'type', 'note', 'is_paid')
+        .first()
+    )
+
+
+@receiver(post_save, sender=BillDue)
+def update_bill_rollup(sender, instance, raw=False, **kwargs):
+    """Move a saved bill's amount into its month, and out of the old one when edited."""
+    if raw:
+        return
+    current = _bill_row(instance)
+    previous = getattr(instance, '_previous_snapshot', None)
+    instance._previous_snapshot = None
+    if previous == current:
+        return
+    if previous is not None and previous[:3] == current[:3]:
+        invalidate_dates(instance.user_id, [instance.due_date], all_time=False)
+        return
+    if previous is not None:
+        _apply_bill_delta(previous[:3], -1)
+    _apply_bill_delta(current[:3], 1)
+
+
+@receiver(post_delete, sender=BillDue)
+def remove_bill_from_rollup(sender, instance, **kwargs):
+    if isinstance(kwargs.get('origin'), User):
+        return
+    _apply_bill_delta(_bill_snapshot(instance), -1, create_missing=False)
+
+
+@receiver(post_save, sender=BillRecurrence)
+@receiver(post_delete, sender=BillRecurrence)
+def invalidate_recurrences(sender, instance, update_fields=None, **kwargs):
+    """Cached day views may predate a rule's lazily materialized occurrences."""
+    if isinstance(kwargs.get('origin'), User):
+        return
+    if update_fields != frozenset({'materialized_through'}):
+        bump_scopes(instance.user_id, ['recurrences'])
+
+
+@receiver(post_save, sender=Category)
+@receiver(post_delete, sender=Category)
+def invalidate_category_names(sender, instance, **kwargs):
+    """Cached day views embed category names."""
+    if not isinstance(kwargs.get('origin'), User):
+        invalidate_categories(instance.user_id)
+
+
+@receiver(post_save, sender=Transaction)
+@receiver(post_delete, sender=Transaction)
+@receiver(post_save, sender=BillDue)
+@receiver(post_delete, sender=BillDue)
+@receiver(post_save, sender=Calendar)
+@receiver(post_delete, sender=Calendar)
+@receiver(post_save, sender=Category)
+@receiver(post_delete, sender=Category)
+@receiver(post_save, sender=BillRecurrence)
+@receiver(post_delete, sender=BillRecurrence)
+def bump_data_version(sender, instance, raw=False, **kwargs):
+    """Any write to the user's data changes the ETag of their read endpoints."""
+    # Deleting the user deletes the Profile too; there is no version left to bump.
+    if not raw and not isinstance(kwargs.get('origin'), User):
+        Profile.bump_version(instance.user_id)
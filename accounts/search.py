@@ -0,0 +1,117 @@
+"""Search over transaction descriptions.
+
+Postgres matches the GIN-indexed `search_vector` column (migration 0018) with
+prefix matching on every term and falls back to the indexed trigram
+word-similarity operator when nothing matches (typos, partial words inside
+tokens). SQLite uses the FTS5 table from migration 0017. Any other
+backend, or SQLite built without FTS5, falls back to `icontains`.
+
+Results are ordered by relevance, then by date (newest first).
+"""
+import re
+
+from django.db import connection, transaction
+
+from accounts.models import Transaction
+
+TERM = re.compile(r"\w+", re.UNICODE)
+
+
+def terms(query):
+    return TERM.findall(query.lower())[:10]
+
+
+def search_transactions(user, query, limit=50):
+    """Return up to `limit` of the user's transactions matching `query`, best first."""
+    words = terms(query)
+    if not words:
+        return []
+    if connection.vendor == 'postgresql':
+        return _postgres(user, words, query, limit)
+    if connection.vendor == 'sqlite' and _sqlite_fts_available():
+        return _sqlite(user, words, limit)
+    return _fallback(user, words, limit)
+
+
+def _base(user):
+    return Transaction.objects.filter(user=user).select_related('category')
+
+
+WORD_SIMILARITY_THRESHOLD = 0.3
+
+
+def postgres_querysets(user, words, query):
+    """The full-text and trigram querysets `_postgres` runs, for `benchmark_queries` to EXPLAIN."""
+    from django.contrib.postgres.lookups import TrigramWordSimilar
+    from django.contrib.postgres.search import SearchQuery, SearchRank, SearchVectorField, TrigramWordSimilarity
+    from django.db.models import F, Value
+    from django.db.models.expressions import RawSQL
+
+    # The generated, GIN-indexed column from migration 0018; only matching rows are ranked.
+    vector = RawSQL('"accounts_transaction"."search_vector"', [], output_field=SearchVectorField())
+    search = SearchQuery(' & '.join(f'{word}:*' for word in words), config='english', search_type='raw')
+    fulltext = (
+        _base(user)
+        .alias(vector=vector)
+        .filter(vector=search)
+        .annotate(rank=SearchRank(F('vector'), search))
+        .order_by('-rank', '-date', '-id')
+    )
+    # `description %> query` is the indexable form of word_similarity(query, description) > threshold.
+    fuzzy = (
+        _base(user)
+        .filter(TrigramWordSimilar(F('description'), Value(query)))
+        .annotate(similarity=TrigramWordSimilarity(query, 'description'))
+        .order_by('-similarity', '-date', '-id')
+    )
+    return fulltext, fuzzy
+
+
+def _postgres(user, words, query, limit):
+    fulltext, fuzzy = postgres_querysets(user, words, query)
+    results = list(fulltext[:limit])
+    if results:
+        return results
+    with transaction.atomic():
+        with connection.cursor() as cursor:
+            cursor.execute(
+                "SELECT set_config('pg_trgm.word_similarity_threshold', %s, true)",
+                [str(WORD_SIMILARITY_THRESHOLD)],
+            )
+        return list(fuzzy[:limit])
+
+
+_fts_tables = {}
+
+
+def _sqlite_fts_available():
+    alias = connection.alias
+    if alias not in _fts_tables:
+        with connection.cursor() as cursor:
+            cursor.execute(
+                "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'accounts_transaction_fts'"
+            )
+            _fts_tables[alias] = cursor.fetchone() is not None
+    return _fts_tables[alias]
+
+
+def _sqlite(user, words, limit):
+    match = ' '.join('"{}"*'.format(word.replace('"', '""')) for word in words)
+    with connection.cursor() as cursor:
+        cursor.execute(
+            "SELECT t.id FROM accounts_transaction_fts f "
+            "JOIN accounts_transaction t ON t.id = f.rowid "
+            "WHERE accounts_transaction_fts MATCH %s AND t.user_id = %s "
+            "ORDER BY bm25(accounts_transaction_fts), t.date DESC, t.id DESC LIMIT %s",
+            [match, user.id, limit],
+        )
+        ids = [row[0] for row in cursor.fetchall()]
+    by_id = _base(user).in_bulk(ids)
+    return [by_id[pk] for pk in ids if pk in by_id]
+
+
+def _fallback(user, words, limit):
+    queryset = _base(user)
+    for word in words:
+        queryset = queryset.filter(description__icontains=word)
+    return list(queryset.order_by('-date', '-id')[:limit])
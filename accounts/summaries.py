@@ -0,0 +1,345 @@
+"""Queries and payload builders shared by the summary views.
+
+The sync DRF views, the async views and the dashboard all build their
+responses here, so the same endpoint returns the same JSON whichever path
+served it.
+"""
+from datetime import date, datetime, timedelta
+from decimal import Decimal
+
+from django.db import models
+from django.db.models import Count, Sum
+
+from accounts.api.serializers import BillDueSerializer, UserSerializer
+from accounts.models import BillDue, MonthlyRollup, Transaction, add_months, month_bounds
+
+DAY_TRANSACTION_FIELDS = ('id', 'type', 'amount', 'category__name', 'description', 'date')
+DAY_BILL_FIELDS = ('id', 'name', 'amount', 'type', 'note', 'due_date', 'is_paid')
+DASHBOARD_SECTIONS = ('profile', 'total_expenses', 'monthly_summary', 'annual', 'pie', 'bills')
+
+
+# ---------- PARAMETERS ----------
+def parse_year_range(value):
+    """Parse `2024` or `2022-2025` into an inclusive (first, last) year tuple."""
+    first, _, last = value.partition('-')
+    first, last = int(first), int(last or first)
+    if first > last or last - first > 50:
+        raise ValueError(value)
+    return first, last
+
+
+def requested_years(params):
+    """Return (first, last) from `years=` or `year=` (default: this year); raises ValueError."""
+    if 'years' in params:
+        return parse_year_range(params['years'])
+    year = int(params.get('year', datetime.now().year))
+    return year, year
+
+
+def parse_day(date_str):
+    return datetime.strptime(date_str, "%Y-%m-%d").date()
+
+
+def category_request(params):
+    """Return (start, end, type) from `from=`/`to=` (inclusive dates) and `type=`; raises ValueError."""
+    today = date.today()
+    start = parse_day(params['from']) if 'from' in params else date(today.year, 1, 1)
+    end = parse_day(params['to']) if 'to' in params else date(today.year, 12, 31)
+    kind = params.get('type', 'expense')
+    if end < start or kind not in ('income', 'expense'):
+        raise ValueError(params)
+    return start, end, kind
+
+
+def forecast_request(params, today):
+    """Return (start, end) from `from=`/`to=` (default: 30 days back to 90 ahead); raises ValueError."""
+    start = parse_day(params['from']) if 'from' in params else today - timedelta(days=30)
+    end = parse_day(params['to']) if 'to' in params else today + timedelta(days=90)
+    if end < start or (end - start).days > 731:
+        raise ValueError(params)
+    return start, end
+
+
+def dashboard_request(params):
+    """Return (sections, year, month) from `fields=`, `year=` and `month=`; raises ValueError."""
+    sections = [name for name in params.get('fields', '').split(',') if name] or list(DASHBOARD_SECTIONS)
+    unknown = set(sections) - set(DASHBOARD_SECTIONS)
+    if unknown:
+        raise ValueError(f"Unknown fields: {', '.join(sorted(unknown))}")
+    today = date.today()
+    year, month = int(params.get('year', today.year)), int(params.get('month', today.month))
+    if not 1 <= month <= 12:
+        raise ValueError("month must be 1-12")
+    return sections, year, month
+
+
+# ---------- CACHE SCOPES ----------
+def year_scopes(params):
+    try:
+        first, last = requested_years(params)
+    except ValueError:
+        return None
+    return [f'y{year}' for year in range(first, last + 1)]
+
+
+def day_scopes(date_str):
+    try:
+        target_date = parse_day(date_str)
+    except ValueError:
+        return None
+    return [f'm{target_date.year}-{target_date.month:02d}', 'categories', 'recurrences']
+
+
+def category_scopes(params):
+    try:
+        start, end, _ = category_request(params)
+    except ValueError:
+        return None
+    # One month before `from` feeds the first month-over-month change.
+    first_year = add_months(start, -1).year
+    return [f'y{year}' for year in range(first_year, end.year + 1)] + ['categories']
+
+
+# ---------- QUERIES ----------
+def day_transactions(user, day):
+    return Transaction.objects.filter(user=user, date=day).values(*DAY_TRANSACTION_FIELDS)
+
+
+def day_bills(user, day):
+    return BillDue.objects.filter(user=user, due_date=day).values(*DAY_BILL_FIELDS)
+
+
+def day_totals(user, day):
+    """Income and expense totals for one day as a single conditional aggregate."""
+    return Transaction.objects.filter(user=user, date=day), {
+        'total_income': Sum('amount', filter=models.Q(type='income'), default=0),
+        'total_expenses': Sum('amount', filter=models.Q(type='expense'), default=0),
+    }
+
+
+def rollups_for_years(user, first, last):
+    return MonthlyRollup.objects.filter(user=user, year__gte=first, year__lte=last)
+
+
+def year_totals(user, year):
+    return MonthlyRollup.objects.filter(user=user, year=year), {
+        'total_income': Sum('total_income', default=0),
+        'total_expenses': Sum('total_expenses', default=0),
+        'total_bills': Sum('total_bills', default=0),
+    }
+
+
+def monthly_rollups(user):
+    return MonthlyRollup.objects.filter(user=user, transaction_count__gt=0).order_by('-year', '-month')
+
+
+def expense_total(user):
+    return Transaction.objects.filter(user=user, type='expense'), {'total_expenses': Sum('amount', default=0)}
+
+
+def dashboard_rollups(user, sections, year):
+    """The rollup rows every requested section is computed from, or None if none needs them."""
+    if {'total_expenses', 'monthly_summary'} & set(sections):
+        return MonthlyRollup.objects.filter(user=user).order_by('-year', '-month')
+    if {'annual', 'pie'} & set(sections):
+        return MonthlyRollup.objects.filter(user=user, year=year).order_by('-year', '-month')
+    return None
+
+
+def dashboard_bills(user, sections, year, month):
+    if 'bills' not in sections:
+        return None
+    start, end = month_bounds(year, month)
+    return BillDue.objects.filter(user=user, due_date__gte=start, due_date__lt=end).order_by('due_date', 'id')
+
+
+def category_days(user, start, end, kind):
+    """Per category and day totals over [month before `start`, `end`], read off the covering index.
+
+    Grouping by the raw date instead of a truncated month keeps the query a plain
+    index range scan on every backend (SQLite evaluates date truncation in
+    Python); `category_summary_payload` folds the days into months. The month
+    before `start` only feeds the first month-over-month change.
+    """
+    first_of_month = start.replace(day=1)
+    return (
+        Transaction.objects
+        .filter(user=user, type=kind, date__lte=end)
+        .filter(models.Q(date__gte=start) | models.Q(date__gte=add_months(first_of_month, -1), date__lt=first_of_month))
+        .values('category_id', 'category__name', 'date')
+        .annotate(total=Sum('amount'), count=Count('id'))
+        .order_by()
+    )
+
+
+def upcoming_bills(user, start, end, today):
+    """Unpaid bills due after today within [start, end], summed per day."""
+    return (
+        BillDue.objects
+        .filter(user=user, is_paid=False, due_date__gt=today, due_date__gte=start, due_date__lte=end)
+        .values('due_date')
+        .annotate(total=Sum('amount'))
+        .order_by()
+    )
+
+
+# ---------- PAYLOADS ----------
+def monthly_summary_payload(rollups):
+    return [
+        {
+            "month": date(rollup.year, rollup.month, 1),
+            "total_income": rollup.total_income,
+            "total_expenses": rollup.total_expenses,
+            "net_balance": rollup.total_income - rollup.total_expenses,
+        }
+        for rollup in rollups
+    ]
+
+
+def annual_payload(year, totals):
+    return {
+        "year": year,
+        "total_income": totals["total_income"],
+        "total_expenses": totals["total_expenses"],
+        "total_bills": totals["total_bills"],
+        "total_balance": totals["total_income"] - totals["total_expenses"] - totals["total_bills"],
+    }
+
+
+def pie_years(rollups, first, last):
+    """Group rollup rows into [{"year", "months": [...]}] for every year in the range."""
+    totals = {
+        (rollup.year, rollup.month): (rollup.total_income, rollup.total_expenses, rollup.total_bills)
+        for rollup in rollups
+    }
+    years = []
+    for year in range(first, last + 1):
+        monthly_data = []
+        for month in range(1, 13):
+            total_income, total_expenses, total_bills = totals.get((year, month), (0, 0, 0))
+            if total_income > 0 or total_expenses > 0 or total_bills > 0:
+                monthly_data.append({
+                    "month": month,
+                    "total_income": total_income,
+                    "total_expenses": total_expenses,
+                    "total_bills": total_bills,
+                })
+        years.append({"year": year, "months": monthly_data})
+    return years
+
+
+def pie_payload(params, years):
+    """The single-year shape unless the caller asked for a `years=` range."""
+    return {"years": years} if 'years' in params else years[0]
+
+
+def day_payload(day, transactions, bills, totals):
+    return {
+        "date": day,
+        "transactions": list(transactions),
+        "bills": list(bills),
+        "total_expenses": totals["total_expenses"],
+        "total_income": totals["total_income"],
+        "net_balance": totals["total_income"] - totals["total_expenses"],
+    }
+
+
+def dashboard_payload(user, sections, year, month, rollups, bills):
+    """Each section is the body its standalone endpoint returns, built from one rollup scan.
+
+    `bills` is the unpaginated list for the month; `total_expenses` sums the
+    rollups, so in ROLLUP_MODE=queue it trails the transactions like the other
+    rollup-backed summaries do.
+    """
+    rollups = list(rollups or [])
+    year_rollups = [rollup for rollup in rollups if rollup.year == year]
+    totals = {
+        field: sum((getattr(rollup, field) for rollup in year_rollups), Decimal(0))
+        for field in ('total_income', 'total_expenses', 'total_bills')
+    }
+    builders = {
+        'profile': lambda: UserSerializer(user).data,
+        'total_expenses': lambda: {
+            "total_expenses": sum((rollup.total_expenses for rollup in rollups), Decimal(0)),
+        },
+        'monthly_summary': lambda: monthly_summary_payload(
+            rollup for rollup in rollups if rollup.transaction_count > 0
+        ),
+        'annual': lambda: annual_payload(year, totals),
+        'pie': lambda: pie_years(year_rollups, year, year)[0],
+        'bills': lambda: BillDueSerializer(bills, many=True).data,
+    }
+    return {name: builders[name]() for name in sections}
+
+
+def category_summary_payload(start, end, kind, rows):
+    """Totals, counts, share of the range's total and month-over-month change per category."""
+    first_month = start.replace(day=1)
+    months = {}
+    names = {}
+    for row in rows:
+        key = (row['category_id'], row['date'].replace(day=1))
+        total, count = months.get(key, (Decimal(0), 0))
+        months[key] = (total + row['total'], count + row['count'])
+        names[row['category_id']] = row['category__name']
+
+    categories = {}
+    for (category_id, month), (total, count) in sorted(months.items(), key=lambda item: (item[0][1], str(item[0][0]))):
+        if month < first_month:
+            continue
+        previous, _ = months.get((category_id, add_months(month, -1)), (Decimal(0), 0))
+        entry = categories.setdefault(category_id, {
+            "category_id": category_id,
+            "name": names[category_id],
+            "total": Decimal(0),
+            "count": 0,
+            "months": [],
+        })
+        entry["total"] += total
+        entry["count"] += count
+        entry["months"].append({
+            "month": month.strftime('%Y-%m'),
+            "total": total,
+            "count": count,
+            "change": total - previous,
+        })
+
+    total = sum((entry["total"] for entry in categories.values()), Decimal(0))
+    ranked = sorted(categories.values(), key=lambda entry: (-entry["total"], entry["name"] or ""))
+    for entry in ranked:
+        entry["share"] = round(entry["total"] / total, 4) if total else None
+    return {
+        "from": start,
+        "to": end,
+        "type": kind,
+        "total": total,
+        "count": sum(entry["count"] for entry in ranked),
+        "categories": ranked,
+    }
+
+
+def forecast_payload(today, opening, days, bills):
+    """Day-by-day balance; days after today also subtract the unpaid bills due so far."""
+    bills = {row['due_date']: row['total'] for row in bills}
+    due, rows = Decimal(0), []
+    for day, income, expenses, balance in days:
+        projected = day > today
+        day_bills = bills.get(day, Decimal(0)) if projected else Decimal(0)
+        due += day_bills
+        rows.append({
+            "date": day,
+            "income": income,
+            "expenses": expenses,
+            "bills": day_bills,
+            "balance": balance - due,
+            "projected": projected,
+        })
+    lowest = min(rows, key=lambda row: row["balance"], default=None)
+    return {
+        "from": days[0][0] if days else None,
+        "to": days[-1][0] if days else None,
+        "opening_balance": opening,
+        "closing_balance": rows[-1]["balance"] if rows else opening,
+        "lowest": {"date": lowest["date"], "balance": lowest["balance"]} if lowest else None,
+        "days": rows,
+    }
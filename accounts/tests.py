@@ -1,4 +1,1086 @@
+import base64
+import csv
+import gzip
+import json
+from datetime import date, timedelta
+from decimal import Decimal
+from io import StringIO
+from unittest import mock
 
-from django.test import TestCase
+from asgiref.sync import sync_to_async
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.management import CommandError, call_command
+from django.db import connection, transaction
+from django.test import RequestFactory, TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+from rest_framework.authtoken.models import Token
+from rest_framework.renderers import JSONRenderer
+from rest_framework.test import APIClient
 
-# Create your tests here.
+from accounts.api.authentication import CachedTokenAuthentication, local_tokens
+from accounts.api.conditional import _validators
+from accounts.api.serializers import BillDueSerializer, TransactionSerializer
+from accounts.cache import scope_versions
+
+from accounts.importers import normalise_row, read_ofx, read_qif
+from accounts.instrumentation import QueryBudgetExceeded, QueryBudgetMixin, registry
+from accounts.models import BalanceCheckpoint, BillDue, BillRecurrence, Calendar, CalendarCell, Category, MonthlyRollup, RollupQueueEntry, Transaction
+
+
+def today_is(day):
+    """Patch the `date.today()` that conditional GET validators are built from."""
+    class FixedDate(date):
+        @classmethod
+        def today(cls):
+            return day
+    return mock.patch("accounts.api.conditional.date", FixedDate)
+
+
+# ---------- CALENDAR CELL ROLLUPS ----------
+class CalendarCellDeltaTests(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(username="penny", password="pass12345")
+
+    def cell(self, day):
+        return CalendarCell.objects.get(calendar__user=self.user, date=day)
+
+    def test_deleting_a_user_does_not_replay_each_transaction(self):
+        def delete_user_with(count):
+            user = User.objects.create_user(username=f"gone-{count}")
+            Transaction.objects.bulk_create(
+                Transaction(user=user, amount=Decimal("1.00"), type="expense", date=date(2025, 3, 1 + index % 28))
+                for index in range(count)
+            )
+            with CaptureQueriesContext(connection) as queries:
+                user.delete()
+            self.assertFalse(CalendarCell.objects.filter(calendar__user_id=user.id).exists())
+            return len(queries)
+
+        self.assertEqual(delete_user_with(5), delete_user_with(50))
+
+    def test_create_update_and_delete_keep_cells_in_sync(self):
+        first, second = date(2025, 3, 1), date(2025, 3, 2)
+        txn = Transaction.objects.create(user=self.user, amount=Decimal("40.00"), type="expense", date=first)
+        Transaction.objects.create(user=self.user, amount=Decimal("100.00"), type="income", date=first)
+        self.assertEqual(self.cell(first).net_balance, Decimal("60.00"))
+
+        txn.date, txn.type = second, "income"
+        txn.save()
+        self.assertEqual(self.cell(first).total_expenses, Decimal("0"))
+        self.assertEqual(self.cell(first).net_balance, Decimal("100.00"))
+        self.assertEqual(self.cell(second).total_income, Decimal("40.00"))
+
+        txn.delete()
+        self.assertEqual(self.cell(second).net_balance, Decimal("0"))
+
+    def test_reconcile_reports_and_fixes_drift(self):
+        day = date(2025, 3, 1)
+        Transaction.objects.create(user=self.user, amount=Decimal("25.00"), type="expense", date=day)
+        CalendarCell.objects.filter(date=day).update(total_expenses=Decimal("99.00"))
+
+        out = StringIO()
+        call_command("reconcile_calendar_cells", stdout=out)
+        self.assertIn("1 cell(s) corrected", out.getvalue())
+        self.assertEqual(self.cell(day).total_expenses, Decimal("25.00"))
+
+
+# ---------- BULK TRANSACTIONS ----------
+class TransactionBulkCreateTests(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(username="penny", password="pass12345")
+        self.category = Category.objects.create(user=self.user, name="Groceries")
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+
+    def test_valid_rows_are_created_and_errors_are_positional(self):
+        day = "2025-04-01"
+        payload = [
+            {"amount": "10.00", "type": "expense", "date": day, "category_id": self.category.id},
+            {"amount": "oops", "type": "expense", "date": day, "category_id": self.category.id},
+            {"amount": "5.00", "type": "expense", "date": day, "category_id": 999999},
+            {"amount": "2.50", "type": "expense", "date": day, "category_id": self.category.id},
+        ]
+        response = self.client.post("/api/transactions/bulk/", payload, format="json")
+
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(len(response.data["created"]), 2)
+        self.assertEqual([error["index"] for error in response.data["errors"]], [1, 2])
+        self.assertEqual(
+            CalendarCell.objects.get(calendar__user=self.user, date=date(2025, 4, 1)).total_expenses,
+            Decimal("12.50"),
+        )
+
+
+# ---------- TRANSACTION SEARCH ----------
+class TransactionSearchTests(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(username="penny", password="pass12345")
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+
+    def add(self, description, day=date(2025, 5, 1), user=None):
+        return Transaction.objects.create(
+            user=user or self.user, amount=Decimal("4.50"), type="expense", date=day, description=description
+        )
+
+    def search(self, query):
+        response = self.client.get("/api/transactions/search/", {"q": query})
+        self.assertEqual(response.status_code, 200)
+        return [row["description"] for row in response.data["results"]]
+
+    def test_prefix_terms_match_and_results_are_scoped_to_the_user(self):
+        self.add("Starbucks coffee", date(2025, 5, 1))
+        self.add("Coffee beans", date(2025, 5, 3))
+        self.add("Whole Foods groceries")
+        other = User.objects.create_user(username="rex", password="pass12345")
+        self.add("Coffee for rex", user=other)
+
+        self.assertEqual(self.search("coff"), ["Coffee beans", "Starbucks coffee"])
+        self.assertEqual(self.search("coffee star"), ["Starbucks coffee"])
+        self.assertEqual(self.search("tea"), [])
+        self.assertEqual(self.client.get("/api/transactions/search/").status_code, 400)
+
+    def test_edits_and_deletes_are_reflected(self):
+        txn = self.add("Netflix subscription")
+        txn.description = "Spotify subscription"
+        txn.save()
+        self.assertEqual(self.search("netflix"), [])
+        self.assertEqual(self.search("spot"), ["Spotify subscription"])
+        txn.delete()
+        self.assertEqual(self.search("subscription"), [])
+
+
+# ---------- EXPORT ----------
+class ExportTests(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(username="penny", password="pass12345")
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+        food = Category.objects.create(user=self.user, name="Food")
+        Transaction.objects.create(
+            user=self.user, category=food, amount=Decimal("12.5"), type="expense", date=date(2025, 6, 2),
+            description='Café, "corner"',
+        )
+        Transaction.objects.create(user=self.user, amount=Decimal("100"), type="income", date=date(2025, 6, 1))
+        BillDue.objects.create(user=self.user, name="Rent", amount=Decimal("900"), type="Bill", due_date=date(2025, 6, 1))
+
+    def export(self, **params):
+        response = self.client.get("/api/export/", params)
+        self.assertEqual(response.status_code, 200)
+        return response, b"".join(response.streaming_content)
+
+    def test_ndjson_and_json_contain_every_section_in_api_shape(self):
+        response, body = self.export()
+        self.assertEqual(response["Content-Type"], "application/x-ndjson")
+        records = [json.loads(line) for line in body.decode().splitlines()]
+        self.assertEqual([r["record"] for r in records], ["category", "transaction", "transaction", "bill"])
+        self.assertEqual(records[2]["amount"], "12.50")
+        self.assertEqual(records[2]["category"]["name"], "Food")
+
+        _, body = self.export(fmt="json", include="bills,categories")
+        self.assertEqual(list(json.loads(body)), ["categories", "bills"])
+
+    async def test_asgi_requests_stream_asynchronously(self):
+        token = await sync_to_async(Token.objects.create)(user=self.user)
+        response = await self.async_client.get("/api/export/", headers={"authorization": f"Token {token.key}"})
+        self.assertTrue(response.is_async)
+        body = b"".join([chunk async for chunk in response.streaming_content])
+        self.assertEqual(len(body.decode().splitlines()), 4)
+
+    def test_csv_and_gzip(self):
+        response, body = self.export(fmt="csv", gzip="1")
+        self.assertEqual(response["Content-Type"], "application/gzip")
+        self.assertIn(".csv.gz", response["Content-Disposition"])
+        rows = list(csv.DictReader(StringIO(gzip.decompress(body).decode())))
+        self.assertEqual([row["type"] for row in rows], ["income", "expense"])
+        self.assertEqual(normalise_row(rows[1])["description"], 'Café, "corner"')
+
+        self.assertEqual(self.client.get("/api/export/", {"fmt": "csv", "include": "bills,categories"}).status_code, 400)
+        self.assertEqual(self.client.get("/api/export/", {"fmt": "xml"}).status_code, 400)
+
+
+# ---------- STATEMENT IMPORT ----------
+class StatementImportTests(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(username="penny", password="pass12345")
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+
+    def test_csv_upload_creates_categories_and_reports_bad_rows(self):
+        statement = SimpleUploadedFile(
+            "statement.csv",
+            b"Date,Amount,Memo,Category\n"
+            b"2025-05-01,-12.30,Coffee,Food\n"
+            b"2025-05-01,2000,Salary,Work\n"
+            b"not-a-date,1,Broken,Food\n"
+            b"2025-05-02,-7.70,Lunch,Food\n"
+            b"2025-05-02,NaN,Glitch,Food\n"
+            b"2025-05-02,-inf,Glitch,Food\n",
+        )
+        response = self.client.post(
+            "/api/transactions/import/",
+            {
+                "file": statement,
+                "chunk_size": 2,
+                "date_column": "Date",
+                "amount_column": "Amount",
+                "description_column": "Memo",
+                "category_column": "Category",
+            },
+        )
+
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual((response.data["imported"], response.data["skipped"]), (3, 3))
+        self.assertEqual([error["row"] for error in response.data["errors"]], [3, 5, 6])
+        self.assertEqual(sorted(Category.objects.values_list("name", flat=True)), ["Food", "Work"])
+        self.assertEqual(
+            CalendarCell.objects.get(calendar__user=self.user, date=date(2025, 5, 1)).net_balance,
+            Decimal("1987.70"),
+        )
+
+    def test_ofx_reader_handles_sgml_blocks(self):
+        ofx = StringIO(
+            "<OFX><BANKTRANLIST>\n<STMTTRN>\n<TRNTYPE>DEBIT\n<DTPOSTED>20250103120000\n"
+            "<TRNAMT>-42.10\n<NAME>Grocer\n</STMTTRN>\n</BANKTRANLIST></OFX>\n"
+        )
+        rows = [normalise_row(row) for row in read_ofx(ofx)]
+        self.assertEqual(rows[0]["amount"], Decimal("42.10"))
+        self.assertEqual((rows[0]["type"], rows[0]["date"]), ("expense", date(2025, 1, 3)))
+
+    def test_qif_reader_accepts_two_digit_years(self):
+        qif = StringIO("!Type:Bank\nD1/15'24\nT-12.50\nPCoffee\n^\nD12/ 3/2024\nT900\nPSalary\n^\n")
+        rows = [normalise_row(row) for row in read_qif(qif)]
+        self.assertEqual([row["date"] for row in rows], [date(2024, 1, 15), date(2024, 12, 3)])
+
+    def test_unreadable_upload_is_a_400_with_the_rows_already_imported(self):
+        # Valid rows well past the first decoded block, then a byte that is not UTF-8.
+        rows = b"".join(b"2025-05-01,-1.00,Coffee %d\n" % n for n in range(600))
+        statement = SimpleUploadedFile("statement.csv", b"date,amount,description\n" + rows + b"2025-05-02,-2.00,Caf\xe9\n")
+        response = self.client.post("/api/transactions/import/", {"file": statement, "chunk_size": 100})
+
+        self.assertEqual(response.status_code, 400)
+        self.assertIn("Could not read the statement after row", response.data["error"])
+        self.assertGreater(response.data["imported"], 0)
+        self.assertEqual(Transaction.objects.filter(user=self.user).count(), response.data["imported"])
+
+
+# ---------- SUMMARIES ----------
+class MonthlyPieDataTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_user(username="penny", password="pass12345")
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+        Transaction.objects.create(user=self.user, amount=Decimal("100.00"), type="income", date=date(2024, 2, 3))
+        Transaction.objects.create(user=self.user, amount=Decimal("30.00"), type="expense", date=date(2025, 2, 9))
+        BillDue.objects.create(
+            user=self.user, name="Rent", amount=Decimal("50.00"), type="Bill", due_date=date(2025, 2, 1)
+        )
+
+    def test_single_year_keeps_original_shape(self):
+        response = self.client.get("/api/monthly-pie-data/", {"year": 2025})
+        self.assertEqual(response.data["year"], 2025)
+        self.assertEqual(response.data["months"], [{
+            "month": 2,
+            "total_income": Decimal("0"),
+            "total_expenses": Decimal("30.00"),
+            "total_bills": Decimal("50.00"),
+        }])
+
+    def test_years_range_is_a_single_rollup_query(self):
+        # ETag validator plus the rollup rows.
+        with self.assertNumQueries(2):
+            response = self.client.get("/api/monthly-pie-data/", {"years": "2024-2025"})
+        self.assertEqual([entry["year"] for entry in response.data["years"]], [2024, 2025])
+        self.assertEqual(response.data["years"][0]["months"][0]["total_income"], Decimal("100.00"))
+
+
+# ---------- ASYNC VIEWS ----------
+class AsyncSummaryViewTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        local_tokens.clear()
+        self.user = User.objects.create_user(username="penny", password="pass12345")
+        self.token = Token.objects.create(user=self.user)
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+        self.headers = {"authorization": f"Token {self.token.key}"}
+        Transaction.objects.create(user=self.user, amount=Decimal("100.00"), type="income", date=date(2025, 2, 3))
+        Transaction.objects.create(user=self.user, amount=Decimal("30.00"), type="expense", date=date(2025, 2, 3))
+
+    async def test_async_endpoints_match_the_sync_ones(self):
+        for path, params in [("summary/annual/", {"year": 2025}), ("monthly-pie-data/", {"years": "2024-2025"})]:
+            response = await self.async_client.get(f"/api/async/{path}", params, headers=self.headers)
+            self.assertEqual(response.status_code, 200)
+            expected = await sync_to_async(self.client.get)(f"/api/{path}", params)
+            self.assertEqual(response.json(), expected.json())
+
+    async def test_dashboard_revalidates_after_a_month_rollover(self):
+        response = await self.async_client.get("/api/async/dashboard/", headers=self.headers)
+        headers = {**self.headers, "if-none-match": response["ETag"]}
+        self.assertEqual((await self.async_client.get("/api/async/dashboard/", headers=headers)).status_code, 304)
+        with today_is(date.today() + timedelta(days=31)):
+            response = await self.async_client.get("/api/async/dashboard/", headers=headers)
+        self.assertEqual(response.status_code, 200)
+
+    async def test_default_year_revalidates_after_a_year_rollover(self):
+        for path in ("/api/summary/annual/", "/api/async/summary/annual/", "/api/monthly-pie-data/",
+                     "/api/async/monthly-pie-data/", "/api/summary/categories/"):
+            response = await self.async_client.get(path, headers=self.headers)
+            headers = {**self.headers, "if-none-match": response["ETag"]}
+            self.assertEqual((await self.async_client.get(path, headers=headers)).status_code, 304, path)
+            with today_is(date(date.today().year + 1, 1, 1)):
+                self.assertEqual((await self.async_client.get(path, headers=headers)).status_code, 200, path)
+
+    async def test_dashboard_requires_a_valid_token(self):
+        response = await self.async_client.get("/api/async/dashboard/")
+        self.assertEqual(response.status_code, 401)
+        response = await self.async_client.get("/api/async/dashboard/", headers={"authorization": "Token nope"})
+        self.assertEqual(response.status_code, 401)
+
+        response = await self.async_client.get("/api/async/dashboard/", {"year": 2025}, headers=self.headers)
+        self.assertEqual(response.json()["annual"]["total_balance"], 70.0)
+        self.assertEqual(response.json()["total_expenses"], {"total_expenses": 30.0})
+
+
+# ---------- RECURRING BILLS ----------
+class BillRecurrenceTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_user(username="penny", password="pass12345")
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+
+    def create_rule(self, **fields):
+        data = {"name": "Rent", "amount": "100.00", "type": "Bill", **fields}
+        response = self.client.post("/api/bills/recurring/", data, format="json")
+        self.assertEqual(response.status_code, 201, response.data)
+        return BillRecurrence.objects.get(id=response.data["id"])
+
+    def test_rule_expansion(self):
+        monthly = BillRecurrence(frequency="monthly", interval=1, start_date=date(2025, 1, 31))
+        self.assertEqual(
+            [monthly.occurrence(index) for index in range(3)],
+            [date(2025, 1, 31), date(2025, 2, 28), date(2025, 3, 31)],
+        )
+        # Last Friday of the month when the start date is a 5th Friday.
+        nth = BillRecurrence(frequency="nth_weekday", interval=1, start_date=date(2025, 1, 31))
+        self.assertEqual(nth.occurrence(1), date(2025, 2, 28))
+        self.assertEqual(nth.occurrence(3), date(2025, 4, 25))
+        weekly = BillRecurrence(frequency="weekly", interval=2, start_date=date(2025, 1, 6), count=3)
+        self.assertEqual(list(weekly.dates()), [date(2025, 1, 6), date(2025, 1, 20), date(2025, 2, 3)])
+
+    def test_counted_rule_is_materialized_with_rollups(self):
+        rule = self.create_rule(frequency="monthly", start_date="2025-01-05", count=3)
+        self.assertEqual(rule.materialized_through, date.max)
+        self.assertEqual(
+            list(BillDue.objects.filter(user=self.user).values_list("due_date", flat=True).order_by("due_date")),
+            [date(2025, 1, 5), date(2025, 2, 5), date(2025, 3, 5)],
+        )
+        self.assertEqual(MonthlyRollup.objects.get(user=self.user, year=2025, month=2).total_bills, Decimal("100.00"))
+
+    def test_later_windows_are_materialized_lazily(self):
+        far = date.today().year + 5
+        rule = self.create_rule(frequency="yearly", start_date=f"{far - 5}-06-01")
+        self.assertFalse(BillDue.objects.filter(due_date__year=far).exists())
+
+        response = self.client.get("/api/bills/", {"month": 6, "year": far})
+        self.assertEqual([bill["due_date"] for bill in response.data["results"]], [f"{far}-06-01"])
+        self.assertEqual(response.data["results"][0]["recurrence"], rule.id)
+        rule.refresh_from_db()
+        self.assertEqual(rule.materialized_through, date(far, 6, 30))
+
+        # Editing replaces the unpaid future occurrences.
+        self.client.patch(f"/api/bills/recurring/{rule.id}/", {"amount": "120.00"}, format="json")
+        self.assertEqual(
+            set(BillDue.objects.filter(due_date__gte=date.today()).values_list("amount", flat=True)),
+            {Decimal("120.00")},
+        )
+
+
+# ---------- CATEGORY SUMMARY ----------
+class CategorySummaryTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_user(username="penny", password="pass12345")
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+        food = Category.objects.create(user=self.user, name="Food")
+        rent = Category.objects.create(user=self.user, name="Rent")
+        for amount, day, category in [
+            ("20.00", date(2024, 12, 5), food),  # before the range: only feeds January's change
+            ("30.00", date(2025, 1, 5), food),
+            ("10.00", date(2025, 1, 9), food),
+            ("25.00", date(2025, 3, 1), food),  # February has no Food spend
+            ("100.00", date(2025, 2, 1), rent),
+        ]:
+            Transaction.objects.create(user=self.user, amount=Decimal(amount), type="expense", date=day, category=category)
+
+    def test_totals_share_and_month_over_month_change(self):
+        # ETag validator plus one grouped query.
+        with self.assertNumQueries(2):
+            response = self.client.get("/api/summary/categories/", {"from": "2025-01-01", "to": "2025-03-31"})
+        data = response.data
+        self.assertEqual((data["total"], data["count"]), (Decimal("165.00"), 4))
+        rent, food = data["categories"]
+        self.assertEqual((rent["name"], rent["share"]), ("Rent", Decimal("0.6061")))
+        self.assertEqual((food["total"], food["count"]), (Decimal("65.00"), 3))
+        self.assertEqual(
+            [(month["month"], month["change"]) for month in food["months"]],
+            [("2025-01", Decimal("20.00")), ("2025-03", Decimal("25.00"))],
+        )
+
+        # Served from the cache until a write in the range's years.
+        with self.assertNumQueries(1):
+            self.client.get("/api/summary/categories/", {"from": "2025-01-01", "to": "2025-03-31"})
+        self.assertEqual(self.client.get("/api/summary/categories/", {"type": "other"}).status_code, 400)
+
+    def test_moving_a_transaction_between_categories_updates_the_summary(self):
+        params = {"from": "2025-01-01", "to": "2025-03-31"}
+        self.client.get("/api/summary/categories/", params)
+        moved = Transaction.objects.get(user=self.user, date=date(2025, 3, 1))
+        moved.category = Category.objects.get(user=self.user, name="Rent")
+        with self.captureOnCommitCallbacks(execute=True):
+            moved.save()
+
+        totals = {row["name"]: row["total"] for row in self.client.get("/api/summary/categories/", params).data["categories"]}
+        self.assertEqual(totals, {"Rent": Decimal("125.00"), "Food": Decimal("40.00")})
+
+
+# ---------- FORECAST ----------
+class ForecastTests(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(username="penny", password="pass12345")
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+        self.today = date.today()
+        Transaction.objects.create(
+            user=self.user, amount=Decimal("500.00"), type="income", date=self.today - timedelta(days=200)
+        )
+        Transaction.objects.create(
+            user=self.user, amount=Decimal("50.00"), type="expense", date=self.today - timedelta(days=5)
+        )
+        BillDue.objects.create(
+            user=self.user, name="Rent", amount=Decimal("300.00"), type="Bill", due_date=self.today + timedelta(days=3)
+        )
+
+    def get(self):
+        return self.client.get("/api/forecast/", {
+            "from": (self.today - timedelta(days=10)).isoformat(),
+            "to": (self.today + timedelta(days=10)).isoformat(),
+        })
+
+    def test_running_balance_projects_unpaid_bills(self):
+        data = self.get().data
+        self.assertEqual(data["opening_balance"], Decimal("500.00"))
+        self.assertEqual(len(data["days"]), 21)
+        self.assertEqual(data["days"][10]["balance"], Decimal("450.00"))
+        self.assertFalse(data["days"][10]["projected"])
+        self.assertEqual(data["closing_balance"], Decimal("150.00"))
+        self.assertEqual(data["lowest"], {"date": self.today + timedelta(days=3), "balance": Decimal("150.00")})
+
+    def test_checkpoint_is_reused_and_invalidated_by_backdated_writes(self):
+        self.get()
+        checkpoint = BalanceCheckpoint.objects.get(user=self.user)
+        self.assertEqual((checkpoint.date, checkpoint.balance), (self.today - timedelta(days=11), Decimal("500.00")))
+
+        Transaction.objects.create(
+            user=self.user, amount=Decimal("20.00"), type="expense", date=self.today - timedelta(days=100)
+        )
+        self.assertFalse(BalanceCheckpoint.objects.exists())
+        self.assertEqual(self.get().data["opening_balance"], Decimal("480.00"))
+
+    def test_checkpoint_is_not_saved_when_a_write_lands_after_the_totals_were_read(self):
+        save_if_current = BalanceCheckpoint.save_if_current
+
+        def write_then_save(*args):
+            # A backdated write commits between the forecast's read and its checkpoint save.
+            Transaction.objects.create(
+                user=self.user, amount=Decimal("20.00"), type="expense", date=self.today - timedelta(days=100)
+            )
+            return save_if_current(*args)
+
+        with mock.patch.object(BalanceCheckpoint, "save_if_current", side_effect=write_then_save):
+            opening, _ = BalanceCheckpoint.daily_balances(self.user.id, self.today - timedelta(days=10), self.today)
+        self.assertEqual(opening, Decimal("500.00"))
+        self.assertFalse(BalanceCheckpoint.objects.exists())
+        self.assertEqual(self.get().data["opening_balance"], Decimal("480.00"))
+        self.assertEqual(BalanceCheckpoint.objects.get(user=self.user).balance, Decimal("480.00"))
+
+    def test_validators_change_at_midnight(self):
+        response = self.get()
+        request = RequestFactory().get(response.wsgi_request.get_full_path())
+        request.user = self.user
+        etag, last_modified = _validators(request, self.today)
+        self.assertEqual(response["ETag"], etag)
+        self.assertEqual(self.client.get(request.get_full_path(), HTTP_IF_NONE_MATCH=etag).status_code, 304)
+
+        tomorrow_etag, tomorrow_modified = _validators(request, self.today + timedelta(days=1))
+        self.assertNotEqual(tomorrow_etag, etag)
+        self.assertGreater(tomorrow_modified, last_modified)
+
+
+# ---------- DASHBOARD ----------
+class DashboardTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_user(username="penny", password="pass12345")
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+        Transaction.objects.create(user=self.user, amount=Decimal("100.00"), type="income", date=date(2024, 5, 3))
+        Transaction.objects.create(user=self.user, amount=Decimal("30.00"), type="expense", date=date(2025, 2, 9))
+        BillDue.objects.create(
+            user=self.user, name="Rent", amount=Decimal("50.00"), type="Bill", due_date=date(2025, 2, 1)
+        )
+
+    def test_sections_match_the_standalone_endpoints(self):
+        # ETag validator, recurrence horizon check, one rollup scan and one bills query.
+        with self.assertNumQueries(4):
+            response = self.client.get("/api/dashboard/", {"year": 2025, "month": 2})
+        self.assertEqual(response.status_code, 200)
+        data = response.json()
+        for section, path, params in [
+            ("profile", "/api/profile/", {}),
+            ("total_expenses", "/api/transactions/total-expenses/", {}),
+            ("monthly_summary", "/api/summary/monthly/", {}),
+            ("annual", "/api/summary/annual/", {"year": 2025}),
+            ("pie", "/api/monthly-pie-data/", {"year": 2025}),
+        ]:
+            self.assertEqual(data[section], self.client.get(path, params).json(), section)
+        self.assertEqual(
+            data["bills"], self.client.get("/api/bills/", {"year": 2025, "month": 2}).json()["results"]
+        )
+
+    def test_default_period_revalidates_after_a_month_rollover(self):
+        etag = self.client.get("/api/dashboard/")["ETag"]
+        self.assertEqual(self.client.get("/api/dashboard/", HTTP_IF_NONE_MATCH=etag).status_code, 304)
+        with today_is(date.today() + timedelta(days=31)):
+            self.assertEqual(self.client.get("/api/dashboard/", HTTP_IF_NONE_MATCH=etag).status_code, 200)
+
+    def test_fields_selects_sections(self):
+        # ETag validator and the rollups of the year only.
+        with self.assertNumQueries(2):
+            response = self.client.get("/api/dashboard/", {"fields": "annual,pie", "year": 2025})
+        self.assertEqual(set(response.data), {"annual", "pie"})
+        self.assertEqual(self.client.get("/api/dashboard/", {"fields": "nope"}).status_code, 400)
+
+
+# ---------- CALENDAR ----------
+class CalendarListQueryTests(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(username="penny", password="pass12345")
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+
+    def create_months(self, count):
+        for month in range(1, count + 1):
+            self.client.post("/api/calendar/", {"month": month, "year": 2025}, format="json")
+            BillDue.objects.create(
+                user=self.user, name="Rent", amount=Decimal("50.00"), type="Bill", due_date=date(2025, month, 1)
+            )
+
+    def test_query_count_is_constant_in_number_of_months(self):
+        # ETag validator, calendars, prefetched cells, recurrence horizon check, bills.
+        self.create_months(1)
+        with self.assertNumQueries(5):
+            self.client.get("/api/calendar/")
+
+        self.create_months(12)
+        with self.assertNumQueries(5):
+            response = self.client.get("/api/calendar/")
+        self.assertEqual(len(response.data), 12)
+        self.assertEqual(response.data[-1]["cells"][0]["bills"][0]["name"], "Rent")
+
+    def test_create_fills_cells_and_returns_existing_months(self):
+        response = self.client.post("/api/calendar/", {"month": 2, "year": 2025}, format="json")
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(len(response.data["cells"]), 28)
+
+        # The transaction signal creates March with only its own cell; POST fills the rest.
+        Transaction.objects.create(user=self.user, amount=Decimal("12.50"), type="expense", date=date(2025, 3, 9))
+        response = self.client.post("/api/calendar/", {"month": 3, "year": 2025}, format="json")
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(response.data["cells"]), 31)
+        self.assertEqual(response.data["cells"][8]["total_expenses"], "12.50")
+        self.assertEqual(CalendarCell.objects.filter(calendar__user=self.user).count(), 28 + 31)
+
+    def test_range_creates_missing_months_in_bulk(self):
+        # The transaction signal created March with only its own cell.
+        Transaction.objects.create(user=self.user, amount=Decimal("5.00"), type="income", date=date(2025, 3, 2))
+        # ETag, generation (savepoint, calendars x2, insert, cells, aggregate, insert, release),
+        # version bump, then calendars, cells, recurrence horizon check and bills for the response.
+        with self.assertNumQueries(14):
+            response = self.client.get("/api/calendar/", {"from": "2024-11", "to": "2025-04"})
+        self.assertEqual([(c["year"], c["month"]) for c in response.data][::-1], [
+            (2024, 11), (2024, 12), (2025, 1), (2025, 2), (2025, 3), (2025, 4),
+        ])
+        self.assertEqual(sum(len(c["cells"]) for c in response.data), 30 + 31 + 31 + 28 + 31 + 30)
+        self.assertEqual(self.client.get("/api/calendar/", {"from": "2025-13"}).status_code, 400)
+
+
+@override_settings(CALENDAR_MODE="virtual")
+class VirtualCalendarTests(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(username="penny", password="pass12345")
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+
+    def test_cells_are_synthesized_and_only_active_days_stored(self):
+        response = self.client.post("/api/calendar/", {"month": 4, "year": 2025}, format="json")
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(len(response.data["cells"]), 30)
+        self.assertFalse(CalendarCell.objects.exists())
+
+        Transaction.objects.create(user=self.user, amount=Decimal("8.00"), type="expense", date=date(2025, 4, 2))
+        BillDue.objects.create(user=self.user, name="Gym", amount=Decimal("30.00"), type="Bill", due_date=date(2025, 4, 5))
+        # ETag validator, calendars, the grouped aggregate, recurrence horizon check and bills.
+        with self.assertNumQueries(5):
+            response = self.client.get("/api/calendar/", {"month": 4, "year": 2025})
+        cells = response.data[0]["cells"]
+        self.assertEqual(set(cells[0]), {"id", "date", "total_income", "total_expenses", "net_balance", "bills"})
+        self.assertEqual(cells[1]["total_expenses"], "8.00")
+        self.assertEqual(cells[4]["bills"][0]["name"], "Gym")
+        self.assertEqual(CalendarCell.objects.count(), 1)
+        # Days with a stored cell report its id; the others are synthesized.
+        self.assertEqual(cells[1]["id"], CalendarCell.objects.get().id)
+        self.assertEqual({cell["id"] for index, cell in enumerate(cells) if index != 1}, {None})
+
+    def test_prune_deletes_empty_cells(self):
+        with self.settings(CALENDAR_MODE="stored"):
+            self.client.post("/api/calendar/", {"month": 4, "year": 2025}, format="json")
+        Transaction.objects.create(user=self.user, amount=Decimal("8.00"), type="expense", date=date(2025, 4, 2))
+        call_command("prune_calendar_cells", stdout=StringIO())
+        self.assertEqual(list(CalendarCell.objects.values_list("date", flat=True)), [date(2025, 4, 2)])
+
+
+class MonthlyRollupTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_user(username="penny", password="pass12345")
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+
+    def test_rollups_follow_writes_and_feed_summaries(self):
+        txn = Transaction.objects.create(user=self.user, amount=Decimal("80.00"), type="income", date=date(2025, 1, 5))
+        Transaction.objects.create(user=self.user, amount=Decimal("20.00"), type="expense", date=date(2025, 1, 6))
+        bill = BillDue.objects.create(
+            user=self.user, name="Phone", amount=Decimal("15.00"), type="Bill", due_date=date(2025, 1, 9)
+        )
+        txn.date = date(2025, 2, 1)
+        txn.save()
+        bill.delete()
+
+        january = MonthlyRollup.objects.get(user=self.user, year=2025, month=1)
+        self.assertEqual((january.total_income, january.total_expenses, january.total_bills), (0, 20, 0))
+        self.assertEqual((january.transaction_count, january.bill_count), (1, 0))
+
+        response = self.client.get("/api/summary/annual/", {"year": 2025})
+        self.assertEqual(response.data["total_balance"], Decimal("60.00"))
+        response = self.client.get("/api/summary/monthly/")
+        self.assertEqual([row["month"] for row in response.data], [date(2025, 2, 1), date(2025, 1, 1)])
+
+    def test_check_and_rebuild_command(self):
+        Transaction.objects.create(user=self.user, amount=Decimal("10.00"), type="expense", date=date(2025, 3, 1))
+        MonthlyRollup.objects.update(total_expenses=Decimal("0"))
+
+        out = StringIO()
+        call_command("rebuild_monthly_rollups", "--check", stdout=out)
+        self.assertIn("1 month(s) out of sync", out.getvalue())
+        call_command("rebuild_monthly_rollups", stdout=StringIO())
+        self.assertEqual(MonthlyRollup.objects.get(user=self.user).total_expenses, Decimal("10.00"))
+
+
+# ---------- PAGINATION & FILTERS ----------
+class KeysetPaginationTests(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(username="penny", password="pass12345")
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+        self.category = Category.objects.create(user=self.user, name="Food")
+        for day, amount in [(1, "5.00"), (2, "15.00"), (2, "25.00"), (2, "35.00"), (3, "45.00")]:
+            Transaction.objects.create(
+                user=self.user, category=self.category, amount=Decimal(amount), type="expense", date=date(2025, 6, day)
+            )
+
+    def test_cursor_walks_every_row_once_newest_first(self):
+        seen, url = [], "/api/transactions/?page_size=2"
+        while url:
+            response = self.client.get(url)
+            seen.extend(row["id"] for row in response.data["results"])
+            url = response.data["next"]
+        expected = list(Transaction.objects.order_by("-date", "-id").values_list("id", flat=True))
+        self.assertEqual(seen, expected)
+
+    def test_filters_combine_with_pagination(self):
+        response = self.client.get(
+            "/api/transactions/", {"date_from": "2025-06-02", "amount_max": "30", "page_size": 1}
+        )
+        self.assertEqual(response.data["results"][0]["amount"], "25.00")
+        response = self.client.get(response.data["next"])
+        self.assertEqual(response.data["results"][0]["amount"], "15.00")
+        self.assertIsNone(response.data["next"])
+
+    def test_bad_filter_and_cursor_values_are_rejected(self):
+        self.assertEqual(self.client.get("/api/transactions/", {"amount_min": "lots"}).status_code, 400)
+        self.assertEqual(self.client.get("/api/transactions/", {"cursor": "garbage"}).status_code, 404)
+        for value in ("NaN", "Infinity", "-inf", "sNaN"):
+            self.assertEqual(self.client.get("/api/transactions/", {"amount_min": value}).status_code, 400)
+        for position in (["xx", 1], ["2025-06-02", "1"], ["2025-06-02", True], [20250602, 1], ["2025-06-02"]):
+            cursor = base64.urlsafe_b64encode(json.dumps(position).encode()).decode()
+            self.assertEqual(self.client.get("/api/transactions/", {"cursor": cursor}).status_code, 404)
+        cursor = base64.urlsafe_b64encode(json.dumps([5, "x"]).encode()).decode()
+        self.assertEqual(self.client.get("/api/bills/", {"cursor": cursor}).status_code, 404)
+        self.assertEqual(self.client.get("/api/categories/", {"cursor": cursor}).status_code, 404)
+
+
+# ---------- FAST LIST SERIALIZATION ----------
+class FastSerializerTests(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(username="penny", password="pass12345")
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+        food = Category.objects.create(user=self.user, name="Food")
+        Transaction.objects.create(
+            user=self.user, category=food, amount=Decimal("1234.5"), type="expense", date=date(2025, 6, 1),
+            description="Market",
+        )
+        Transaction.objects.create(user=self.user, amount=Decimal("7"), type="income", date=date(2025, 6, 2))
+        BillDue.objects.create(
+            user=self.user, name="Rent", amount=Decimal("900"), type="Bill", due_date=date(2025, 6, 1), note="autopay"
+        )
+        BillRecurrence.objects.create(
+            user=self.user, name="Gym", amount=Decimal("25.00"), type="Bill",
+            frequency="monthly", start_date=date(2025, 6, 3), count=1,
+        )
+
+    def test_list_output_matches_the_serializers_byte_for_byte(self):
+        renderer = JSONRenderer()
+        transactions = Transaction.objects.filter(user=self.user).order_by("-date", "-id")
+        response = self.client.get("/api/transactions/")
+        self.assertEqual(
+            renderer.render(response.data["results"]),
+            renderer.render(TransactionSerializer(transactions, many=True).data),
+        )
+
+        bills = BillDue.objects.filter(user=self.user).order_by("due_date", "id")
+        response = self.client.get("/api/bills/", {"month": 6, "year": 2025})
+        self.assertEqual(len(response.data["results"]), 2)
+        self.assertEqual(
+            renderer.render(response.data["results"]),
+            renderer.render(BillDueSerializer(bills, many=True).data),
+        )
+
+
+# ---------- SUMMARY CACHE ----------
+class SummaryCacheTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_user(username="penny", password="pass12345")
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+
+    def test_writes_only_invalidate_the_affected_year(self):
+        Transaction.objects.create(user=self.user, amount=Decimal("10.00"), type="expense", date=date(2024, 1, 1))
+        self.client.get("/api/summary/annual/", {"year": 2024})
+        self.client.get("/api/summary/annual/", {"year": 2025})
+
+        with self.captureOnCommitCallbacks(execute=True):
+            Transaction.objects.create(user=self.user, amount=Decimal("5.00"), type="expense", date=date(2025, 3, 1))
+        # Only the ETag validator lookup on a cache hit.
+        with self.assertNumQueries(1):
+            self.client.get("/api/summary/annual/", {"year": 2024})
+        with self.assertNumQueries(2):
+            response = self.client.get("/api/summary/annual/", {"year": 2025})
+        self.assertEqual(response.data["total_expenses"], Decimal("5.00"))
+
+    def test_category_rename_invalidates_day_view(self):
+        category = Category.objects.create(user=self.user, name="Food")
+        Transaction.objects.create(
+            user=self.user, category=category, amount=Decimal("5.00"), type="expense", date=date(2025, 3, 1)
+        )
+        calendar_id = CalendarCell.objects.get(calendar__user=self.user).calendar_id
+        url = f"/api/calendar/{calendar_id}/day/2025-03-01/"
+        self.client.get(url)
+
+        category.name = "Groceries"
+        with self.captureOnCommitCallbacks(execute=True):
+            category.save()
+        response = self.client.get(url)
+        self.assertEqual(response.data["transactions"][0]["category__name"], "Groceries")
+
+    def test_description_and_bill_name_edits_invalidate_day_view(self):
+        txn = Transaction.objects.create(
+            user=self.user, amount=Decimal("5.00"), type="expense", date=date(2025, 3, 1), description="Cofee"
+        )
+        bill = BillDue.objects.create(
+            user=self.user, name="Rnet", amount=Decimal("50.00"), type="Bill", due_date=date(2025, 3, 1)
+        )
+        calendar_id = CalendarCell.objects.get(calendar__user=self.user).calendar_id
+        url = f"/api/calendar/{calendar_id}/day/2025-03-01/"
+        self.client.get(url)
+
+        txn.description = "Coffee"
+        bill.name = "Rent"
+        with self.captureOnCommitCallbacks(execute=True):
+            txn.save()
+            bill.save()
+        response = self.client.get(url)
+        self.assertEqual(response.data["transactions"][0]["description"], "Coffee")
+        self.assertEqual(response.data["bills"][0]["name"], "Rent")
+
+    def test_versions_are_bumped_only_after_commit(self):
+        before = scope_versions(self.user.id, ["m2025-03", "y2025", "all"])
+        with self.captureOnCommitCallbacks() as callbacks:
+            Transaction.objects.create(user=self.user, amount=Decimal("5.00"), type="expense", date=date(2025, 3, 1))
+            self.assertEqual(scope_versions(self.user.id, before), before)
+        for callback in callbacks:
+            callback()
+        after = scope_versions(self.user.id, before)
+        self.assertTrue(all(after[scope] > before[scope] for scope in before))
+
+
+# ---------- CONDITIONAL GET ----------
+class ConditionalGetTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_user(username="penny", password="pass12345")
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+
+    def test_unchanged_data_returns_304_until_a_write(self):
+        first = self.client.get("/api/bills/")
+        etag = first["ETag"]
+        with self.assertNumQueries(1):
+            second = self.client.get("/api/bills/", HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(second.status_code, 304)
+
+        BillDue.objects.create(
+            user=self.user, name="Rent", amount=Decimal("50.00"), type="Bill", due_date=date(2025, 2, 1)
+        )
+        third = self.client.get("/api/bills/", HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(third.status_code, 200)
+        self.assertNotEqual(third["ETag"], etag)
+
+
+# ---------- AUTHENTICATION ----------
+class CachedTokenAuthenticationTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        local_tokens.clear()
+        self.user = User.objects.create_user(username="penny", password="pass12345")
+        self.token = Token.objects.create(user=self.user)
+        self.client = APIClient()
+        self.client.credentials(HTTP_AUTHORIZATION=f"Token {self.token.key}")
+
+    def test_repeat_requests_skip_the_token_query(self):
+        self.client.get("/api/profile/")
+        with self.assertNumQueries(0):
+            response = self.client.get("/api/profile/")
+        self.assertEqual(response.data["username"], "penny")
+
+    def test_shared_cache_holds_no_user_and_loads_it_by_primary_key(self):
+        self.client.get("/api/profile/")
+        self.assertEqual(
+            cache.get(f"auth:token:{self.token.key}"), (self.user.id, self.token.created, True)
+        )
+        local_tokens.clear()  # another worker
+        with self.assertNumQueries(1):
+            response = self.client.get("/api/profile/")
+        self.assertEqual(response.data["username"], "penny")
+
+    def test_revocation_reaches_workers_still_holding_the_token(self):
+        self.client.get("/api/profile/")
+        key = self.token.key
+        stale = local_tokens.get(key)
+        self.token.delete()
+        local_tokens.set(key, stale)  # another worker's LRU
+        self.assertEqual(self.client.get("/api/profile/").status_code, 401)
+
+    def test_each_request_gets_its_own_user(self):
+        authentication = CachedTokenAuthentication()
+        first, _ = authentication.authenticate_credentials(self.token.key)
+        first.first_name = "Changed"
+        second, _ = authentication.authenticate_credentials(self.token.key)
+        self.assertIsNot(first, second)
+        self.assertEqual((second.pk, second.first_name), (self.user.pk, ""))
+
+    def test_deleted_token_and_deactivated_user_are_rejected(self):
+        self.client.get("/api/profile/")
+        self.user.is_active = False
+        self.user.save()
+        self.assertEqual(self.client.get("/api/profile/").status_code, 401)
+
+        self.user.is_active = True
+        self.user.save()
+        self.client.get("/api/profile/")
+        self.token.delete()
+        self.assertEqual(self.client.get("/api/profile/").status_code, 401)
+
+    @override_settings(TOKEN_TTL_DAYS=1)
+    def test_expired_token_is_rejected_and_rotated_on_sign_in(self):
+        Token.objects.filter(pk=self.token.pk).update(created=timezone.now() - timedelta(days=2))
+        self.assertEqual(self.client.get("/api/profile/").status_code, 401)
+
+        response = APIClient().post("/api/signin/", {"username": "penny", "password": "pass12345"}, format="json")
+        self.assertNotEqual(response.data["token"], self.token.key)
+        self.client.credentials(HTTP_AUTHORIZATION=f"Token {response.data['token']}")
+        self.assertEqual(self.client.get("/api/profile/").status_code, 200)
+
+
+# ---------- ROLLUP QUEUE ----------
+@override_settings(ROLLUP_MODE="queue")
+class RollupQueueTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_user(username="penny", password="pass12345")
+
+    def test_writes_are_queued_and_coalesced_by_the_worker(self):
+        day = date(2025, 7, 4)
+        txn = Transaction.objects.create(user=self.user, amount=Decimal("10.00"), type="expense", date=day)
+        Transaction.objects.create(user=self.user, amount=Decimal("5.00"), type="expense", date=day)
+        txn.amount = Decimal("20.00")
+        txn.save()
+        BillDue.objects.create(user=self.user, name="Gym", amount=Decimal("30.00"), type="Bill", due_date=day)
+
+        self.assertFalse(CalendarCell.objects.exists())
+        self.assertEqual(RollupQueueEntry.stats()["depth"], 4)
+
+        call_command("process_rollup_queue", "--once", stdout=StringIO())
+        self.assertEqual(RollupQueueEntry.stats()["depth"], 0)
+        self.assertEqual(CalendarCell.objects.get(date=day).total_expenses, Decimal("25.00"))
+        rollup = MonthlyRollup.objects.get(user=self.user, year=2025, month=7)
+        self.assertEqual((rollup.total_expenses, rollup.total_bills), (Decimal("25.00"), Decimal("30.00")))
+
+    def test_bill_only_days_store_no_cells_or_calendars(self):
+        BillDue.objects.create(user=self.user, name="Gym", amount=Decimal("30.00"), type="Bill", due_date=date(2026, 3, 5))
+        call_command("process_rollup_queue", "--once", stdout=StringIO())
+        self.assertFalse(Calendar.objects.filter(user=self.user).exists())
+        self.assertFalse(CalendarCell.objects.exists())
+        self.assertEqual(MonthlyRollup.objects.get(user=self.user, year=2026, month=3).total_bills, Decimal("30.00"))
+
+    def test_deleting_a_user_does_not_enqueue_for_it(self):
+        Transaction.objects.create(user=self.user, amount=Decimal("10.00"), type="expense", date=date(2025, 7, 4))
+        self.user.delete()
+        self.assertEqual(RollupQueueEntry.objects.count(), 0)
+
+
+# ---------- QUERY BUDGETS ----------
+class QueryBudgetTests(QueryBudgetMixin, TestCase):
+    def setUp(self):
+        cache.clear()
+        local_tokens.clear()
+        registry.clear()
+        self.user = User.objects.create_user(username="penny", password="pass12345", is_staff=True)
+        groceries = Category.objects.create(user=self.user, name="Groceries")
+        rent = Category.objects.create(user=self.user, name="Rent")
+        for month in range(1, 13):
+            for day in (1, 9, 17, 25):
+                Transaction.objects.create(
+                    user=self.user, category=groceries if day > 1 else rent, amount=Decimal("20.00"),
+                    type="expense", date=date(2025, month, day), description=f"Market {day}",
+                )
+            Transaction.objects.create(
+                user=self.user, category=rent, amount=Decimal("900.00"), type="income", date=date(2025, month, 28)
+            )
+            BillDue.objects.create(
+                user=self.user, name="Phone", amount=Decimal("30.00"), type="Bill", due_date=date(2025, month, 5)
+            )
+        BillRecurrence.objects.create(
+            user=self.user, name="Gym", amount=Decimal("25.00"), type="Bill",
+            frequency="monthly", start_date=date(2025, 1, 3),
+        )
+        self.calendar = Calendar.objects.get(user=self.user, year=2025, month=6)
+        self.client = APIClient()
+        self.client.credentials(HTTP_AUTHORIZATION=f"Token {Token.objects.create(user=self.user).key}")
+
+    def test_read_endpoints_stay_within_their_budgets(self):
+        requests = [
+            ("/api/profile/", {}),
+            ("/api/categories/", {}),
+            ("/api/transactions/", {}),
+            ("/api/transactions/search/", {"q": "mark"}),
+            ("/api/transactions/total-expenses/", {}),
+            ("/api/calendar/", {"month": 6, "year": 2025}),
+            ("/api/calendar/", {"from": "2024-07", "to": "2025-06"}),
+            (f"/api/calendar/{self.calendar.id}/day/2025-06-09/", {}),
+            ("/api/bills/", {"month": 6, "year": 2025}),
+            ("/api/bills/recurring/", {}),
+            ("/api/summary/monthly/", {}),
+            ("/api/summary/annual/", {}),
+            ("/api/summary/categories/", {"from": "2025-01-01", "to": "2025-12-31"}),
+            ("/api/monthly-pie-data/", {}),
+            ("/api/dashboard/", {"year": 2025, "month": 6}),
+            ("/api/forecast/", {"from": "2025-06-01", "to": "2025-07-31"}),
+            (f"/api/async/calendar/{self.calendar.id}/day/2025-06-09/", {}),
+            ("/api/async/summary/annual/", {}),
+            ("/api/async/monthly-pie-data/", {}),
+            ("/api/async/dashboard/", {"year": 2025, "month": 6}),
+        ]
+        for path, params in requests:
+            # Each request starts cold: nothing materialized, cached or checkpointed by the last one.
+            local_tokens.clear()
+            cache.clear()
+            with self.subTest(path=path, params=params), transaction.atomic():
+                response = self.client.get(path, params)
+                self.assertEqual(response.status_code, 200)
+                self.assertWithinQueryBudget(response)
+                transaction.set_rollback(True)
+
+    def test_strict_mode_raises_and_otherwise_logs(self):
+        with mock.patch.dict("accounts.api.urls.QUERY_BUDGETS", {"profile-detail": 0}):
+            with self.assertRaisesMessage(QueryBudgetExceeded, "profile-detail ran 1 queries (budget 0)"):
+                self.client.get("/api/profile/")
+            local_tokens.clear()
+            with override_settings(QUERY_BUDGET_STRICT=False), self.assertLogs("accounts.instrumentation", "WARNING"):
+                self.assertEqual(self.client.get("/api/profile/").status_code, 200)
+        self.assertEqual(self.client.get("/api/metrics/requests/").data["profile-detail"]["over_budget"], 2)
+
+    def test_server_timing_header_and_histograms(self):
+        response = self.client.get("/api/summary/annual/")
+        metrics = self.assertWithinQueryBudget(response)
+        self.assertIn("db;dur=", response["Server-Timing"])
+        self.assertIn(f'desc="{metrics.queries} queries"', response["Server-Timing"])
+        self.client.get("/api/summary/annual/")
+
+        stats = self.client.get("/api/metrics/requests/").data["annual-summary"]
+        self.assertEqual(stats["count"], 2)
+        self.assertEqual(stats["queries"]["buckets"]["+Inf"], 2)
+        self.assertEqual(stats["over_budget"], 0)
+
+    def test_writes_are_not_held_to_the_read_budget(self):
+        with self.assertNoLogs("accounts.instrumentation", level="WARNING"):
+            response = self.client.post("/api/transactions/", {
+                "amount": "12.00", "type": "expense", "date": "2025-06-10", "description": "Market",
+                "category_id": Category.objects.get(user=self.user, name="Groceries").id,
+            })
+        self.assertEqual(response.status_code, 201)
+        stats = self.client.get("/api/metrics/requests/").data["transaction-list-create"]
+        self.assertEqual((stats["count"], stats["over_budget"]), (1, 0))
+
+
+# ---------- SEED DATA & BENCHMARK ----------
+class SeedAndBenchmarkTests(TestCase):
+    def test_seeded_users_have_consistent_rollups_and_benchmark_runs(self):
+        call_command("seed_data", "--users", 2, "--years", 1, "--per-month", 10, "--end", "2025-06", stdout=StringIO())
+        user = User.objects.get(username="seed-0")
+        self.assertEqual(Calendar.objects.filter(user=user).count(), 12)
+        expected = MonthlyRollup.expected_totals(user.id)
+        self.assertEqual(
+            {(r.year, r.month): r.total_expenses for r in MonthlyRollup.objects.filter(user=user)},
+            {month: totals["total_expenses"] for month, totals in expected.items()},
+        )
+        with self.assertRaises(CommandError):
+            call_command("seed_data", "--users", 1, stdout=StringIO())
+
+        out = StringIO()
+        with self.assertNoLogs("accounts.instrumentation", "WARNING"):
+            call_command("benchmark", "--requests", 2, "--warmup", 1, stdout=out, stderr=StringIO())
+        report = json.loads(out.getvalue())
+        self.assertEqual(report["database"], "sqlite")
+        for name, result in report["endpoints"].items():
+            with self.subTest(endpoint=name):
+                self.assertEqual(result["errors"], 0)
+                self.assertIsNotNone(result["queries"])
@@ -5,6 +5,7 @@ Generated by 'django-admin startproject' using Django 5.2.7.
 """
 
 import os
+import sys
 from pathlib import Path
 from dotenv import load_dotenv
 import dj_database_url
@@ -24,10 +25,44 @@ BASE_DIR = Path(__file__).resolve().parent.parent
 # ------------------------
 DATABASE_URL = os.environ.get('DATABASE_URL')
 
+# 'asgi' when gunicorn serves backend.asgi (see gunicorn.conf.py).
+SERVER_INTERFACE = os.environ.get('SERVER_INTERFACE', 'wsgi').lower()
+
+# Persistent connections: each worker keeps its connection open for this many
+# seconds instead of reconnecting (and renegotiating TLS) on every request; 0
+# closes it after each request. Health checks ping a reused connection first.
+# Under ASGI sync ORM calls run in per-request threads, so persistent connections
+# would pile up; use DB_POOL there instead.
+DB_CONN_MAX_AGE = int(os.environ.get('DB_CONN_MAX_AGE', 0 if SERVER_INTERFACE == 'asgi' else 60))
+DB_CONN_HEALTH_CHECKS = os.environ.get('DB_CONN_HEALTH_CHECKS', 'True').lower() == 'true'
+# Django's native psycopg 3 connection pool (Postgres only), one pool per worker
+# process. Replaces persistent connections; see "Database connections" in the README.
+DB_POOL = os.environ.get('DB_POOL', 'False').lower() == 'true'
+# A sync worker runs one request per thread (gunicorn's --threads, 1 by default), so it
+# can never use more than one connection; ASGI workers overlap requests. Raise the
+# maximum to --threads when running threaded sync workers.
+DB_POOL_MIN_SIZE = int(os.environ.get('DB_POOL_MIN_SIZE', 1))
+DB_POOL_MAX_SIZE = int(os.environ.get('DB_POOL_MAX_SIZE', 4 if SERVER_INTERFACE == 'asgi' else 1))
+DB_POOL_TIMEOUT = float(os.environ.get('DB_POOL_TIMEOUT', 10))
+# Required behind PgBouncer in transaction mode (named cursors cannot span transactions).
+DB_DISABLE_SERVER_SIDE_CURSORS = os.environ.get('DB_DISABLE_SERVER_SIDE_CURSORS', 'False').lower() == 'true'
+
 if DATABASE_URL:
     DATABASES = {
-        'default': dj_database_url.config(default=DATABASE_URL)
+        'default': dj_database_url.config(
+            default=DATABASE_URL,
+            conn_max_age=0 if DB_POOL else DB_CONN_MAX_AGE,
+            conn_health_checks=DB_CONN_HEALTH_CHECKS and not DB_POOL,
+            disable_server_side_cursors=DB_DISABLE_SERVER_SIDE_CURSORS,
+        )
     }
+    if DB_POOL:
+        # Django has the pool check every connection before handing it out.
+        DATABASES['default'].setdefault('OPTIONS', {})['pool'] = {
+            'min_size': DB_POOL_MIN_SIZE,
+            'max_size': DB_POOL_MAX_SIZE,
+            'timeout': DB_POOL_TIMEOUT,
+        }
 else:
     DATABASES = {
         'default': {
@@ -36,6 +71,39 @@ else:
         }
     }
 
+# ------------------------
+# Cache Configuration
+# ------------------------
+# CACHE_URL picks the backend: unset or locmem:// for per-process memory,
+# file:///path/to/dir for a shared directory, redis://host:6379/0 for Redis
+# (install the `redis` package for the last one).
+CACHE_URL = os.environ.get('CACHE_URL', 'locmem://')
+
+if CACHE_URL.startswith(('redis://', 'rediss://')):
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.redis.RedisCache',
+            'LOCATION': CACHE_URL,
+        }
+    }
+elif CACHE_URL.startswith('file://'):
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.filebased.FileBasedCache',
+            'LOCATION': CACHE_URL[len('file://'):],
+        }
+    }
+else:
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+            'LOCATION': 'pennypal',
+        }
+    }
+
+SUMMARY_CACHE_ENABLED = os.environ.get('SUMMARY_CACHE_ENABLED', 'True').lower() == 'true'
+SUMMARY_CACHE_TIMEOUT = int(os.environ.get('SUMMARY_CACHE_TIMEOUT', 3600))
+
 # ------------------------
 # Security Settings
 # ------------------------
@@ -66,6 +134,7 @@ INSTALLED_APPS = [
 # Middleware
 # ------------------------
 MIDDLEWARE = [
+    'accounts.instrumentation.RequestMetricsMiddleware',
     'corsheaders.middleware.CorsMiddleware',
     'django.middleware.security.SecurityMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
@@ -77,6 +146,10 @@ MIDDLEWARE = [
     'whitenoise.middleware.WhiteNoiseMiddleware',
 ]
 
+# Over-budget GETs (see QUERY_BUDGETS in accounts/api/urls.py) raise instead of only
+# being logged. On by default under `manage.py test`, so the suite fails on them.
+QUERY_BUDGET_STRICT = os.environ.get('QUERY_BUDGET_STRICT', str(sys.argv[1:2] == ['test'])).lower() == 'true'
+
 ROOT_URLCONF = 'backend.urls'
 
 # ------------------------
@@ -134,7 +207,7 @@ DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
 # ------------------------
 REST_FRAMEWORK = {
     'DEFAULT_AUTHENTICATION_CLASSES': [
-        'rest_framework.authentication.TokenAuthentication',
+        'accounts.api.authentication.CachedTokenAuthentication',
     ],
     'DEFAULT_RENDERER_CLASSES': [
         'rest_framework.renderers.JSONRenderer',
@@ -142,6 +215,34 @@ REST_FRAMEWORK = {
     ],
 }
 
+# ------------------------
+# Rollups
+# ------------------------
+# 'sync' updates calendar cells and monthly rollups inside the request; 'queue'
+# only records dirty days for `manage.py process_rollup_queue` to recompute.
+ROLLUP_MODE = os.environ.get('ROLLUP_MODE', 'sync')
+
+# 'stored' keeps a CalendarCell for every day of every calendar month; 'virtual'
+# synthesizes the cells of calendar/ responses on read and only stores days with
+# activity (run `manage.py prune_calendar_cells` after switching).
+CALENDAR_MODE = os.environ.get('CALENDAR_MODE', 'stored')
+
+# Recurring bills are materialized as BillDue rows this many days ahead when a
+# rule is saved; later months are expanded when they are first requested.
+BILL_RECURRENCE_HORIZON_DAYS = int(os.environ.get('BILL_RECURRENCE_HORIZON_DAYS', 366))
+
+# ------------------------
+# Token Authentication
+# ------------------------
+# Tokens older than this are rejected and replaced on the next sign in (0 disables expiry).
+TOKEN_TTL_DAYS = int(os.environ.get('TOKEN_TTL_DAYS', 30))
+# Per-process token cache; a hit is only used while the shared cache entry exists.
+AUTH_LOCAL_CACHE_TTL = int(os.environ.get('AUTH_LOCAL_CACHE_TTL', 60))
+AUTH_LOCAL_CACHE_SIZE = int(os.environ.get('AUTH_LOCAL_CACHE_SIZE', 1024))
+# Revocation reaches other workers through the shared cache. locmem is per process, so
+# there the entry's lifetime is how long another worker may accept a revoked token.
+AUTH_SHARED_CACHE_TTL = int(os.environ.get('AUTH_SHARED_CACHE_TTL', 5 if CACHE_URL.startswith('locmem') else 300))
+
 # ------------------------
 # CORS Settings
 # ------------------------
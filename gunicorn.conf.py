@@ -0,0 +1,14 @@
+"""Gunicorn settings for the `web` process (loaded automatically from the working directory).
+
+Heroku only routes HTTP to `web`, so the interface is picked here rather than by
+a separate process type: `SERVER_INTERFACE=asgi` serves `backend.asgi` with
+uvicorn workers, anything else the WSGI app. Worker and thread counts still come
+from `WEB_CONCURRENCY` / `--workers` and `--threads`.
+"""
+import os
+
+if os.environ.get("SERVER_INTERFACE", "wsgi").lower() == "asgi":
+    wsgi_app = "backend.asgi:application"
+    worker_class = "uvicorn_worker.UvicornWorker"
+else:
+    wsgi_app = "backend.wsgi"